@@ -147,6 +147,16 @@ class EVE_Observer {
             ));
         }
 
+        // Payload hashes the sync compares to skip unchanged writes
+        foreach (array('_eve_content_hash', '_eve_skills_hash') as $field) {
+            register_meta('post', $field, array(
+                'show_in_rest' => true,
+                'single' => true,
+                'type' => 'string',
+                'auth_callback' => '__return_true'
+            ));
+        }
+
         // Register meta for REST API
         register_meta('post', '_thumbnail_external_url', array(
             'show_in_rest' => true,
@@ -224,6 +234,21 @@ class EVE_Observer {
             'permission_callback' => array($this, 'check_sync_permissions')
         ));
 
+        // Add sync manifest endpoint
+        register_rest_route('eve-observer/v1', '/manifest', array(
+            'methods' => 'GET',
+            'callback' => array($this, 'handle_manifest_request'),
+            'permission_callback' => array($this, 'check_sync_permissions'),
+            'args' => array(
+                'post_type' => array(
+                    'required' => false,
+                    'validate_callback' => function($param) {
+                        return (bool) preg_match('/^eve_[a-z_]+(,eve_[a-z_]+)*$/', $param);
+                    }
+                )
+            )
+        ));
+
         error_log("🔄 [PLUGIN INIT] REST API routes registered");
     }
 
@@ -231,6 +256,81 @@ class EVE_Observer {
         return current_user_can('manage_options');
     }
 
+    // Compact [post_id, slug, entity_id, content_hash, modified_gmt] rows of the eve_* posts for the Python
+    // sync, read with one indexed posts/postmeta query per post type instead of loading post objects
+    public function handle_manifest_request($request) {
+        global $wpdb;
+
+        $entity_meta_keys = array(
+            'eve_character' => '_eve_char_id',
+            'eve_corporation' => '_eve_corp_id',
+            'eve_blueprint' => '_eve_bp_item_id',
+            'eve_planet' => '_eve_planet_id',
+            'eve_contract' => '_eve_contract_id'
+        );
+
+        $requested = $request->get_param('post_type');
+        if ($requested) {
+            $entity_meta_keys = array_intersect_key($entity_meta_keys, array_flip(explode(',', $requested)));
+        }
+
+        // Meta the sync scripts compare before writing, returned so they don't need the REST post
+        $compared_meta_keys = array(
+            'eve_character' => array('_eve_skills_hash', '_thumbnail_external_url'),
+            'eve_blueprint' => array('_eve_bp_location_name', '_eve_bp_me', '_eve_bp_te', '_eve_bp_quantity', '_eve_bp_source'),
+            'eve_contract' => array('_eve_contract_status', '_eve_contract_items', '_eve_contract_outbid')
+        );
+
+        $post_types = array();
+        foreach ($entity_meta_keys as $post_type => $entity_meta_key) {
+            $compared_meta = array();
+            if (!empty($compared_meta_keys[$post_type])) {
+                $meta_keys = $compared_meta_keys[$post_type];
+                $placeholders = implode(',', array_fill(0, count($meta_keys), '%s'));
+                $meta_rows = $wpdb->get_results($wpdb->prepare(
+                    "SELECT pm.post_id, pm.meta_key, pm.meta_value
+                     FROM {$wpdb->postmeta} pm
+                     INNER JOIN {$wpdb->posts} p ON p.ID = pm.post_id
+                     WHERE p.post_type = %s AND pm.meta_key IN ($placeholders)",
+                    array_merge(array($post_type), $meta_keys)
+                ), ARRAY_N);
+                foreach ($meta_rows ?: array() as $meta_row) {
+                    $compared_meta[(int) $meta_row[0]][$meta_row[1]] = $meta_row[2];
+                }
+            }
+
+            $rows = $wpdb->get_results($wpdb->prepare(
+                "SELECT p.ID, p.post_name, entity.meta_value, hash.meta_value, p.post_modified_gmt, p.post_title
+                 FROM {$wpdb->posts} p
+                 LEFT JOIN {$wpdb->postmeta} entity ON entity.post_id = p.ID AND entity.meta_key = %s
+                 LEFT JOIN {$wpdb->postmeta} hash ON hash.post_id = p.ID AND hash.meta_key = '_eve_content_hash'
+                 WHERE p.post_type = %s AND p.post_status NOT IN ('trash', 'auto-draft')",
+                $entity_meta_key,
+                $post_type
+            ), ARRAY_N);
+
+            $post_types[$post_type] = array_map(function($row) use ($compared_meta) {
+                $post_id = (int) $row[0];
+                return array(
+                    $post_id,
+                    $row[1],
+                    $row[2] === null ? null : (int) $row[2],
+                    $row[3],
+                    $row[4],
+                    // Same filters as the REST API's title.rendered, which the scripts compare against
+                    apply_filters('the_title', $row[5], $post_id),
+                    (object) (isset($compared_meta[$post_id]) ? $compared_meta[$post_id] : array())
+                );
+            }, $rows ?: array());
+        }
+
+        return array(
+            'fields' => array('post_id', 'slug', 'entity_id', 'content_hash', 'modified', 'title', 'meta'),
+            'generated' => current_time('mysql', true),
+            'post_types' => $post_types
+        );
+    }
+
     public function handle_test_request() {
         error_log("🔄 [TEST ENDPOINT] Test endpoint called");
 
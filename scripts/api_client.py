@@ -5,37 +5,52 @@ Handles ESI API and WordPress REST API interactions.
 """
 
 import asyncio
+import atexit
 import functools
+import json
 import logging
 import os
 import re
 import smtplib
+import sqlite3
+import threading
 import time
 import warnings
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from email.mime.text import MIMEText
+from email.utils import parsedate_to_datetime
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
 import requests
 from dotenv import load_dotenv
 
 try:
-    from prometheus_client import Counter, Histogram
+    from prometheus_client import Counter, Gauge, Histogram
 
     ESI_REQUESTS_TOTAL = Counter("eve_esi_requests_total", "Total ESI API requests", ["endpoint_type", "status"])
     ESI_REQUEST_DURATION = Histogram("eve_esi_request_duration_seconds", "ESI API request duration", ["endpoint_type"])
     WP_REQUESTS_TOTAL = Counter("eve_wp_requests_total", "Total WordPress API requests", ["method", "status"])
     WP_REQUEST_DURATION = Histogram("eve_wp_request_duration_seconds", "WordPress API request duration", ["method"])
+    ESI_IN_FLIGHT = Gauge("eve_esi_in_flight_requests", "ESI requests currently in flight")
+    ESI_ERROR_BUDGET = Gauge("eve_esi_error_budget_remaining", "Last reported X-ESI-Error-Limit-Remain")
+    ESI_THROTTLE_SECONDS = Counter("eve_esi_throttle_seconds_total", "Time ESI requests spent held by the governor")
 
     API_METRICS_ENABLED = True
 except ImportError:
     API_METRICS_ENABLED = False
     ESI_REQUESTS_TOTAL = ESI_REQUEST_DURATION = WP_REQUESTS_TOTAL = WP_REQUEST_DURATION = None
+    ESI_IN_FLIGHT = ESI_ERROR_BUDGET = ESI_THROTTLE_SECONDS = None
 
+from cache_store import get_cache_store, table_for_file
 from config import (
+    CACHE_BACKEND,
     EMAIL_FROM,
     EMAIL_PASSWORD,
     EMAIL_SMTP_PORT,
@@ -43,10 +58,20 @@ from config import (
     EMAIL_TO,
     EMAIL_USERNAME,
     ESI_BASE_URL,
+    ESI_CONCURRENCY_LIMIT,
+    ESI_ERROR_BUDGET_HARD,
+    ESI_ERROR_BUDGET_SOFT,
+    ESI_ETAG_CACHE_ENABLED,
+    ESI_ETAG_CACHE_FILE,
+    ESI_ETAG_CACHE_MAX_ENTRIES,
+    ESI_ETAG_CACHE_TTL_DAYS,
+    ESI_RESPECT_EXPIRY,
     LOG_FILE,
     LOG_LEVEL,
+    WORDPRESS_BATCH_SIZE,
     WP_APP_PASSWORD,
     WP_BASE_URL,
+    WP_BATCH_API_ENABLED,
     WP_USERNAME,
 )
 
@@ -346,70 +371,98 @@ _wp_circuit_breaker = CircuitBreaker(
 
 
 class DynamicRateLimiter:
-    """Dynamic rate limiter that adjusts based on response times and error rates."""
+    """FIFO token-bucket rate limiter whose rate adapts to response times and error rates.
+
+    The bucket is kept as the time the next call may start (GCRA): each caller reserves
+    the next free slot and moves it one interval further, without awaiting in between,
+    so concurrent callers on the event loop never share a slot and no lock is needed.
+    Slots are handed out in arrival order, making the queue FIFO. With the default burst
+    of 1, starts are at least one interval apart, so no 60 s window holds more calls than
+    the current rate allows. Response times and errors live in deque-backed sliding
+    windows with running totals, so every call is O(1) amortized.
+    """
+
+    window_seconds = 120.0  # Sliding window the adaptation looks at
 
-    def __init__(self, base_calls_per_minute: int = 60, max_calls_per_minute: int = 120):
+    def __init__(
+        self,
+        base_calls_per_minute: int = 60,
+        max_calls_per_minute: int = 120,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.base_calls_per_minute = base_calls_per_minute
         self.max_calls_per_minute = max_calls_per_minute
         self.current_calls_per_minute = base_calls_per_minute
-        self.calls = []
-        self.response_times = []
-        self.errors = []
+        self.burst = max(1, burst)
+        self.clock = clock
         self.adjustment_factor = 1.0
+        self.error_count = 0  # Monotonic, unlike the errors window
+        self._next_slot = 0.0
+        self._waiting = 0
+        self._calls: deque = deque()
+        self._response_times: deque = deque()
+        self._response_time_total = 0.0
+        self._errors: deque = deque()
+        self._logged_rate = float(base_calls_per_minute)
+
+    @property
+    def current_rate(self) -> float:
+        """Calls per minute currently allowed."""
+        return self.current_calls_per_minute
+
+    @property
+    def queue_depth(self) -> int:
+        """Callers waiting for their slot."""
+        return self._waiting
 
     async def wait_if_needed(self):
-        """Wait if necessary to respect dynamic rate limits."""
-        now = datetime.now()
-
-        # Clean up old data (keep last 5 minutes)
-        cutoff_time = now - timedelta(minutes=5)
-        self.calls = [call for call in self.calls if call > cutoff_time]
-        self.response_times = [
-            item for item in self.response_times if isinstance(item, tuple) and len(item) == 2 and item[1] > cutoff_time
-        ]
-        self.errors = [
-            item for item in self.errors if isinstance(item, tuple) and len(item) == 2 and item[1] > cutoff_time
-        ]
-
-        # Adjust rate based on recent performance
-        self._adjust_rate(now)
-
-        # Calculate minimum interval between calls
-        min_interval = 60.0 / self.current_calls_per_minute
-
-        if self.calls:
-            # Wait until enough time has passed since the last call
-            time_since_last_call = (now - self.calls[-1]).total_seconds()
-            if time_since_last_call < min_interval:
-                wait_time = min_interval - time_since_last_call
-                logger.debug(".2f" ".1f")
-                await asyncio.sleep(wait_time)
-
-        self.calls.append(now)
+        """Wait for this caller's slot in the FIFO queue."""
+        now = self.clock()
+        self._prune(now)
+        self._adjust_rate()
+
+        # Reserve the next slot before any await so concurrent callers can't take the same one
+        interval = 60.0 / self.current_calls_per_minute
+        slot = max(now, self._next_slot - (self.burst - 1) * interval)
+        self._next_slot = max(self._next_slot, slot) + interval
+        self._calls.append(slot)
+
+        delay = slot - now
+        if delay > 0:
+            self._waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._waiting -= 1
 
     def record_response_time(self, response_time: float):
         """Record a successful response time."""
-        now = datetime.now()
-        self.response_times.append((response_time, now))
+        self._response_times.append((self.clock(), response_time))
+        self._response_time_total += response_time
 
     def record_error(self):
         """Record an error."""
-        now = datetime.now()
-        self.errors.append((True, now))
-
-    def _adjust_rate(self, now: datetime):
-        """Adjust the rate based on recent performance."""
-        # Look at last 2 minutes of data
-        recent_cutoff = now - timedelta(minutes=2)
-
-        recent_responses = [rt for rt, ts in self.response_times if ts > recent_cutoff]
-        recent_errors = [err for err, ts in self.errors if ts > recent_cutoff]
-
-        if not recent_responses:
+        self._errors.append(self.clock())
+        self.error_count += 1
+
+    def _prune(self, now: float) -> None:
+        """Drop samples that left the sliding windows."""
+        cutoff = now - self.window_seconds
+        while self._response_times and self._response_times[0][0] <= cutoff:
+            self._response_time_total -= self._response_times.popleft()[1]
+        while self._errors and self._errors[0] <= cutoff:
+            self._errors.popleft()
+        while self._calls and self._calls[0] <= now - 60.0:
+            self._calls.popleft()
+
+    def _adjust_rate(self):
+        """Adjust the rate based on the response times and errors in the window."""
+        if not self._response_times:
             return  # Not enough data yet
 
-        avg_response_time = sum(recent_responses) / len(recent_responses)
-        error_rate = len(recent_errors) / max(len(recent_responses) + len(recent_errors), 1)
+        avg_response_time = self._response_time_total / len(self._response_times)
+        error_rate = len(self._errors) / (len(self._response_times) + len(self._errors))
 
         # Adjust based on response time (slower = reduce rate)
         if avg_response_time > 0.2:  # If average response > 0.2 seconds (95th percentile from logs)
@@ -418,9 +471,9 @@ class DynamicRateLimiter:
             self.adjustment_factor = min(2.0, self.adjustment_factor * 1.05)  # Increase by 5%
 
         # Adjust based on error rate
-        if error_rate > 0.05:  # More than 5% errors (reduced from 10%)
+        if error_rate > 0.05:  # More than 5% errors
             self.adjustment_factor = max(0.3, self.adjustment_factor * 0.8)  # Reduce significantly
-        elif error_rate < 0.005:  # Less than 0.5% errors (reduced from 1%)
+        elif error_rate < 0.005:  # Less than 0.5% errors
             self.adjustment_factor = min(1.5, self.adjustment_factor * 1.02)  # Slight increase
 
         # Calculate new rate
@@ -428,12 +481,23 @@ class DynamicRateLimiter:
         self.current_calls_per_minute = max(10, min(self.max_calls_per_minute, new_rate))  # Clamp between 10 and max
 
         # Log significant changes
-        if abs(self.current_calls_per_minute - self.base_calls_per_minute) > 5:
+        if abs(self.current_calls_per_minute - self._logged_rate) > 5:
+            self._logged_rate = self.current_calls_per_minute
             logger.info(
                 f"Rate limiter adjusted: base={self.base_calls_per_minute:.1f}, "
                 f"current={self.current_calls_per_minute:.2f}, factor={self.adjustment_factor:.1f}"
             )
 
+    def get_stats(self) -> Dict[str, Any]:
+        self._prune(self.clock())
+        return {
+            "current_calls_per_minute": round(self.current_calls_per_minute, 2),
+            "queue_depth": self._waiting,
+            "calls_last_minute": len(self._calls),
+            "adjustment_factor": round(self.adjustment_factor, 3),
+            "error_count": self.error_count,
+        }
+
 
 # Global dynamic rate limiter for WordPress API
 wp_rate_limiter = DynamicRateLimiter(base_calls_per_minute=60, max_calls_per_minute=120)
@@ -612,14 +676,669 @@ def format_error_message(operation: str, resource_id: Any, error: Exception, con
     return base_msg
 
 
+def get_response_header(response: Any, name: str) -> Optional[str]:
+    """Return a response header value as a string, or None if absent or malformed."""
+    headers = getattr(response, "headers", None)
+    if not isinstance(headers, Mapping):
+        return None
+    value = headers.get(name)
+    return value if isinstance(value, str) else None
+
+
+def get_response_expiry(response: Any) -> Optional[float]:
+    """Return the local epoch time at which a response expires, from its Expires header.
+
+    The lifetime is measured against the server's Date header when present, so clock skew
+    between this host and ESI does not stretch or shorten it.
+    """
+    expires = get_response_header(response, "Expires")
+    if not expires:
+        return None
+    try:
+        expires_at = parsedate_to_datetime(expires).timestamp()
+        date = get_response_header(response, "Date")
+        server_now = parsedate_to_datetime(date).timestamp() if date else time.time()
+    except (TypeError, ValueError):
+        return None
+    return time.time() + max(0.0, expires_at - server_now)
+
+
+class ETagStore:
+    """Persistent ETag and Expires store for ESI GET requests.
+
+    Entries are keyed by auth subject and endpoint and hold the ETag and expiry together
+    with the already-sanitized response body as compact JSON. Requests for a known entry
+    send If-None-Match; a 304 reply is served from a fresh decode of the stored body, saving
+    the transfer and sanitizing, and callers can't alter the stored copy. With respect_expiry
+    enabled, entries that have not yet expired are served without touching the network at all.
+
+    With the SQLite cache backend each entry is one row of the esi_etags table, read on first
+    use and written in batches; rows expire ttl_seconds after they were first stored. The
+    legacy JSON backend rewrites its file on flush. Either way only the max_entries most
+    recently used entries are kept in memory (and, for JSON, on disk).
+    """
+
+    flush_threshold = 200  # Unsaved entries written to SQLite at once
+
+    def __init__(
+        self,
+        cache_file: str,
+        enabled: bool = True,
+        respect_expiry: bool = False,
+        max_entries: int = ESI_ETAG_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = ESI_ETAG_CACHE_TTL_DAYS * 86400,
+        backend: str = CACHE_BACKEND,
+    ):
+        self.cache_file = cache_file
+        self.enabled = enabled
+        self.respect_expiry = respect_expiry
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_sqlite = backend == "sqlite"
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._unsaved: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "fresh_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+            "parse_seconds_saved": 0.0,
+        }
+
+    @staticmethod
+    def make_key(endpoint: str, subject: str = "public") -> str:
+        """Build the store key for an endpoint requested as a given auth subject."""
+        return f"{subject}|{endpoint}"
+
+    def _ensure_loaded(self) -> None:
+        """Load the JSON file on first use; SQLite entries are read per key instead."""
+        if self._loaded:
+            return
+        self._loaded = True
+        atexit.register(self.flush)
+        if self.use_sqlite:
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                for key, entry in json.load(f).items():
+                    if isinstance(entry.get("body"), str):  # Files from before bodies were kept as JSON text
+                        self._remember(key, entry)
+            logger.info(f"Loaded {len(self._entries)} ESI ETag entries from {self.cache_file}")
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            self._entries.clear()
+
+    def _entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for a key from memory, or from the SQLite table on a memory miss."""
+        self._ensure_loaded()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if not self.use_sqlite:
+            return None
+        entry = self._unsaved.get(key)
+        if entry is None:
+            try:
+                entry = get_cache_store(os.path.dirname(self.cache_file)).get(table_for_file(self.cache_file), key)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read ESI ETag entry {key}: {e}")
+                return None
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Keep an entry in memory, evicting the least recently used beyond max_entries."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)  # Unsaved SQLite entries stay in _unsaved until flushed
+            self.stats["evictions"] += 1
+
+    def _changed(self, key: str, entry: Dict[str, Any]) -> None:
+        """Mark an entry for the next write."""
+        if self.use_sqlite:
+            self._unsaved[key] = entry
+            if len(self._unsaved) >= self.flush_threshold:
+                self.flush()
+        else:
+            self._dirty = True
+
+    def request_headers(self, key: str) -> Dict[str, str]:
+        """Return the conditional request headers for a key, if an entry is stored."""
+        if not self.enabled:
+            return {}
+        entry = self._entry(key)
+        return {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+
+    def get_fresh(self, key: str) -> Optional[Any]:
+        """Return a copy of the stored body if expiry is respected and the entry has not expired."""
+        if not (self.enabled and self.respect_expiry):
+            return None
+        entry = self._entry(key)
+        if entry is None or entry.get("expires_at", 0) <= time.time():
+            return None
+        self.stats["fresh_hits"] += 1
+        return self._serve(entry)
+
+    def record_not_modified(self, key: str, expires_at: Optional[float] = None) -> Optional[Any]:
+        """Serve a copy of the stored body for a 304 reply, refresh its expiry and count the savings."""
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        if expires_at:
+            entry["expires_at"] = expires_at
+            self._changed(key, entry)
+        self.stats["hits"] += 1
+        return self._serve(entry)
+
+    def stored_pages(self, key: str) -> int:
+        """Return the X-Pages total recorded with a stored entry (1 if unknown)."""
+        entry = self._entry(key)
+        return entry.get("pages", 1) if entry else 1
+
+    def _serve(self, entry: Dict[str, Any]) -> Any:
+        """Decode a fresh copy of an entry's body and add the transfer and parse time saved."""
+        decode_start = time.time()
+        body = json.loads(entry["body"])
+        self.stats["bytes_saved"] += entry.get("size", 0)
+        self.stats["parse_seconds_saved"] += max(0.0, entry.get("parse_seconds", 0.0) - (time.time() - decode_start))
+        return body
+
+    def store(
+        self,
+        key: str,
+        etag: Optional[str],
+        body: Any,
+        parse_seconds: float,
+        expires_at: Optional[float] = None,
+        pages: int = 1,
+    ) -> None:
+        """Record a full 200 response; responses with neither ETag nor expiry count as misses only."""
+        if not self.enabled:
+            return
+        self._ensure_loaded()
+        self.stats["misses"] += 1
+        if not etag and not expires_at:
+            return
+        encoded = json.dumps(body, separators=(",", ":"))
+        entry = {
+            "etag": etag,
+            "expires_at": expires_at or 0,
+            "body": encoded,
+            "size": len(encoded),
+            "parse_seconds": parse_seconds,
+            "pages": pages,
+        }
+        self._remember(key, entry)
+        self.stats["stores"] += 1
+        self._changed(key, entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the bandwidth and parse time saved this run."""
+        stats = dict(self.stats)
+        total = stats["hits"] + stats["fresh_hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total * 100, 1) if total else 0.0
+        stats["parse_seconds_saved"] = round(stats["parse_seconds_saved"], 3)
+        stats["entries_in_memory"] = len(self._entries)
+        return stats
+
+    def flush(self) -> None:
+        """Write changed entries to disk and drop expired SQLite rows."""
+        with self._lock:
+            if self.use_sqlite:
+                self._flush_sqlite()
+            else:
+                self._flush_json()
+
+    def _flush_sqlite(self) -> None:
+        if not self._unsaved:
+            return
+        pending, self._unsaved = self._unsaved, {}
+        store = get_cache_store(os.path.dirname(self.cache_file))
+        table = table_for_file(self.cache_file)
+        try:
+            store.put_many(table, pending, self.ttl_seconds)
+            store.purge_expired(table)
+        except sqlite3.Error as e:
+            self._unsaved = {**pending, **self._unsaved}
+            logger.error(f"Failed to save ESI ETag entries to {store.db_file}: {e}")
+
+    def _flush_json(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(dict(self._entries), f, separators=(",", ":"))
+            os.replace(tmp_file, self.cache_file)
+        except (OSError, TypeError) as e:
+            self._dirty = True
+            logger.error(f"Failed to save ESI ETag store {self.cache_file}: {e}")
+
+
+# Global ETag store shared by all ESI GET requests
+esi_etag_store = ETagStore(ESI_ETAG_CACHE_FILE, enabled=ESI_ETAG_CACHE_ENABLED, respect_expiry=ESI_RESPECT_EXPIRY)
+
+
+class SingleFlight:
+    """Coalesce concurrent identical requests into one underlying call.
+
+    The first caller for a key starts the call; callers arriving while it is in flight
+    await the same task and receive the same result (or exception). Shared results must
+    be treated as read-only.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {"executed": 0, "coalesced": 0}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func for key, or join the call already in flight for it."""
+        task = self._in_flight.get(key)
+        if task is not None and not task.done():
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(func())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        self.stats["executed"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished task so later calls start a fresh request."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return how many calls ran and how many were coalesced onto them."""
+        stats = dict(self.stats)
+        total = stats["executed"] + stats["coalesced"]
+        stats["coalesced_rate"] = round(stats["coalesced"] / total * 100, 1) if total else 0.0
+        return stats
+
+
+# Global single-flight group for ESI GETs
+esi_single_flight = SingleFlight()
+
+
+class ESIGovernor:
+    """Global gate for every ESI request: in-flight limit plus error-budget throttling.
+
+    Requests enter through request() (async) or sync_request() (threads) and report their
+    responses to observe(). The governor tracks X-ESI-Error-Limit-Remain/Reset and starts
+    pacing new requests once the budget drops below soft_budget, pausing them entirely at
+    hard_budget until the window resets, so slowdowns happen before ESI answers 420.
+    420 and 429 replies pause all new requests for the advertised reset time.
+    """
+
+    def __init__(self, max_in_flight: int, soft_budget: int = 50, hard_budget: int = 10):
+        self.max_in_flight = max(1, max_in_flight)
+        self.soft_budget = soft_budget
+        self.hard_budget = min(hard_budget, soft_budget - 1)
+        self.error_budget: Optional[int] = None
+        self.in_flight = 0
+        self._budget_reset_at = 0.0
+        self._paused_until = 0.0
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_semaphore = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "peak_in_flight": 0,
+            "throttle_events": 0,
+            "throttle_seconds": 0.0,
+            "min_error_budget": None,
+            "error_limited": 0,
+            "rate_limited": 0,
+        }
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the in-flight semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def throttle_delay(self) -> float:
+        """Seconds a new request should wait given pauses and the remaining error budget."""
+        now = time.time()
+        delay = max(0.0, self._paused_until - now)
+        if self.error_budget is not None and self.error_budget < self.soft_budget and self._budget_reset_at > now:
+            reset_left = self._budget_reset_at - now
+            if self.error_budget <= self.hard_budget:
+                delay = max(delay, reset_left)
+            else:
+                # Pace harder the closer the budget gets to the hard floor
+                pressure = (self.soft_budget - self.error_budget) / (self.soft_budget - self.hard_budget)
+                delay = max(delay, reset_left * pressure / self.max_in_flight)
+        return delay
+
+    def _record_throttle(self, delay: float) -> None:
+        self.stats["throttle_events"] += 1
+        self.stats["throttle_seconds"] += delay
+        if API_METRICS_ENABLED:
+            ESI_THROTTLE_SECONDS.inc(delay)
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.stats["requests"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+        if API_METRICS_ENABLED:
+            ESI_IN_FLIGHT.inc()
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        if API_METRICS_ENABLED:
+            ESI_IN_FLIGHT.dec()
+
+    @asynccontextmanager
+    async def request(self):
+        """Hold an in-flight slot for one async ESI request, waiting out any throttle first."""
+        delay = self.throttle_delay()
+        if delay > 0:
+            self._record_throttle(delay)
+            logger.debug(f"ESI governor holding request for {delay:.2f}s (error budget {self.error_budget})")
+            await asyncio.sleep(delay)
+        async with self._semaphore():
+            self._enter()
+            try:
+                yield
+            finally:
+                self._exit()
+
+    @contextmanager
+    def sync_request(self):
+        """Hold an in-flight slot for one blocking ESI request made from a worker thread."""
+        delay = self.throttle_delay()
+        if delay > 0:
+            self._record_throttle(delay)
+            time.sleep(delay)
+        with self._sync_semaphore:
+            self._enter()
+            try:
+                yield
+            finally:
+                self._exit()
+
+    def pause(self, seconds: float) -> None:
+        """Hold all new requests for the given number of seconds."""
+        self._paused_until = max(self._paused_until, time.time() + seconds)
+
+    def observe(self, response: Any) -> None:
+        """Update the error budget and pauses from an ESI response (aiohttp or requests)."""
+        remain = get_response_header(response, "X-ESI-Error-Limit-Remain")
+        reset = get_response_header(response, "X-ESI-Error-Limit-Reset")
+        reset_seconds = int(reset) if reset and reset.isdigit() else None
+        if remain and remain.isdigit():
+            previous_budget = self.error_budget
+            self.error_budget = int(remain)
+            if reset_seconds is not None:
+                self._budget_reset_at = time.time() + reset_seconds
+            min_budget = self.stats["min_error_budget"]
+            self.stats["min_error_budget"] = (
+                self.error_budget if min_budget is None else min(min_budget, self.error_budget)
+            )
+            if API_METRICS_ENABLED:
+                ESI_ERROR_BUDGET.set(self.error_budget)
+            if self.error_budget < self.soft_budget and (
+                previous_budget is None or self.error_budget < previous_budget
+            ):
+                logger.warning(f"ESI error budget low: {self.error_budget} remaining, resets in {reset}s")
+
+        status = getattr(response, "status", None) or getattr(response, "status_code", None)
+        if status == 420:
+            self.stats["error_limited"] += 1
+            self.pause((reset_seconds or 60) + 1)
+        elif status == 429:
+            self.stats["rate_limited"] += 1
+            retry_after = get_response_header(response, "Retry-After")
+            self.pause(int(retry_after) if retry_after and retry_after.isdigit() else (reset_seconds or 60) + 1)
+
+    def congestion_events(self) -> int:
+        """Monotonic count of throttle, 420 and 429 events, for adaptive limiters to watch."""
+        return self.stats["throttle_events"] + self.stats["error_limited"] + self.stats["rate_limited"]
+
+    def reset(self) -> None:
+        """Forget the error budget and any pause, e.g. between independent runs."""
+        self.error_budget = None
+        self._budget_reset_at = 0.0
+        self._paused_until = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the governor's run counters and current state."""
+        stats = dict(self.stats)
+        stats["throttle_seconds"] = round(stats["throttle_seconds"], 3)
+        stats["in_flight"] = self.in_flight
+        stats["max_in_flight"] = self.max_in_flight
+        stats["error_budget"] = self.error_budget
+        return stats
+
+
+# Global governor that every ESI request goes through
+esi_governor = ESIGovernor(ESI_CONCURRENCY_LIMIT, soft_budget=ESI_ERROR_BUDGET_SOFT, hard_budget=ESI_ERROR_BUDGET_HARD)
+
+
+class _LimiterSlot:
+    """Handle for one admitted task; callers mark it when they saw a throttle signal."""
+
+    __slots__ = ("throttled",)
+
+    def __init__(self):
+        self.throttled = False
+
+    def mark_throttled(self) -> None:
+        self.throttled = True
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit tuned by additive-increase / multiplicative-decrease (AIMD).
+
+    Each completed task is one sample. The limit grows by one after each full window
+    (limit samples) finishing within latency_target without a throttle signal. A slow
+    task, a task marked throttled, or a rise in the congestion_signal counter while the
+    task ran multiplies the limit by decrease_factor, at most once per window so a burst
+    of failures from the same window is only counted once.
+
+    Permits are counted rather than held in an asyncio.Semaphore, so the limit can shrink
+    or grow at any time: tasks already admitted keep running and new tasks are admitted
+    only while fewer than limit are in flight. Every limit change is appended to the
+    trajectory for tuning from real runs.
+    """
+
+    max_trajectory = 500
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        latency_target: float = 10.0,
+        decrease_factor: float = 0.7,
+        congestion_signal: Optional[Callable[[], int]] = None,
+    ):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.congestion_signal = congestion_signal
+        self._limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._successes = 0
+        self._samples_since_decrease = 0
+        self._started = time.time()
+        self.stats = {"completed": 0, "increases": 0, "decreases": 0, "peak_limit": self.limit, "peak_in_flight": 0}
+        self.trajectory: List[Dict[str, Any]] = [{"t": 0.0, "limit": self.limit, "reason": "initial"}]
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def set_limit(self, limit: int, reason: str = "manual") -> None:
+        """Resize the limit, waking waiters if it grew; admitted tasks are never revoked."""
+        old_limit = self.limit
+        self._limit = min(max(int(limit), self.min_limit), self.max_limit)
+        self._successes = 0
+        if self.limit != old_limit:
+            self.stats["peak_limit"] = max(self.stats["peak_limit"], self.limit)
+            self.trajectory.append({"t": round(time.time() - self._started, 3), "limit": self.limit, "reason": reason})
+            if len(self.trajectory) > self.max_trajectory:
+                del self.trajectory[1]
+            logger.debug(f"Adaptive limiter {self.name}: {old_limit} -> {self.limit} ({reason})")
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self) -> None:
+        """Wait until fewer than limit tasks are in flight, then take a permit."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release()  # Permit was handed over just as we were cancelled
+                raise
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self._in_flight)
+
+    def release(self) -> None:
+        """Return a permit and admit waiting tasks the current limit allows."""
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def record(self, latency: float, throttled: bool = False) -> None:
+        """Feed one completed task into the AIMD controller."""
+        self.stats["completed"] += 1
+        self._samples_since_decrease += 1
+        if throttled or latency > self.latency_target:
+            if self._samples_since_decrease >= self.limit:
+                self._samples_since_decrease = 0
+                self.stats["decreases"] += 1
+                self.set_limit(self.limit * self.decrease_factor, "throttled" if throttled else "latency")
+        elif self.limit < self.max_limit:
+            self._successes += 1
+            if self._successes >= self.limit:
+                self.stats["increases"] += 1
+                self.set_limit(self.limit + 1, "increase")
+
+    @asynccontextmanager
+    async def slot(self):
+        """Run one task under the limiter, measuring its latency and throttle signals."""
+        await self.acquire()
+        handle = _LimiterSlot()
+        congestion_before = self.congestion_signal() if self.congestion_signal else 0
+        start = time.time()
+        try:
+            yield handle
+        finally:
+            congested = self.congestion_signal is not None and self.congestion_signal() > congestion_before
+            self.release()
+            self.record(time.time() - start, handle.throttled or congested)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return counters and the limit trajectory for run metrics."""
+        return {**self.stats, "limit": self.limit, "trajectory": list(self.trajectory)}
+
+
+# Adaptive limiters for the pipeline's fan-out stages, reported together in run metrics
+contract_expansion_limiter = AdaptiveConcurrencyLimiter(
+    "contract_expansion",
+    initial_limit=15,
+    min_limit=5,
+    max_limit=50,
+    latency_target=10.0,
+    congestion_signal=esi_governor.congestion_events,
+)
+blueprint_limiter = AdaptiveConcurrencyLimiter(
+    "blueprints",
+    initial_limit=10,
+    min_limit=2,
+    max_limit=30,
+    latency_target=10.0,
+    congestion_signal=lambda: esi_governor.congestion_events() + wp_rate_limiter.error_count,
+)
+WP_BATCH_MAX_REQUESTS = 25  # WordPress's default limit of sub-requests per batch
+
+# With /batch/v1 the writes admitted here fill the batches, so the limit never drops below one full batch
+_wp_write_floor = WP_BATCH_MAX_REQUESTS if WP_BATCH_API_ENABLED else 1
+wp_write_limiter = AdaptiveConcurrencyLimiter(
+    "wordpress_writes",
+    initial_limit=max(WORDPRESS_BATCH_SIZE, _wp_write_floor),
+    min_limit=_wp_write_floor,
+    max_limit=max(30, 2 * _wp_write_floor),
+    latency_target=5.0,
+    congestion_signal=lambda: wp_rate_limiter.error_count,
+)
+adaptive_limiters = (contract_expansion_limiter, blueprint_limiter, wp_write_limiter)
+
+
+def _is_public_contracts_page(endpoint: str) -> bool:
+    """Whether an endpoint is a page of a region's public contract list, where errors mean end of data."""
+    return "/contracts/public/" in endpoint and "/items/" not in endpoint and "?page=" in endpoint
+
+
 @benchmark
 async def _fetch_esi_with_retry(
-    endpoint: str, headers: Optional[Dict[str, str]] = None, max_retries: int = None, is_public: bool = True
+    endpoint: str,
+    headers: Optional[Dict[str, str]] = None,
+    max_retries: int = None,
+    is_public: bool = True,
+    cache_subject: str = "public",
+    with_pages: bool = False,
+    server_errors_end_pages: bool = True,
 ) -> Dict[str, Any]:
-    """Internal function to fetch data from ESI API with circuit breaker and error handling."""
+    """Internal function to fetch data from ESI API with circuit breaker and error handling.
+
+    GET requests are made conditional when the ETag store holds an entry for
+    (cache_subject, endpoint); a 304 reply returns the stored, already-sanitized body.
+    In respect-expiry mode an unexpired entry is returned without any request, and
+    concurrent identical requests share a single underlying call.
+
+    With with_pages=True the result is a (data, total_pages) tuple, total_pages coming
+    from the X-Pages header (1 for unpaginated endpoints). Server errors on a public
+    contracts page are read as the end of the data unless server_errors_end_pages is
+    False, in which case they are retried and raised like on any other endpoint.
+    """
+    etag_key = ETagStore.make_key(endpoint, cache_subject)
+    fresh = esi_etag_store.get_fresh(etag_key)
+    if fresh is not None:
+        logger.debug(f"ESI cache fresh, skipping request: {endpoint}")
+        return (fresh, esi_etag_store.stored_pages(etag_key)) if with_pages else fresh
+
+    response_pages = 1
 
     async def _do_request():
-        nonlocal max_retries
+        nonlocal max_retries, response_pages
         start_time = time.time()
         if max_retries is None:
             max_retries = api_config.esi_max_retries
@@ -629,13 +1348,25 @@ async def _fetch_esi_with_retry(
 
         sess = await get_session()
         url = f"{api_config.esi_base_url}{endpoint}"
+        request_headers = {**(headers or {}), **esi_etag_store.request_headers(etag_key)}
 
         for attempt in range(max_retries):
             try:
-                async with sess.get(url, headers=headers or {}) as response:
+                async with sess.get(url, headers=request_headers) as response:
+                    esi_governor.observe(response)
                     if response.status == 200:
+                        parse_start = time.time()
                         result = await response.json()
                         result = sanitize_api_response(result)  # Sanitize API response
+                        response_pages = int(get_response_header(response, "X-Pages") or 1)
+                        esi_etag_store.store(
+                            etag_key,
+                            get_response_header(response, "ETag"),
+                            result,
+                            time.time() - parse_start,
+                            expires_at=get_response_expiry(response),
+                            pages=response_pages,
+                        )
                         elapsed = time.time() - start_time
                         endpoint_type = "public" if is_public else "authenticated"
                         logger.info(f"ESI {endpoint_type} fetch successful: {endpoint} in {elapsed:.2f}s")
@@ -643,6 +1374,32 @@ async def _fetch_esi_with_retry(
                             ESI_REQUESTS_TOTAL.labels(endpoint_type=endpoint_type, status="success").inc()
                             ESI_REQUEST_DURATION.labels(endpoint_type=endpoint_type).observe(elapsed)
                         return result
+                    elif response.status == 204:
+                        # No content, e.g. the items of a contract that just expired or was accepted
+                        elapsed = time.time() - start_time
+                        endpoint_type = "public" if is_public else "authenticated"
+                        logger.info(f"ESI {endpoint_type} no content: {endpoint} in {elapsed:.2f}s")
+                        if API_METRICS_ENABLED:
+                            ESI_REQUESTS_TOTAL.labels(endpoint_type=endpoint_type, status="no_content").inc()
+                            ESI_REQUEST_DURATION.labels(endpoint_type=endpoint_type).observe(elapsed)
+                        return []
+                    elif response.status == 304 and "If-None-Match" in request_headers:
+                        response_pages = int(
+                            get_response_header(response, "X-Pages") or esi_etag_store.stored_pages(etag_key)
+                        )
+                        result = esi_etag_store.record_not_modified(etag_key, get_response_expiry(response))
+                        if result is None:
+                            # The entry was evicted after If-None-Match went out; ask for the full body instead
+                            logger.debug(f"ESI cache entry for {endpoint} gone before its 304, refetching")
+                            request_headers.pop("If-None-Match", None)
+                            continue
+                        elapsed = time.time() - start_time
+                        endpoint_type = "public" if is_public else "authenticated"
+                        logger.info(f"ESI {endpoint_type} not modified: {endpoint} in {elapsed:.2f}s")
+                        if API_METRICS_ENABLED:
+                            ESI_REQUESTS_TOTAL.labels(endpoint_type=endpoint_type, status="not_modified").inc()
+                            ESI_REQUEST_DURATION.labels(endpoint_type=endpoint_type).observe(elapsed)
+                        return result
                     elif response.status == 401 and not is_public:
                         elapsed = time.time() - start_time
                         logger.error(f"Authentication failed for endpoint {endpoint} in {elapsed:.2f}s")
@@ -664,7 +1421,7 @@ async def _fetch_esi_with_retry(
                                 endpoint_type=endpoint_type or "unknown", status="not_found"
                             ).inc()
                         # For pagination endpoints, 404 means we've reached the end - return empty list instead of error
-                        if "/contracts/public/" in endpoint and "?page=" in endpoint:
+                        if _is_public_contracts_page(endpoint):
                             return []
                         else:
                             raise ESIRequestError(f"Resource not found: {endpoint}")
@@ -676,7 +1433,7 @@ async def _fetch_esi_with_retry(
                         if API_METRICS_ENABLED:
                             ESI_REQUESTS_TOTAL.labels(endpoint_type=endpoint_type or "unknown", status="gateway_error").inc()
                         # For pagination endpoints, gateway errors likely mean end of data
-                        if "/contracts/public/" in endpoint and "?page=" in endpoint:
+                        if server_errors_end_pages and _is_public_contracts_page(endpoint):
                             logger.info(f"Treating gateway error as end of pagination for contracts endpoint")
                             return []
                         else:
@@ -729,7 +1486,7 @@ async def _fetch_esi_with_retry(
                         if API_METRICS_ENABLED:
                             ESI_REQUESTS_TOTAL.labels(endpoint_type=endpoint_type or "unknown", status="server_error").inc()
                         # For pagination endpoints, server errors likely mean end of data
-                        if "/contracts/public/" in endpoint and "?page=" in endpoint:
+                        if server_errors_end_pages and _is_public_contracts_page(endpoint):
                             logger.info(f"Treating server error as end of pagination for contracts endpoint")
                             return []
                         else:
@@ -776,7 +1533,15 @@ async def _fetch_esi_with_retry(
         raise ESIRequestError(f"Max retries exceeded for {endpoint_type} endpoint: {endpoint} (took {elapsed:.2f}s)")
 
     # Use circuit breaker to protect the API call
-    return await _esi_circuit_breaker.call(_do_request)
+    async def _governed_request():
+        # One slot covers the whole retry loop so a request never waits on its own 420/429 pause.
+        # The governor sits outside the circuit breaker so its waits don't count against the breaker timeout.
+        async with esi_governor.request():
+            result = await _esi_circuit_breaker.call(_do_request)
+        return result, response_pages
+
+    result, pages = await esi_single_flight.do(etag_key, _governed_request)
+    return (result, pages) if with_pages else result
 
 
 @validate_api_response
@@ -849,7 +1614,63 @@ async def fetch_esi(
         >>> print(corp['name'])  # Corporation name
     """
     headers = {"Authorization": f"Bearer {access_token}"}
-    return await _fetch_esi_with_retry(endpoint, headers=headers, max_retries=max_retries, is_public=False)
+    cache_subject = f"char:{char_id}" if char_id else "auth"
+    return await _fetch_esi_with_retry(
+        endpoint, headers=headers, max_retries=max_retries, is_public=False, cache_subject=cache_subject
+    )
+
+
+async def iter_esi_pages(
+    endpoint: str, char_id: Optional[int], access_token: str
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield every page of a paginated authenticated ESI endpoint as soon as it arrives.
+
+    Page 1 is fetched first to read X-Pages; all remaining pages are then requested
+    concurrently (bounded by the ESI governor) and yielded in completion order, so
+    callers can process a large asset list page by page instead of waiting for the
+    whole list.
+
+    Args:
+        endpoint: ESI API endpoint path without a page parameter
+        char_id: Character ID for character endpoints, None for corporation endpoints
+        access_token: Valid OAuth2 access token
+
+    Yields:
+        List of items for each non-empty page
+
+    Raises:
+        ESIApiError: If any page fails after retries; pages already yielded stay valid
+    """
+    headers = {"Authorization": f"Bearer {access_token}"}
+    cache_subject = f"char:{char_id}" if char_id else "auth"
+    separator = "&" if "?" in endpoint else "?"
+
+    async def fetch_page(page: int) -> Tuple[Any, int]:
+        return await _fetch_esi_with_retry(
+            f"{endpoint}{separator}page={page}",
+            headers=headers,
+            is_public=False,
+            cache_subject=cache_subject,
+            with_pages=True,
+        )
+
+    first_page, total_pages = await fetch_page(1)
+    if first_page:
+        yield first_page
+    if total_pages <= 1:
+        return
+
+    logger.info(f"Fetching {total_pages - 1} more pages of {endpoint} concurrently")
+    tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(2, total_pages + 1)]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            page_items, _ = await next_page
+            if page_items:
+                yield page_items
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 @validate_input_params(str, (int, type(None)), str)
@@ -897,15 +1718,11 @@ def fetch_public_contracts(
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            with esi_governor.sync_request():
+                response = requests.get(url, headers=headers, timeout=30)
+            esi_governor.observe(response)
             response.raise_for_status()
 
-            # Check rate limiting
-            remaining = response.headers.get("X-ESI-Error-Limit-Remain", "100")
-            reset_time = response.headers.get("X-ESI-Error-Limit-Reset", "60")
-            if int(remaining) < 20:
-                logger.warning(f"ESI rate limit low: {remaining} requests remaining, resets in {reset_time}s")
-
             return response.json()
         except requests.exceptions.RequestException as e:
             if attempt < max_retries - 1:
@@ -942,15 +1759,11 @@ def fetch_public_contract_items(contract_id: int, max_retries: int = 3) -> Optio
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            with esi_governor.sync_request():
+                response = requests.get(url, headers=headers, timeout=30)
+            esi_governor.observe(response)
             response.raise_for_status()
 
-            # Check rate limiting
-            remaining = response.headers.get("X-ESI-Error-Limit-Remain", "100")
-            reset_time = response.headers.get("X-ESI-Error-Limit-Reset", "60")
-            if int(remaining) < 20:
-                logger.warning(f"ESI rate limit low: {remaining} requests remaining, resets in {reset_time}s")
-
             # Handle empty response (valid for contracts with no items)
             if not response.text.strip():
                 return []
@@ -968,6 +1781,39 @@ def fetch_public_contract_items(contract_id: int, max_retries: int = 3) -> Optio
                 return None
 
 
+@validate_input_params(int)
+async def fetch_public_contract_items_async(contract_id: int) -> Optional[List[Dict[str, Any]]]:
+    """Fetch every item of a public contract through the shared ESI request stack.
+
+    Uses the shared aiohttp session, ETag store, governor, circuit breaker and metrics of
+    _fetch_esi_with_retry. Page 1 is read first; when X-Pages reports more pages (contracts
+    with more than 1000 items) the remaining pages are fetched concurrently.
+
+    Args:
+        contract_id: The EVE contract ID to fetch items for
+
+    Returns:
+        List of contract item dictionaries ([] for expired or accepted contracts), None if failed
+    """
+    endpoint = f"/contracts/public/items/{contract_id}/"
+    try:
+        first_page, total_pages = await _fetch_esi_with_retry(endpoint, is_public=True, with_pages=True)
+        items = list(first_page or [])
+        if total_pages > 1:
+            pages = await asyncio.gather(
+                *(
+                    _fetch_esi_with_retry(f"{endpoint}?page={page}", is_public=True)
+                    for page in range(2, total_pages + 1)
+                )
+            )
+            for page_items in pages:
+                items.extend(page_items or [])
+        return items
+    except ESIApiError as e:
+        logger.error(f"Failed to fetch items for contract {contract_id}: {e}")
+        return None
+
+
 @validate_input_params(int, int)
 async def fetch_public_contracts_async(
     region_id: int, page: int = 1, max_retries: int = 3, sort_by_price: bool = False
@@ -997,15 +1843,12 @@ async def fetch_public_contracts_async(
     sess = await get_session()
     for attempt in range(max_retries):
         try:
-            async with sess.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            async with esi_governor.request(), sess.get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                esi_governor.observe(response)
                 response.raise_for_status()
 
-                # Check rate limiting
-                remaining = response.headers.get("X-ESI-Error-Limit-Remain", "100")
-                reset_time = response.headers.get("X-ESI-Error-Limit-Reset", "60")
-                if int(remaining) < 20:
-                    logger.warning(f"ESI rate limit low: {remaining} requests remaining, resets in {reset_time}s")
-
                 contracts = await response.json()
 
                 # Sort by price per item if requested
@@ -1060,6 +1903,36 @@ async def fetch_public_contracts_async(
                 return None
 
 
+async def fetch_public_contracts_page(
+    region_id: int, page: int = 1, max_retries: int = 3
+) -> Tuple[Optional[List[Dict[str, Any]]], int]:
+    """Fetch one page of a region's public contracts together with the X-Pages total.
+
+    Goes through the same path as every other ESI GET, so the ETag and Expires cache,
+    respect-expiry mode and single-flight apply to the crawl. Unlike
+    fetch_public_contracts_async, server errors and timeouts are retried with exponential
+    backoff and never mistaken for the end of the data.
+
+    Args:
+        region_id: The EVE region ID to fetch contracts from
+        page: Page number to fetch (default: 1)
+        max_retries: Maximum number of attempts (default: 3)
+
+    Returns:
+        Tuple of (contracts, total_pages). contracts is [] for a page past the end
+        (404) and None if the page could not be fetched; total_pages is 0 when unknown.
+    """
+    endpoint = f"/contracts/public/{region_id}/?page={page}"
+    try:
+        contracts, total_pages = await _fetch_esi_with_retry(
+            endpoint, max_retries=max_retries, is_public=True, with_pages=True, server_errors_end_pages=False
+        )
+    except (ESIApiError, aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logger.error(f"Contracts page {page} of region {region_id} failed after {max_retries} attempts: {e}")
+        return None, 0
+    return contracts or [], total_pages
+
+
 @benchmark
 async def wp_request(method: str, endpoint: str, data: Optional[Dict] = None) -> Optional[Dict]:
     """
@@ -1142,7 +2015,7 @@ async def wp_request(method: str, endpoint: str, data: Optional[Dict] = None) ->
                         raise WordPressRequestError(f"WordPress API error {response.status}: {endpoint}")
             elif method.upper() == "POST":
                 async with sess.post(url, json=data, auth=auth) as response:
-                    if response.status in [200, 201]:
+                    if response.status in [200, 201, 207]:  # 207: /batch/v1 multi-status
                         result = await response.json()
                         result = sanitize_api_response(result)  # Sanitize API response
                         elapsed = time.time() - start_time
@@ -1285,6 +2158,147 @@ async def wp_request(method: str, endpoint: str, data: Optional[Dict] = None) ->
     return await _wp_circuit_breaker.call(_do_wp_request)
 
 
+WP_BATCH_ENDPOINT = "/batch/v1"
+
+
+class WordPressBatchClient:
+    """Packs concurrent WordPress writes into /batch/v1 calls (WordPress 5.6+).
+
+    Callers await write() as they would wp_request(). Writes submitted while a
+    batch is filling are sent together, up to max_requests per HTTP call, and each
+    caller gets back its own sub-response, or the exception wp_request() would
+    have raised for it. Servers without the batch route are detected on the
+    first batch; from then on every write is sent as a single request.
+    """
+
+    def __init__(
+        self, max_requests: int = WP_BATCH_MAX_REQUESTS, linger: float = 0.05, enabled: bool = WP_BATCH_API_ENABLED
+    ):
+        self.max_requests = max_requests
+        self.linger = linger
+        self.supported: Optional[bool] = None if enabled else False
+        self._pending: List[Tuple[str, str, Optional[Dict], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._send_tasks: set = set()
+        self.stats = {"batches": 0, "batched_requests": 0, "single_requests": 0, "failed_batches": 0}
+
+    async def write(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Optional[Dict]:
+        """Queue a POST, PUT or DELETE for the next batch and wait for its result.
+
+        Returns:
+            The same result wp_request() returns for the request
+
+        Raises:
+            WordPressAuthError: If the sub-request was not authorized
+            WordPressRequestError: If the sub-request or the batch call failed
+        """
+        if self.supported is False:
+            self.stats["single_requests"] += 1
+            return await wp_request(method, endpoint, data)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((method.upper(), endpoint, data, future))
+        if len(self._pending) >= self.max_requests:
+            self._dispatch(self._pending[: self.max_requests])
+            del self._pending[: self.max_requests]
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_linger())
+        return await future
+
+    async def write_many(self, requests: List[Tuple[str, str, Optional[Dict]]]) -> List[Any]:
+        """Send several writes; results (or exceptions) are returned in request order."""
+        return await asyncio.gather(*(self.write(*request) for request in requests), return_exceptions=True)
+
+    async def _flush_after_linger(self) -> None:
+        await asyncio.sleep(self.linger)
+        self._flush_task = None
+        while self._pending:
+            self._dispatch(self._pending[: self.max_requests])
+            del self._pending[: self.max_requests]
+
+    def _dispatch(self, batch: List[Tuple[str, str, Optional[Dict], asyncio.Future]]) -> None:
+        task = asyncio.create_task(self._send(batch))
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
+
+    @staticmethod
+    def _sub_request(method: str, endpoint: str, data: Optional[Dict]) -> Dict[str, Any]:
+        if method == "DELETE":
+            return {"method": "DELETE", "path": f"{endpoint}?force=true" if data and data.get("force") else endpoint}
+        return {"method": method, "path": endpoint, "body": data or {}}
+
+    @staticmethod
+    def _sub_result(method: str, endpoint: str, sub_response: Optional[Dict]) -> Optional[Dict]:
+        """Map one /batch/v1 sub-response to what wp_request() returns or raises."""
+        if not sub_response:
+            raise WordPressRequestError(f"No batch response for {method} {endpoint}")
+        status = sub_response.get("status")
+        body = sub_response.get("body")
+        if status in (200, 201):
+            return {"deleted": True} if method == "DELETE" else body
+        if status in (401, 403):
+            raise WordPressAuthError(f"Authentication failed for {endpoint}")
+        if status == 404 and isinstance(body, dict) and body.get("code") == "rest_no_route":
+            return None
+        raise WordPressRequestError(f"WordPress API error {status}: {endpoint}")
+
+    async def _send_singly(self, batch: List[Tuple[str, str, Optional[Dict], asyncio.Future]]) -> List[Any]:
+        self.stats["single_requests"] += len(batch)
+        return await asyncio.gather(
+            *(wp_request(method, endpoint, data) for method, endpoint, data, _ in batch), return_exceptions=True
+        )
+
+    async def _send(self, batch: List[Tuple[str, str, Optional[Dict], asyncio.Future]]) -> None:
+        try:
+            if self.supported is False:
+                results = await self._send_singly(batch)
+            else:
+                payload = {
+                    "validation": "normal",
+                    "requests": [self._sub_request(method, endpoint, data) for method, endpoint, data, _ in batch],
+                }
+                try:
+                    response = await wp_request("POST", WP_BATCH_ENDPOINT, payload)
+                except WordPressRequestError as e:
+                    # A rejected batch (too large, one bad payload) must not fail every write in it
+                    logger.warning(f"Batch of {len(batch)} WordPress writes failed ({e}), sending them singly")
+                    self.stats["failed_batches"] += 1
+                    results = await self._send_singly(batch)
+                else:
+                    if response is None:
+                        logger.info("WordPress has no /batch/v1 route, sending writes as single requests")
+                        self.supported = False
+                        await self._send(batch)
+                        return
+                    self.supported = True
+                    self.stats["batches"] += 1
+                    self.stats["batched_requests"] += len(batch)
+                    sub_responses = response.get("responses", []) if isinstance(response, dict) else []
+                    results = []
+                    for index, (method, endpoint, _, _) in enumerate(batch):
+                        try:
+                            sub_response = sub_responses[index] if index < len(sub_responses) else None
+                            results.append(self._sub_result(method, endpoint, sub_response))
+                        except WordPressApiError as e:
+                            results.append(e)
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "supported": self.supported}
+
+
+wp_batch_client = WordPressBatchClient()
+
+
 @validate_input_params(str, str)
 def send_email(subject: str, body: str) -> None:
     """Send an email alert."""
@@ -1394,7 +2408,7 @@ async def fetch_type_icon(type_id: int, size: int = 512) -> str:
         icon_url = f"https://images.evetech.net/types/{type_id}/{variation}?size={size}"
         # Test if the URL exists by making a HEAD request
         try:
-            async with sess.head(icon_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            async with esi_governor.request(), sess.head(icon_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
                     return icon_url
         except Exception:
@@ -4,13 +4,20 @@ EVE Observer Blueprint Processor
 Handles fetching and processing of EVE blueprint data.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-
-import requests
-
-from api_client import delete_wp_post, fetch_esi, fetch_public_esi, fetch_type_icon, wp_request
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple
+
+from api_client import (
+    WordPressApiError,
+    blueprint_limiter,
+    fetch_esi,
+    fetch_public_esi,
+    fetch_type_icon,
+    wp_batch_client,
+    wp_request,
+)
 from cache_manager import (
     get_cached_wp_post_id,
     load_blueprint_cache,
@@ -26,8 +33,9 @@ from cache_manager import (
     save_structure_cache,
     set_cached_wp_post_id,
 )
-from config import WP_BASE_URL, WP_PER_PAGE
-from data_processors import get_wp_auth
+from config import WP_PER_PAGE
+from sde_store import sde_store
+from wp_post_index import wp_post_index
 
 logger = logging.getLogger(__name__)
 
@@ -92,7 +100,12 @@ async def update_blueprint_in_wp(
     # Try to get post ID from cache first
     cached_post_id = get_cached_wp_post_id(wp_post_id_cache, "eve_blueprint", item_id)
 
-    if cached_post_id:
+    if wp_post_index.is_loaded("eve_blueprint"):
+        # Sync-start index already holds every blueprint post
+        existing_post = wp_post_index.get("eve_blueprint", slug)
+        if existing_post:
+            set_cached_wp_post_id(wp_post_id_cache, "eve_blueprint", item_id, existing_post["id"])
+    elif cached_post_id:
         # Use direct post ID lookup
         response = await wp_request("GET", f"/wp/v2/eve_blueprint/{cached_post_id}")
         existing_post = response
@@ -193,6 +206,11 @@ async def update_blueprint_in_wp(
             image_url = await fetch_type_icon(type_id, size=512)
             post_data["meta"]["_thumbnail_external_url"] = image_url
 
+    # Skip the write when nothing but timestamps changed since the stored version
+    if wp_post_index.unchanged("eve_blueprint", existing_post, post_data):
+        logger.info(f"{post_data['slug']} unchanged, skipping update")
+        return
+
     if existing_post:
         # Check if data has changed before updating
         existing_meta = existing_post.get("meta", {})
@@ -214,9 +232,11 @@ async def update_blueprint_in_wp(
         # Update existing
         post_id = existing_post["id"]
         response = await wp_request("PUT", f"/wp/v2/eve_blueprint/{post_id}", post_data)
+        wp_post_index.record("eve_blueprint", response)
     else:
         # Create new
         response = await wp_request("POST", "/wp/v2/eve_blueprint", post_data)
+        wp_post_index.record("eve_blueprint", response)
 
         # Cache the new post ID if creation was successful
         if response:
@@ -229,13 +249,80 @@ async def update_blueprint_in_wp(
         logger.error(f"Failed to update blueprint {item_id}: WordPress API error")
 
 
+def _flatten_assets(
+    assets_data: List[Dict[str, Any]], location_id: Optional[int] = None
+) -> List[Tuple[Dict[str, Any], Optional[int]]]:
+    """Flatten a (possibly nested) asset list into (item, location_id) pairs.
+
+    Items nested under a container's "items" key inherit the container's
+    location_id when they don't carry their own.
+    """
+    flattened = []
+    stack = [(item, location_id) for item in reversed(assets_data or [])]
+    while stack:
+        item, item_location = stack.pop()
+        flattened.append((item, item_location))
+        if "items" in item:
+            child_location = item.get("location_id", item_location)
+            stack.extend((child, child_location) for child in reversed(item["items"]))
+    return flattened
+
+
+async def classify_blueprint_types(type_ids) -> Dict[str, Any]:
+    """Return the blueprint type cache with every given type ID classified.
+
+    Unknown type IDs are de-duplicated and classified from the local SDE store
+    where possible; the rest are resolved concurrently against ESI (bounded by
+    the ESI governor). The cache is written to disk once at the end rather than
+    after every lookup. Lookups that fail are left unclassified so they are
+    retried on the next run.
+
+    Args:
+        type_ids: Iterable of type IDs to classify
+
+    Returns:
+        Blueprint type cache mapping str(type_id) to True/False
+    """
+    blueprint_type_cache = load_blueprint_type_cache()
+    unknown_type_ids = sorted({type_id for type_id in type_ids if type_id and str(type_id) not in blueprint_type_cache})
+    if not unknown_type_ids:
+        return blueprint_type_cache
+
+    resolved = 0
+    esi_type_ids = []
+    for type_id in unknown_type_ids:
+        is_blueprint = sde_store.is_blueprint(type_id)
+        if is_blueprint is None:
+            esi_type_ids.append(type_id)
+        else:
+            blueprint_type_cache[str(type_id)] = is_blueprint
+            resolved += 1
+
+    if esi_type_ids:
+        logger.info(f"Resolving {len(esi_type_ids)} unknown type IDs for blueprint classification...")
+    results = await asyncio.gather(
+        *(fetch_public_esi(f"/universe/types/{type_id}") for type_id in esi_type_ids), return_exceptions=True
+    )
+    for type_id, type_data in zip(esi_type_ids, results):
+        if isinstance(type_data, Exception):
+            logger.warning(f"Failed to classify type {type_id}: {type_data}")
+            continue
+        blueprint_type_cache[str(type_id)] = bool(type_data and "Blueprint" in type_data.get("name", ""))
+        resolved += 1
+
+    if resolved:
+        save_blueprint_type_cache(blueprint_type_cache)
+    return blueprint_type_cache
+
+
 async def extract_blueprints_from_assets(
     assets_data: List[Dict[str, Any]], owner_type: str, owner_id: int, access_token: str, track_bpcs: bool = False
 ) -> List[Dict[str, Any]]:
     """Extract blueprint information from character or corporation assets data.
 
-    Recursively processes asset lists to identify blueprints, filtering by type
-    and ownership. By default only tracks BPOs (originals), optionally tracks BPCs.
+    Flattens the asset tree, classifies all distinct type IDs in one concurrent
+    pass, then filters blueprints by type and ownership. By default only tracks
+    BPOs (originals), optionally tracks BPCs.
 
     Args:
         assets_data: List of asset dictionaries from ESI API
@@ -248,67 +335,43 @@ async def extract_blueprints_from_assets(
         List of blueprint dictionaries with standardized format
 
     Note:
-        Recursively processes containers within assets.
+        Includes items nested in containers.
         Uses blueprint type cache to avoid repeated ESI calls for type identification.
     """
-    blueprint_type_cache = load_blueprint_type_cache()
-    blueprints = []
+    flattened = _flatten_assets(assets_data)
     total_assets = len(assets_data) if assets_data else 0
-    processed_count = 0
 
     logger.info(f"Processing {total_assets} {owner_type} assets for blueprint extraction...")
 
-    async def process_items(items: List[Dict[str, Any]], location_id: Optional[int]) -> None:
-        nonlocal processed_count
-        for item in items:
-            processed_count += 1
-
-            # Log progress every 1000 items
-            if processed_count % 1000 == 0:
-                logger.info(f"Processed {processed_count}/{total_assets} assets...")
-
-            # Check if this is a blueprint (type_id corresponds to a blueprint)
-            type_id = item.get("type_id")
-            if type_id:
-                type_id_str = str(type_id)
-                if type_id_str in blueprint_type_cache:
-                    is_blueprint = blueprint_type_cache[type_id_str]
-                else:
-                    type_data = await fetch_public_esi(f"/universe/types/{type_id}")
-                    is_blueprint = type_data and "Blueprint" in type_data.get("name", "")
-                    blueprint_type_cache[type_id_str] = is_blueprint
-                    save_blueprint_type_cache(blueprint_type_cache)
-
-                if is_blueprint:
-                    # Check if we should track this blueprint
-                    quantity = item.get("quantity", 1)
-                    is_bpo = quantity == -1
-
-                    # Only track BPOs by default, or BPCs if explicitly requested
-                    if is_bpo or track_bpcs:
-                        # This is a blueprint
-                        blueprint_info = {
-                            "item_id": item.get("item_id"),
-                            "type_id": type_id,
-                            "location_id": location_id,
-                            "quantity": quantity,
-                            "material_efficiency": 0,  # Assets don't provide ME/TE info
-                            "time_efficiency": 0,
-                            "runs": -1,  # Assume BPO unless we can determine otherwise
-                            "source": f"{owner_type}_assets",
-                            "owner_id": owner_id,
-                        }
-                        blueprints.append(blueprint_info)
-                    else:
-                        # Skip BPCs - only track BPOs
-                        logger.debug(f"Skipping BPC (quantity={quantity}) for item_id: {item.get('item_id')}")
-
-            # Recursively process containers
-            if "items" in item:
-                await process_items(item["items"], item.get("location_id", location_id))
+    blueprint_type_cache = await classify_blueprint_types(item.get("type_id") for item, _ in flattened)
 
-    if assets_data:
-        await process_items(assets_data, None)
+    blueprints = []
+    for item, location_id in flattened:
+        type_id = item.get("type_id")
+        if not type_id or not blueprint_type_cache.get(str(type_id)):
+            continue
+
+        quantity = item.get("quantity", 1)
+        is_bpo = quantity == -1
+
+        # Only track BPOs by default, or BPCs if explicitly requested
+        if is_bpo or track_bpcs:
+            blueprints.append(
+                {
+                    "item_id": item.get("item_id"),
+                    "type_id": type_id,
+                    "location_id": location_id,
+                    "quantity": quantity,
+                    "material_efficiency": 0,  # Assets don't provide ME/TE info
+                    "time_efficiency": 0,
+                    "runs": -1,  # Assume BPO unless we can determine otherwise
+                    "source": f"{owner_type}_assets",
+                    "owner_id": owner_id,
+                }
+            )
+        else:
+            # Skip BPCs - only track BPOs
+            logger.debug(f"Skipping BPC (quantity={quantity}) for item_id: {item.get('item_id')}")
 
     logger.info(f"Completed asset processing: found {len(blueprints)} BPO blueprints in {total_assets} assets")
     return blueprints
@@ -371,41 +434,30 @@ async def extract_blueprints_from_contracts(
         Only includes BPOs (quantity == -1) from contracts.
         Contract blueprints don't include ME/TE information.
     """
-    blueprint_type_cache = load_blueprint_type_cache()
+    contract_items = [(contract, item) for contract in contracts_data for item in contract.get("items", [])]
+    blueprint_type_cache = await classify_blueprint_types(item.get("type_id") for _, item in contract_items)
     blueprints = []
 
-    for contract in contracts_data:
-        if "items" in contract:
-            for item in contract["items"]:
-                type_id = item.get("type_id")
-                if type_id:
-                    type_id_str = str(type_id)
-                    if type_id_str in blueprint_type_cache:
-                        is_blueprint = blueprint_type_cache[type_id_str]
-                    else:
-                        type_data = await fetch_public_esi(f"/universe/types/{type_id}")
-                        is_blueprint = type_data and "Blueprint" in type_data.get("name", "")
-                        blueprint_type_cache[type_id_str] = is_blueprint
-                        save_blueprint_type_cache(blueprint_type_cache)
-
-                    if is_blueprint:
-                        quantity = item.get("quantity", 1)
-                        is_bpo = quantity == -1
-
-                        # Only track BPOs from contracts (BPCs in contracts are typically for sale/consumable)
-                        if is_bpo:
-                            blueprint_info = {
-                                "item_id": item.get("item_id", type_id),  # Contracts may not have item_id
-                                "type_id": type_id,
-                                "location_id": None,  # Contracts don't specify location
-                                "quantity": quantity,
-                                "material_efficiency": 0,  # Contract items don't provide ME/TE
-                                "time_efficiency": 0,
-                                "runs": -1,
-                                "source": f"{owner_type}_contract_{contract.get('contract_id')}",
-                                "owner_id": owner_id,
-                            }
-                            blueprints.append(blueprint_info)
+    for contract, item in contract_items:
+        type_id = item.get("type_id")
+        if not type_id or not blueprint_type_cache.get(str(type_id)):
+            continue
+
+        # Only track BPOs from contracts (BPCs in contracts are typically for sale/consumable)
+        quantity = item.get("quantity", 1)
+        if quantity == -1:
+            blueprint_info = {
+                "item_id": item.get("item_id", type_id),  # Contracts may not have item_id
+                "type_id": type_id,
+                "location_id": None,  # Contracts don't specify location
+                "quantity": quantity,
+                "material_efficiency": 0,  # Contract items don't provide ME/TE
+                "time_efficiency": 0,
+                "runs": -1,
+                "source": f"{owner_type}_contract_{contract.get('contract_id')}",
+                "owner_id": owner_id,
+            }
+            blueprints.append(blueprint_info)
 
     return blueprints
 
@@ -468,7 +520,12 @@ async def update_blueprint_from_asset_in_wp(
     # Try to get post ID from cache first
     cached_post_id = get_cached_wp_post_id(wp_post_id_cache, "eve_blueprint", item_id)
 
-    if cached_post_id:
+    if wp_post_index.is_loaded("eve_blueprint"):
+        # Sync-start index already holds every blueprint post
+        existing_post = wp_post_index.get("eve_blueprint", slug)
+        if existing_post:
+            set_cached_wp_post_id(wp_post_id_cache, "eve_blueprint", item_id, existing_post["id"])
+    elif cached_post_id:
         # Use direct post ID lookup
         response = await wp_request("GET", f"/wp/v2/eve_blueprint/{cached_post_id}")
         existing_post = response
@@ -573,6 +630,11 @@ async def update_blueprint_from_asset_in_wp(
             image_url = await fetch_type_icon(type_id, size=512)
             post_data["meta"]["_thumbnail_external_url"] = image_url
 
+    # Skip the write when nothing but timestamps changed since the stored version
+    if wp_post_index.unchanged("eve_blueprint", existing_post, post_data):
+        logger.info(f"{post_data['slug']} unchanged, skipping update")
+        return
+
     if existing_post:
         # Check if data has changed before updating
         existing_meta = existing_post.get("meta", {})
@@ -595,9 +657,11 @@ async def update_blueprint_from_asset_in_wp(
         # Update existing
         post_id = existing_post["id"]
         response = await wp_request("PUT", f"/wp/v2/eve_blueprint/{post_id}", post_data)
+        wp_post_index.record("eve_blueprint", response)
     else:
         # Create new
         response = await wp_request("POST", "/wp/v2/eve_blueprint", post_data)
+        wp_post_index.record("eve_blueprint", response)
 
         # Cache the new post ID if creation was successful
         if response:
@@ -610,7 +674,7 @@ async def update_blueprint_from_asset_in_wp(
         logger.error(f"Failed to update blueprint {item_id} from {source}: WordPress API error")
 
 
-def cleanup_blueprint_posts() -> None:
+async def cleanup_blueprint_posts() -> None:
     """
     Clean up blueprint posts that don't match filtering criteria.
 
@@ -623,11 +687,13 @@ def cleanup_blueprint_posts() -> None:
     """
     logger.info("Cleaning up blueprint posts...")
 
-    response = requests.get(
-        f"{WP_BASE_URL}/wp-json/wp/v2/eve_blueprint", auth=get_wp_auth(), params={"per_page": WP_PER_PAGE}, timeout=30
-    )
-    if response.status_code == 200:
-        blueprints = response.json()
+    try:
+        blueprints = await wp_request("GET", f"/wp/v2/eve_blueprint?per_page={WP_PER_PAGE}")
+    except WordPressApiError as e:
+        logger.error(f"Could not list blueprint posts for cleanup: {e}")
+        return
+    if blueprints is not None:
+        to_delete = []
         for bp in blueprints:
             meta = bp.get("meta", {})
             quantity = meta.get("_eve_bp_quantity", -1)
@@ -639,35 +705,112 @@ def cleanup_blueprint_posts() -> None:
             if quantity != -1:
                 bp_id = meta.get("_eve_bp_item_id")
                 logger.info(f"Deleting BPC (quantity={quantity}): {bp_id}")
-                delete_wp_post("eve_blueprint", bp["id"])
+                to_delete.append(bp)
                 continue
 
             # If it's from a corporation, check if it's No Mercy incorporated
             if owner_id and source.startswith("corp_"):
                 # We need to check if this corp_id belongs to No Mercy incorporated
-                corp_response = requests.get(
-                    f"{WP_BASE_URL}/wp-json/wp/v2/eve_corporation?meta_key=_eve_corp_id&meta_value={owner_id}",
-                    auth=get_wp_auth(),
-                    timeout=30,
-                )
-                if corp_response.status_code == 200:
-                    corp_posts = corp_response.json()
+                try:
+                    corp_posts = await wp_request(
+                        "GET", f"/wp/v2/eve_corporation?meta_key=_eve_corp_id&meta_value={owner_id}"
+                    )
+                except WordPressApiError as e:
+                    logger.warning(f"Could not look up corporation {owner_id} of blueprint {bp.get('id')}: {e}")
+                    continue
+                if corp_posts is not None:
                     if not corp_posts:  # Corporation not found in our records
                         bp_id = bp.get("meta", {}).get("_eve_bp_item_id")
                         logger.info(f"Deleting blueprint from unknown corporation: {bp_id}")
-                        delete_wp_post("eve_blueprint", bp["id"])
+                        to_delete.append(bp)
                     else:
                         corp_name = corp_posts[0].get("title", {}).get("rendered", "")
                         if corp_name.lower() != "no mercy incorporated":
                             bp_id = bp.get("meta", {}).get("_eve_bp_item_id")
                             logger.info(f"Deleting blueprint from {corp_name}: {bp_id}")
-                            delete_wp_post("eve_blueprint", bp["id"])
+                            to_delete.append(bp)
             # If it's from character assets/industry jobs and we don't have a char_id, it might be orphaned
             elif not char_id and not owner_id:
                 # These are from the direct blueprint endpoints - check if they're corporation blueprints
                 # For now, keep them as they come from authenticated sources
                 pass
 
+        # Deletes go out in /batch/v1 calls of up to 25
+        results = await wp_batch_client.write_many(
+            [("DELETE", f"/wp/v2/eve_blueprint/{bp['id']}", {"force": True}) for bp in to_delete]
+        )
+        for bp, result in zip(to_delete, results):
+            bp_id = bp.get("meta", {}).get("_eve_bp_item_id")
+            if result and not isinstance(result, Exception):
+                wp_post_index.forget("eve_blueprint", bp.get("slug", ""))
+            else:
+                logger.error(f"Failed to delete blueprint: {bp_id}")
+
+
+async def process_blueprints_from_asset_pages(
+    asset_pages: AsyncIterable[List[Dict[str, Any]]],
+    owner_type: str,
+    owner_id: int,
+    access_token: str,
+    wp_post_id_cache: Dict[str, Any],
+    blueprint_cache: Dict[str, Any],
+    location_cache: Dict[str, Any],
+    structure_cache: Dict[str, Any],
+    failed_structures: Dict[str, Any],
+) -> int:
+    """Extract and process blueprints page by page while the remaining asset pages download.
+
+    Each page is classified as soon as it arrives and its blueprints are handed to
+    process_blueprints_parallel in the background, so WordPress updates for early
+    pages overlap with ESI fetches for later ones.
+
+    Args:
+        asset_pages: Async iterable yielding lists of asset dictionaries
+        owner_type: Type of owner ('char' or 'corp')
+        owner_id: Character or corporation ID
+        access_token: Valid ESI access token
+        wp_post_id_cache: WordPress post ID cache
+        blueprint_cache: Blueprint name cache
+        location_cache: Location name cache
+        structure_cache: Structure name cache
+        failed_structures: Failed structures cache
+
+    Returns:
+        Number of blueprints found across all pages
+    """
+    update_tasks = []
+    total_assets = 0
+    total_blueprints = 0
+    try:
+        async for page in asset_pages:
+            total_assets += len(page)
+            asset_blueprints = await extract_blueprints_from_assets(page, owner_type, owner_id, access_token)
+            if not asset_blueprints:
+                continue
+            total_blueprints += len(asset_blueprints)
+            update_tasks.append(
+                asyncio.create_task(
+                    process_blueprints_parallel(
+                        asset_blueprints,
+                        update_blueprint_from_asset_in_wp,
+                        wp_post_id_cache,
+                        owner_id,
+                        access_token,
+                        blueprint_cache,
+                        location_cache,
+                        structure_cache,
+                        failed_structures,
+                    )
+                )
+            )
+    finally:
+        # Let updates for pages already seen finish even if a later page failed
+        if update_tasks:
+            await asyncio.gather(*update_tasks, return_exceptions=True)
+
+    logger.info(f"Processed {total_assets} {owner_type} assets: {total_blueprints} blueprints")
+    return total_blueprints
+
 
 async def process_blueprints_parallel(
     blueprints: List[Dict[str, Any]],
@@ -693,31 +836,27 @@ async def process_blueprints_parallel(
         structure_cache: Optional structure name cache
         failed_structures: Optional failed structures cache
     """
-    import asyncio
-
     if not blueprints:
         logger.info("No blueprints to process")
         return
 
     logger.info(f"Processing {len(blueprints)} blueprints in parallel...")
 
-    # Create tasks for concurrent processing
-    tasks = [
-        update_function(
-            blueprint,
-            wp_post_id_cache,
-            char_id,
-            access_token,
-            blueprint_cache,
-            location_cache,
-            structure_cache,
-            failed_structures,
-        )
-        for blueprint in blueprints
-    ]
-
-    # Execute all tasks concurrently
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def limited_update(blueprint: Dict[str, Any]) -> Any:
+        async with blueprint_limiter.slot():
+            return await update_function(
+                blueprint,
+                wp_post_id_cache,
+                char_id,
+                access_token,
+                blueprint_cache,
+                location_cache,
+                structure_cache,
+                failed_structures,
+            )
+
+    # Execute all tasks concurrently under the adaptive blueprint limiter
+    results = await asyncio.gather(*(limited_update(blueprint) for blueprint in blueprints), return_exceptions=True)
 
     # Log any exceptions that occurred
     success_count = 0
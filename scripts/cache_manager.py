@@ -15,9 +15,11 @@ from datetime import datetime, timezone
 from functools import lru_cache
 from typing import Any, Dict, Optional
 
+from cache_store import load_file_cache, save_file_cache
 from config import (
     BLUEPRINT_CACHE_FILE,
     BLUEPRINT_TYPE_CACHE_FILE,
+    CACHE_BACKEND,
     CACHE_DIR,
     FAILED_STRUCTURES_FILE,
     LOCATION_CACHE_FILE,
@@ -188,9 +190,27 @@ def ensure_cache_dir() -> None:
         os.makedirs(CACHE_DIR)
 
 
+def _cache_ttl_seconds() -> Optional[float]:
+    return CACHE_CONFIG["ttl_days"] * 24 * 60 * 60 if CACHE_CONFIG["ttl_days"] else None
+
+
 def load_cache(cache_file: str) -> Dict[str, Any]:
-    """Load cache from file with compression support and TTL cleanup."""
+    """Load cache from file with compression support and TTL cleanup.
+
+    With the SQLite backend the cache is read from its table in the cache store
+    (importing the legacy JSON file on first use) and expired rows are purged there.
+    """
     ensure_cache_dir()
+    if CACHE_BACKEND == "sqlite":
+        try:
+            start_time = time.time()
+            data = load_file_cache(cache_file, _cache_ttl_seconds())
+            logger.debug(f"Cache loaded for {cache_file}: {len(data)} entries in {time.time() - start_time:.3f}s")
+            _cache_stats["loads"] += 1
+            return data
+        except Exception as e:
+            logger.warning(f"Failed to load cache {cache_file}: {e}")
+            return {}
     if os.path.exists(cache_file):
         try:
             start_time = time.time()
@@ -232,8 +252,21 @@ def save_cache(cache_file: str, data: Dict[str, Any]) -> None:
 
 
 def _save_cache_immediate(cache_file: str, data: Dict[str, Any]) -> None:
-    """Save cache immediately with compression."""
+    """Save cache immediately with compression.
+
+    With the SQLite backend only the entries that changed since the last load or
+    save are written.
+    """
     ensure_cache_dir()
+    if CACHE_BACKEND == "sqlite":
+        try:
+            start_time = time.time()
+            written = save_file_cache(cache_file, data, _cache_ttl_seconds())
+            logger.debug(f"✓ Cache saved for {cache_file}: {written} changed rows in {time.time() - start_time:.3f}s")
+            _cache_stats["saves"] += 1
+        except Exception as e:
+            logger.error(f"Failed to save cache {cache_file}: {e}")
+        return
     try:
         start_time = time.time()
         logger.debug(f"Saving cache to {cache_file} ({len(data)} entries)...")
@@ -11,8 +11,9 @@ from typing import Any, Dict, List
 
 import aiohttp
 
-from api_client import fetch_public_esi, get_session
-from config import ESI_BASE_URL
+from api_client import esi_governor, fetch_public_esi, get_session
+from cache_store import load_file_cache, save_file_cache
+from config import CACHE_BACKEND, ESI_BASE_URL
 
 # Configure logging
 logging.basicConfig(
@@ -43,95 +44,60 @@ class ContractCacheManager:
 
     async def load_issuer_cache(self) -> Dict[str, str]:
         """Load cached issuer names."""
-        cache_path = self.get_issuer_cache_path()
-        try:
-            if os.path.exists(cache_path):
-                with open(cache_path, "r") as f:
-                    return json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load issuer cache: {e}")
-        return {}
+        return self._load("issuer", self.get_issuer_cache_path())
 
     async def save_issuer_cache(self, issuer_cache: Dict[str, str]) -> None:
         """Save issuer names cache."""
-        cache_path = self.get_issuer_cache_path()
-        try:
-            with open(cache_path, "w") as f:
-                json.dump(issuer_cache, f, indent=2)
-            logger.info(f"Saved {len(issuer_cache)} issuer names to cache")
-        except Exception as e:
-            logger.error(f"Failed to save issuer cache: {e}")
+        self._save("issuer names", self.get_issuer_cache_path(), issuer_cache)
 
     async def load_type_cache(self) -> Dict[str, Dict[str, Any]]:
         """Load cached type data."""
-        cache_path = self.get_type_cache_path()
-        try:
-            if os.path.exists(cache_path):
-                with open(cache_path, "r") as f:
-                    return json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load type cache: {e}")
-        return {}
+        return self._load("type", self.get_type_cache_path())
 
     async def save_type_cache(self, type_cache: Dict[str, Dict[str, Any]]) -> None:
         """Save type data cache."""
-        cache_path = self.get_type_cache_path()
-        try:
-            with open(cache_path, "w") as f:
-                json.dump(type_cache, f, indent=2)
-            logger.info(f"Saved {len(type_cache)} type entries to cache")
-        except Exception as e:
-            logger.error(f"Failed to save type cache: {e}")
+        self._save("type entries", self.get_type_cache_path(), type_cache)
 
     async def load_contract_items_cache(self) -> Dict[str, List[Dict[str, Any]]]:
         """Load cached contract items."""
-        cache_path = self.get_contract_items_cache_path()
-        try:
-            if os.path.exists(cache_path):
-                with open(cache_path, "r") as f:
-                    return json.load(f)
-        except Exception as e:
-            msg = "Failed to load contract items cache: {}"
-            logger.warning(msg.format(e))
-        return {}
+        return self._load("contract items", self.get_contract_items_cache_path())
 
-    async def save_contract_items_cache(
-        self, items_cache: Dict[str, List[Dict[str, Any]]]
-    ) -> None:
+    async def save_contract_items_cache(self, items_cache: Dict[str, List[Dict[str, Any]]]) -> None:
         """Save contract items cache."""
-        cache_path = self.get_contract_items_cache_path()
-        try:
-            with open(cache_path, "w") as f:
-                json.dump(items_cache, f, indent=2)
-            count = len(items_cache)
-            logger.info("Saved {} contract items to cache".format(count))
-        except Exception as e:
-            msg = "Failed to save contract items cache: {}"
-            logger.error(msg.format(e))
+        self._save("contract items", self.get_contract_items_cache_path(), items_cache)
 
     async def load_corporation_cache(self) -> Dict[str, str]:
         """Load cached corporation names."""
-        cache_path = self.get_corporation_cache_path()
+        return self._load("corporation", self.get_corporation_cache_path())
+
+    async def save_corporation_cache(self, corporation_cache: Dict[str, str]) -> None:
+        """Save corporation names cache."""
+        self._save("corporation names", self.get_corporation_cache_path(), corporation_cache)
+
+    def _load(self, label: str, cache_path: str) -> Dict[str, Any]:
+        """Load a cache from the SQLite store (or its JSON file with the legacy backend)."""
         try:
+            if CACHE_BACKEND == "sqlite":
+                return load_file_cache(cache_path)
             if os.path.exists(cache_path):
                 with open(cache_path, "r") as f:
                     return json.load(f)
         except Exception as e:
-            msg = "Failed to load corporation cache: {}"
-            logger.warning(msg.format(e))
+            logger.warning(f"Failed to load {label} cache: {e}")
         return {}
 
-    async def save_corporation_cache(self, corporation_cache: Dict[str, str]) -> None:
-        """Save corporation names cache."""
-        cache_path = self.get_corporation_cache_path()
+    def _save(self, label: str, cache_path: str, data: Dict[str, Any]) -> None:
+        """Save a cache, writing only changed entries with the SQLite backend."""
         try:
+            if CACHE_BACKEND == "sqlite":
+                written = save_file_cache(cache_path, data)
+                logger.info(f"Saved {len(data)} {label} to cache ({written} changed)")
+                return
             with open(cache_path, "w") as f:
-                json.dump(corporation_cache, f, indent=2)
-            count = len(corporation_cache)
-            logger.info("Saved {} corporation names to cache".format(count))
+                json.dump(data, f, separators=(",", ":"))
+            logger.info(f"Saved {len(data)} {label} to cache")
         except Exception as e:
-            msg = "Failed to save corporation cache: {}"
-            logger.error(msg.format(e))
+            logger.error(f"Failed to save {label} cache: {e}")
 
     async def get_missing_issuer_names(
         self, issuer_ids: List[int], existing_cache: Dict[str, str]
@@ -159,7 +125,7 @@ class ContractCacheManager:
             try:
                 # Use the universe/names endpoint for batch resolution
                 sess = await get_session()
-                async with sess.post(
+                async with esi_governor.request(), sess.post(
                     f"{ESI_BASE_URL}/universe/names/",
                     json=[int(id) for id in batch_ids],
                     headers={
@@ -168,6 +134,7 @@ class ContractCacheManager:
                     },
                     timeout=aiohttp.ClientTimeout(total=30),
                 ) as response:
+                    esi_governor.observe(response)
                     response.raise_for_status()
                     names_data = await response.json()
 
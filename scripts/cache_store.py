@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+EVE Observer Cache Store
+Embedded SQLite (WAL mode) backend for the key/value caches.
+
+Each cache gets its own table with one row per key, so saving a cache only
+writes the rows that changed instead of re-serializing the whole file. The
+legacy JSON cache files are imported into their table the first time it is
+read; all of them can also be imported up front with:
+
+    python cache_store.py migrate [cache_dir]
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import CACHE_DB_NAME, CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def _read_legacy_json(json_file: str) -> Dict[str, Any]:
+    """Read a legacy JSON cache file, plain or gzip-compressed."""
+    try:
+        with open(json_file, "r") as f:
+            return json.load(f)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        with gzip.open(json_file, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _legacy_expiry(value: Any, ttl_seconds: Optional[float]) -> Optional[float]:
+    """Derive an expiry time from the "_timestamp" the JSON caches embedded in dict values."""
+    if not ttl_seconds or not isinstance(value, dict) or "_timestamp" not in value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value["_timestamp"]).replace("Z", "+00:00")).timestamp() + ttl_seconds
+    except ValueError:
+        return None
+
+
+class SQLiteCacheStore:
+    """Key/value cache tables in one SQLite database.
+
+    Tables are created on first use with (key, value, updated_at, expires_at)
+    columns. The store remembers the last known contents of each table, so
+    replace_all() with a full cache dict only upserts changed keys and deletes
+    removed ones.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._tables: set = set()
+        self._snapshots: Dict[str, Dict[str, str]] = {}
+        self.stats = {"rows_written": 0, "rows_deleted": 0, "rows_expired": 0, "migrated_files": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache_migrations (table_name TEXT PRIMARY KEY, source TEXT)")
+        return self._conn
+
+    def _table(self, name: str) -> str:
+        """Return the quoted table name, creating the table on first use."""
+        if not re.fullmatch(r"[A-Za-z0-9_]+", name):
+            raise ValueError(f"Invalid cache table name: {name}")
+        if name not in self._tables:
+            self._connection().execute(
+                f'CREATE TABLE IF NOT EXISTS "{name}" '
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL, expires_at REAL)"
+            )
+            self._tables.add(name)
+        return f'"{name}"'
+
+    def get(self, table: str, key: str) -> Any:
+        """Return a single unexpired value, or None."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    f"SELECT value FROM {self._table(table)} WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (str(key), time.time()),
+                )
+                .fetchone()
+            )
+        return json.loads(row[0]) if row else None
+
+    def get_all(self, table: str) -> Dict[str, Any]:
+        """Return every unexpired entry of a table, purging expired rows."""
+        with self._lock:
+            self.purge_expired(table)
+            rows = self._connection().execute(f"SELECT key, value FROM {self._table(table)}").fetchall()
+            self._snapshots[table] = dict(rows)
+        return {key: json.loads(value) for key, value in rows}
+
+    def purge_expired(self, table: str) -> int:
+        """Delete the expired rows of a table.
+
+        Returns:
+            Number of rows deleted
+        """
+        with self._lock:
+            conn = self._connection()
+            quoted = self._table(table)
+            with conn:
+                expired = conn.execute(f"DELETE FROM {quoted} WHERE expires_at <= ?", (time.time(),)).rowcount
+            self.stats["rows_expired"] += expired
+        return expired
+
+    def put(self, table: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Insert or update a single entry."""
+        self.put_many(table, {key: value}, ttl_seconds)
+
+    def put_many(self, table: str, entries: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        """Upsert several entries in one transaction.
+
+        As with the "_timestamp" of the JSON caches, ttl_seconds only applies to dict values
+        and only to newly inserted keys; updates keep the key's original expiry.
+        """
+        if not entries:
+            return
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        rows = [
+            (str(key), _encode(value), now, expires_at if isinstance(value, dict) else None)
+            for key, value in entries.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO {self._table(table)} (key, value, updated_at, expires_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                    rows,
+                )
+            snapshot = self._snapshots.get(table)
+            if snapshot is not None:
+                snapshot.update((key, value) for key, value, _, _ in rows)
+            self.stats["rows_written"] += len(rows)
+
+    def delete(self, table: str, *keys: str) -> None:
+        """Delete entries by key."""
+        if not keys:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(f"DELETE FROM {self._table(table)} WHERE key = ?", [(str(key),) for key in keys])
+            snapshot = self._snapshots.get(table)
+            if snapshot is not None:
+                for key in keys:
+                    snapshot.pop(str(key), None)
+            self.stats["rows_deleted"] += len(keys)
+
+    def replace_all(self, table: str, data: Dict[str, Any], ttl_seconds: Optional[float] = None) -> int:
+        """Make a table match a full cache dict, writing only the rows that differ.
+
+        Returns:
+            Number of rows upserted or deleted
+        """
+        with self._lock:
+            if table not in self._snapshots:
+                self._snapshots[table] = dict(
+                    self._connection().execute(f"SELECT key, value FROM {self._table(table)}").fetchall()
+                )
+            snapshot = self._snapshots[table]
+            changed = {}
+            for key, value in data.items():
+                if snapshot.get(str(key)) != _encode(value):
+                    changed[key] = value
+            data_keys = {str(key) for key in data}
+            removed = [key for key in snapshot if key not in data_keys]
+            self.put_many(table, changed, ttl_seconds)
+            self.delete(table, *removed)
+        return len(changed) + len(removed)
+
+    def import_json(self, table: str, json_file: str, ttl_seconds: Optional[float] = None, force: bool = False) -> int:
+        """Import a legacy JSON cache file into a table, once per table unless forced.
+
+        Returns:
+            Number of imported entries (0 if already migrated or the file doesn't exist)
+        """
+        with self._lock:
+            conn = self._connection()
+            if not force and conn.execute("SELECT 1 FROM cache_migrations WHERE table_name = ?", (table,)).fetchone():
+                return 0
+            data = {}
+            if os.path.exists(json_file):
+                try:
+                    data = _read_legacy_json(json_file)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not migrate {json_file}: {e}")
+            if isinstance(data, dict) and data:
+                now = time.time()
+                rows = [
+                    (str(key), _encode(value), now, _legacy_expiry(value, ttl_seconds)) for key, value in data.items()
+                ]
+                with conn:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {self._table(table)} (key, value, updated_at, expires_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+                self._snapshots.pop(table, None)
+                self.stats["migrated_files"] += 1
+                logger.info(f"Migrated {len(rows)} entries from {json_file} into cache table {table}")
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_migrations (table_name, source) VALUES (?, ?)", (table, json_file)
+                )
+        return len(data) if isinstance(data, dict) else 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._tables.clear()
+            self._snapshots.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+
+_stores: Dict[str, SQLiteCacheStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_cache_store(cache_dir: str = CACHE_DIR) -> SQLiteCacheStore:
+    """Return the process-wide store for the database in cache_dir."""
+    db_file = os.path.abspath(os.path.join(cache_dir, CACHE_DB_NAME))
+    with _stores_lock:
+        if db_file not in _stores:
+            _stores[db_file] = SQLiteCacheStore(db_file)
+        return _stores[db_file]
+
+
+def table_for_file(cache_file: str) -> str:
+    """Map a legacy cache file path to its table name (file name without extension)."""
+    name = os.path.basename(cache_file).split(".", 1)[0]
+    return re.sub(r"[^A-Za-z0-9_]", "_", name)
+
+
+def load_file_cache(cache_file: str, ttl_seconds: Optional[float] = None) -> Dict[str, Any]:
+    """Load the cache that used to live in cache_file, migrating the JSON file on first use."""
+    store = get_cache_store(os.path.dirname(cache_file))
+    table = table_for_file(cache_file)
+    store.import_json(table, cache_file, ttl_seconds)
+    return store.get_all(table)
+
+
+def save_file_cache(cache_file: str, data: Dict[str, Any], ttl_seconds: Optional[float] = None) -> int:
+    """Persist a full cache dict for cache_file, writing only changed rows."""
+    store = get_cache_store(os.path.dirname(cache_file))
+    table = table_for_file(cache_file)
+    store.import_json(table, cache_file, ttl_seconds)
+    return store.replace_all(table, data, ttl_seconds)
+
+
+def migrate_json_caches(cache_dir: str = CACHE_DIR, force: bool = False) -> Dict[str, int]:
+    """Import every legacy JSON cache file in cache_dir into the SQLite store.
+
+    Returns:
+        Number of imported entries per table
+    """
+    from config import BLUEPRINT_CONTRACTS_FILE, ESI_ETAG_CACHE_FILE, UNIVERSE_TOPOLOGY_FILE
+
+    # Files with their own persistence format stay as they are
+    skipped = {
+        os.path.basename(ESI_ETAG_CACHE_FILE),
+        os.path.basename(UNIVERSE_TOPOLOGY_FILE),
+        os.path.basename(BLUEPRINT_CONTRACTS_FILE),
+        "all_contracts_forge.json",
+    }
+    store = get_cache_store(cache_dir)
+    results = {}
+    for filename in sorted(os.listdir(cache_dir)):
+        if filename.endswith(".json") and filename not in skipped:
+            table = table_for_file(filename)
+            results[table] = store.import_json(table, os.path.join(cache_dir, filename), force=force)
+    return results
+
+
+def main() -> None:
+    """Command line entry point for migrating JSON caches."""
+    parser = argparse.ArgumentParser(description="Manage the SQLite cache store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = subparsers.add_parser("migrate", help="Import legacy JSON cache files")
+    migrate_parser.add_argument("cache_dir", nargs="?", default=CACHE_DIR, help="Cache directory")
+    migrate_parser.add_argument("--force", action="store_true", help="Re-import files that were already migrated")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.command == "migrate":
+        for table, count in migrate_json_caches(args.cache_dir, args.force).items():
+            print(f"{table}: {count}")
+
+
+if __name__ == "__main__":
+    main()
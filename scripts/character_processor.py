@@ -6,17 +6,18 @@ Handles processing of character-specific data.
 
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from api_client import fetch_esi, fetch_planet_details, wp_request
+from api_client import fetch_esi, fetch_planet_details, iter_esi_pages, wp_request
 from blueprint_processor import (
-    extract_blueprints_from_assets,
     extract_blueprints_from_industry_jobs,
+    process_blueprints_from_asset_pages,
     update_blueprint_from_asset_in_wp,
     update_blueprint_in_wp,
 )
 from contract_processor import process_character_contracts
 from data_processors import process_blueprints_parallel
+from wp_post_index import wp_post_index
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +41,11 @@ async def update_character_skills_in_wp(char_id: int, skills_data: Dict[str, Any
     """
     slug = f"character-{char_id}"
     # Check if post exists by slug
-    existing_posts = await wp_request("GET", f"/wp/v2/eve_character?slug={slug}")
-    existing_post = existing_posts[0] if existing_posts else None
+    if wp_post_index.is_loaded("eve_character"):
+        existing_post = wp_post_index.get("eve_character", slug)
+    else:
+        existing_posts = await wp_request("GET", f"/wp/v2/eve_character?slug={slug}")
+        existing_post = existing_posts[0] if existing_posts else None
 
     if existing_post:
         post_id = existing_post["id"]
@@ -52,7 +56,11 @@ async def update_character_skills_in_wp(char_id: int, skills_data: Dict[str, Any
                 "_eve_last_updated": datetime.now(timezone.utc).isoformat(),
             }
         }
+        if wp_post_index.unchanged("eve_character", existing_post, post_data, hash_field="_eve_skills_hash"):
+            logger.info(f"Skills for character {char_id} unchanged, skipping update")
+            return
         result = await wp_request("PUT", f"/wp/v2/eve_character/{post_id}", post_data)
+        wp_post_index.record("eve_character", result)
         if result:
             logger.info(f"Updated skills for character {char_id}")
         else:
@@ -141,8 +149,11 @@ async def update_planet_in_wp(planet_id: int, planet_data: Dict[str, Any], char_
     """
     slug = f"planet-{planet_id}"
     # Check if post exists by slug
-    existing_posts = await wp_request("GET", f"/wp/v2/eve_planet?slug={slug}")
-    existing_post = existing_posts[0] if existing_posts else None
+    if wp_post_index.is_loaded("eve_planet"):
+        existing_post = wp_post_index.get("eve_planet", slug)
+    else:
+        existing_posts = await wp_request("GET", f"/wp/v2/eve_planet?slug={slug}")
+        existing_post = existing_posts[0] if existing_posts else None
 
     post_data = {
         "title": f"Planet {planet_id}",
@@ -167,13 +178,20 @@ async def update_planet_in_wp(planet_id: int, planet_data: Dict[str, Any], char_
         post_data["meta"]["_eve_planet_pins"] = len(planet_data["pins"])
         post_data["meta"]["_eve_planet_details"] = str(planet_data)
 
+    # Skip the write when nothing but timestamps changed since the stored version
+    if wp_post_index.unchanged("eve_planet", existing_post, post_data):
+        logger.info(f"{post_data['slug']} unchanged, skipping update")
+        return
+
     if existing_post:
         # Update existing
         post_id = existing_post["id"]
         result = await wp_request("PUT", f"/wp/v2/eve_planet/{post_id}", post_data)
+        wp_post_index.record("eve_planet", result)
     else:
         # Create new
         result = await wp_request("POST", "/wp/v2/eve_planet", post_data)
+        wp_post_index.record("eve_planet", result)
 
     if result:
         logger.info(f"Updated planet: {planet_id}")
@@ -240,17 +258,34 @@ async def fetch_character_assets(char_id, access_token):
     Fetch character assets from ESI.
 
     Retrieves the complete list of items owned by the character across all locations,
-    including items in stations, structures, and ships.
+    including items in stations, structures, and ships. All X-Pages pages are fetched
+    concurrently and concatenated.
 
     Args:
         char_id: EVE character ID to fetch assets for.
         access_token: Valid OAuth2 access token for authentication.
 
     Returns:
-        Optional[Dict[str, Any]]: Assets data array if successful.
+        List[Dict[str, Any]]: Assets data array from every page.
     """
-    endpoint = f"/characters/{char_id}/assets/"
-    return await fetch_esi(endpoint, char_id, access_token)
+    assets = []
+    async for page in iter_character_assets(char_id, access_token):
+        assets.extend(page)
+    return assets
+
+
+def iter_character_assets(char_id: int, access_token: str) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream character asset pages from ESI as they arrive.
+
+    Args:
+        char_id: EVE character ID to fetch assets for.
+        access_token: Valid OAuth2 access token for authentication.
+
+    Returns:
+        AsyncIterator[List[Dict[str, Any]]]: Async iterator over asset pages.
+    """
+    return iter_esi_pages(f"/characters/{char_id}/assets/", char_id, access_token)
 
 
 async def fetch_character_industry_jobs(char_id: int, access_token: str) -> Optional[Dict[str, Any]]:
@@ -492,7 +527,7 @@ async def process_character_blueprints_from_assets(
     """
     Process character blueprints from character assets.
 
-    Extracts blueprints from character asset lists and processes them.
+    Streams asset pages and processes the blueprints on each page while later pages download.
 
     Args:
         char_id: Character ID to fetch assets for.
@@ -504,23 +539,19 @@ async def process_character_blueprints_from_assets(
         structure_cache: Structure name cache.
         failed_structures: Failed structure fetch cache.
     """
-    char_assets = await fetch_character_assets(char_id, access_token)
-    if char_assets:
-        asset_blueprints = await extract_blueprints_from_assets(char_assets, "char", char_id, access_token)
-        if asset_blueprints:
-            logger.info(f"Character asset blueprints: {len(asset_blueprints)} items")
-            # Process blueprints in parallel
-            await process_blueprints_parallel(
-                asset_blueprints,
-                update_blueprint_from_asset_in_wp,
-                wp_post_id_cache,
-                char_id,
-                access_token,
-                blueprint_cache,
-                location_cache,
-                structure_cache,
-                failed_structures,
-            )
+    blueprint_count = await process_blueprints_from_asset_pages(
+        iter_character_assets(char_id, access_token),
+        "char",
+        char_id,
+        access_token,
+        wp_post_id_cache,
+        blueprint_cache,
+        location_cache,
+        structure_cache,
+        failed_structures,
+    )
+    if blueprint_count:
+        logger.info(f"Character asset blueprints: {blueprint_count} items")
 
 
 async def process_character_blueprints_from_industry_jobs(
@@ -16,7 +16,18 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from api_client import fetch_esi_sync, fetch_public_contract_items, fetch_public_contracts, fetch_public_esi_sync
-from config import ESI_BASE_URL, TOKENS_FILE, WP_APP_PASSWORD, WP_BASE_URL, WP_USERNAME
+from config import (
+    BLUEPRINT_SNAPSHOT_MAX_AGE_MINUTES,
+    ESI_BASE_URL,
+    TOKENS_FILE,
+    WP_APP_PASSWORD,
+    WP_BASE_URL,
+    WP_USERNAME,
+)
+from contract_competition import CompetitionIndex
+from contract_fetching import FORGE_REGION_ID
+from contract_store import get_blueprint_snapshot
+from sde_store import sde_store
 
 # Additional configuration
 ESI_VERSION = "latest"
@@ -96,6 +107,52 @@ def save_tokens(tokens):
         json.dump(tokens, f, indent=2)
 
 
+_snapshot_index = None
+
+
+def get_snapshot_competition_index():
+    """Build the competition index over the blueprint contract snapshot once per run.
+
+    Returns:
+        The index, or None if there is no snapshot or it is too old to rule out newer competitors
+    """
+    global _snapshot_index
+    if _snapshot_index is None:
+        snapshot = get_blueprint_snapshot()
+        age = snapshot.age
+        if age is None:
+            _snapshot_index = False
+        elif age > BLUEPRINT_SNAPSHOT_MAX_AGE_MINUTES * 60:
+            logger.info(f"Blueprint contract snapshot is {age / 60:.0f} minutes old, checking competition on ESI")
+            _snapshot_index = False
+        else:
+            _snapshot_index = CompetitionIndex.from_contracts(snapshot.contracts())
+    return _snapshot_index or None
+
+
+def check_competition_from_snapshot(contract_id, contract_issuer_id, region_id, item, price_per_item):
+    """Answer a blueprint competition check from the snapshot without any ESI calls.
+
+    Returns:
+        (is_outbid, competing_price), or None if the snapshot can't answer for this item
+    """
+    if region_id != FORGE_REGION_ID:
+        return None
+    index = get_snapshot_competition_index()
+    if index is None:
+        return None
+
+    key = (region_id, item.get("type_id"), bool(item.get("is_blueprint_copy", False)))
+    is_blueprint = item.get("is_blueprint_copy") or sde_store.is_blueprint(item.get("type_id"))
+    if not is_blueprint and not index.count_competitors(key):
+        return None  # Not known to be a blueprint, so not covered by the snapshot
+
+    cheapest = index.cheapest(key, exclude_issuer_id=contract_issuer_id, exclude_contract_id=contract_id)
+    if cheapest is not None and cheapest[0] < price_per_item:
+        return True, cheapest[0]
+    return False, None
+
+
 def check_contract_competition(contract_data, contract_items):
     """Check if a sell contract has been outbid by cheaper competing contracts in the same region."""
     if not contract_items or len(contract_items) != 1:
@@ -157,6 +214,11 @@ def check_contract_competition(contract_data, contract_items):
         f"Checking competition for contract {contract_id} (type_id: {type_id}, price_per_item: {price_per_item:.2f}) in region {region_id}"
     )
 
+    # Forge blueprint contracts are answered from the blueprint contract snapshot
+    snapshot_result = check_competition_from_snapshot(contract_id, contract_issuer_id, region_id, item, price_per_item)
+    if snapshot_result is not None:
+        return snapshot_result
+
     # OPTIMIZATION: Only fetch item_exchange contracts and limit to first few pages
     # Define price range to check (50% to 200% of our contract price to avoid irrelevant contracts)
     min_price = price_per_item * 0.5
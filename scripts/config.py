@@ -29,6 +29,12 @@ LOCATION_CACHE_FILE = os.path.join(CACHE_DIR, "location_names.json")
 STRUCTURE_CACHE_FILE = os.path.join(CACHE_DIR, "structure_names.json")
 FAILED_STRUCTURES_FILE = os.path.join(CACHE_DIR, "failed_structures.json")
 WP_POST_ID_CACHE_FILE = os.path.join(CACHE_DIR, "wp_post_ids.json")
+REGION_CACHE_FILE = os.path.join(CACHE_DIR, "region_cache.json")
+CACHE_DB_NAME = "eve_cache.sqlite"  # SQLite cache store, created inside each cache directory
+ESI_ETAG_CACHE_FILE = os.path.join(CACHE_DIR, "esi_etags.json")
+SDE_DB_FILE = os.getenv("SDE_DB_FILE", os.path.join(CACHE_DIR, "sde.sqlite"))
+UNIVERSE_TOPOLOGY_FILE = os.path.join(CACHE_DIR, "universe_topology.json")
+BLUEPRINT_CONTRACTS_FILE = os.path.join(CACHE_DIR, "blueprint_contracts_forge.json")
 TOKENS_FILE = os.path.join(os.path.dirname(__file__), "esi_tokens.json")
 
 # Email Configuration
@@ -48,12 +54,26 @@ ALLOWED_CORPORATIONS = ["no mercy incorporated"]  # Case insensitive
 ALLOWED_CORP_IDS = set(map(int, os.getenv("ALLOWED_CORP_IDS", "98092220").split(",")))
 
 # Processing Options
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite").lower()  # "sqlite" or legacy "json"
+ESI_ETAG_CACHE_ENABLED = os.getenv("ESI_ETAG_CACHE", "true").lower() == "true"
+ESI_ETAG_CACHE_MAX_ENTRIES = int(os.getenv("ESI_ETAG_CACHE_MAX_ENTRIES", "5000"))  # Entries kept in memory
+ESI_ETAG_CACHE_TTL_DAYS = int(os.getenv("ESI_ETAG_CACHE_TTL_DAYS", "7"))
+ESI_RESPECT_EXPIRY = os.getenv("ESI_RESPECT_EXPIRY", "false").lower() == "true"
 SKIP_CORPORATION_ASSETS = os.getenv("SKIP_CORPORATION_ASSETS", "false").lower() == "true"
+UNIVERSE_TOPOLOGY_PRELOAD = os.getenv("UNIVERSE_TOPOLOGY_PRELOAD", "true").lower() == "true"
+UNIVERSE_TOPOLOGY_TTL_DAYS = int(os.getenv("UNIVERSE_TOPOLOGY_TTL_DAYS", "30"))
+CONTRACT_PREFILTER_MODE = os.getenv("CONTRACT_PREFILTER_MODE", "rank").lower()  # off, rank, skip or measure
+CONTRACT_PREFILTER_MIN_SCORE = float(os.getenv("CONTRACT_PREFILTER_MIN_SCORE", "0.2"))
+WP_BATCH_API_ENABLED = os.getenv("WP_BATCH_API", "true").lower() == "true"
+BLUEPRINT_SNAPSHOT_MAX_AGE_MINUTES = int(os.getenv("BLUEPRINT_SNAPSHOT_MAX_AGE_MINUTES", "60"))
 
 # Concurrency Configuration
 CHARACTER_PROCESSING_CONCURRENCY = int(os.getenv("CHARACTER_CONCURRENCY", "3"))
 WORDPRESS_BATCH_SIZE = int(os.getenv("WP_BATCH_SIZE", "10"))
 ESI_CONCURRENCY_LIMIT = int(os.getenv("ESI_CONCURRENCY", "20"))
+ESI_ERROR_BUDGET_SOFT = int(os.getenv("ESI_ERROR_BUDGET_SOFT", "50"))
+ESI_ERROR_BUDGET_HARD = int(os.getenv("ESI_ERROR_BUDGET_HARD", "10"))
+REGION_CRAWL_CONCURRENCY = int(os.getenv("REGION_CRAWL_CONCURRENCY", "10"))
 CONTRACT_EXPANSION_BATCH_SIZE = int(os.getenv("CONTRACT_BATCH_SIZE", "100"))
 
 # Rate Limiting
@@ -5,24 +5,196 @@ Handles checking contract competition and outbid detection.
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from api_client import fetch_public_contracts_async
-from contract_fetching import get_issuer_names, get_region_from_location
+from contract_fetching import get_issuer_names, get_region_from_location, region_resolver
+from contract_store import contract_lookup
 
 logger = logging.getLogger(__name__)
 
 
+CompetitionKey = Tuple[int, int, bool]
+
+
+class CompetitionIndex:
+    """Price index over expanded contracts for O(log n) outbid lookups.
+
+    Competing contracts are bucketed by (region_id, type_id, is_blueprint_copy). Each bucket
+    holds its per-item prices in ascending order, and a parallel per-issuer copy lets an
+    issuer's own contracts be excluded from counts without scanning the bucket.
+
+    Only outstanding, single-item item_exchange contracts with a positive price and
+    quantity are indexed, matching the rules used by check_contract_competition.
+    """
+
+    def __init__(self):
+        self._prices: Dict[CompetitionKey, List[float]] = {}
+        self._entries: Dict[CompetitionKey, List[Dict[str, Any]]] = {}
+        self._issuer_prices: Dict[Tuple[CompetitionKey, Optional[int]], List[float]] = {}
+        self.contract_count = 0
+
+    @classmethod
+    def from_contracts(
+        cls, contracts: List[Dict[str, Any]], location_regions: Optional[Dict[int, int]] = None
+    ) -> "CompetitionIndex":
+        """Build an index from expanded contracts.
+
+        Args:
+            contracts: Expanded contracts (with "items") as produced by contract_expansion
+            location_regions: Mapping of start_location_id to region_id, used for contracts
+                that do not carry their own "region_id"
+
+        Returns:
+            A populated CompetitionIndex
+        """
+        index = cls()
+        location_regions = location_regions or {}
+        rows: Dict[CompetitionKey, List[Tuple[float, int, Dict[str, Any]]]] = {}
+
+        for contract in contracts:
+            if contract.get("type") != "item_exchange" or contract.get("status") != "outstanding":
+                continue
+            price = contract.get("price", 0)
+            items = contract.get("items") or []
+            if price <= 0 or len(items) != 1:
+                continue
+
+            item = items[0]
+            type_id = item.get("type_id")
+            quantity = item.get("quantity", 1)
+            if not type_id or quantity <= 0:
+                continue
+
+            region_id = contract.get("region_id") or location_regions.get(contract.get("start_location_id"))
+            if not region_id:
+                continue
+
+            key = (region_id, type_id, bool(item.get("is_blueprint_copy", False)))
+            rows.setdefault(key, []).append((price / quantity, contract.get("contract_id") or 0, contract))
+
+        for key, bucket in rows.items():
+            bucket.sort(key=lambda row: (row[0], row[1]))
+            index._prices[key] = [row[0] for row in bucket]
+            index._entries[key] = [row[2] for row in bucket]
+            for price_per_item, _, contract in bucket:
+                index._issuer_prices.setdefault((key, contract.get("issuer_id")), []).append(price_per_item)
+            index.contract_count += len(bucket)
+
+        return index
+
+    def __len__(self) -> int:
+        return self.contract_count
+
+    def iter_bucket(self, key: CompetitionKey) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Yield (price_per_item, contract) pairs for a key, cheapest first."""
+        return zip(self._prices.get(key, []), self._entries.get(key, []))
+
+    def cheapest(
+        self, key: CompetitionKey, exclude_issuer_id: Optional[int] = None, exclude_contract_id: Optional[int] = None
+    ) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Return the cheapest competing (price_per_item, contract) for a key, or None.
+
+        Only the excluded issuer's own contracts at the front of the bucket are skipped,
+        so this is O(1) unless the issuer holds the cheapest listings.
+        """
+        for price_per_item, contract in self.iter_bucket(key):
+            if exclude_contract_id is not None and contract.get("contract_id") == exclude_contract_id:
+                continue
+            if exclude_issuer_id is not None and contract.get("issuer_id") == exclude_issuer_id:
+                continue
+            return price_per_item, contract
+        return None
+
+    def count_undercutting(
+        self, key: CompetitionKey, price_per_item: float, exclude_issuer_id: Optional[int] = None
+    ) -> int:
+        """Count competing contracts strictly cheaper than price_per_item in O(log n)."""
+        cheaper = bisect_left(self._prices.get(key, []), price_per_item)
+        if exclude_issuer_id is not None:
+            cheaper -= bisect_left(self._issuer_prices.get((key, exclude_issuer_id), []), price_per_item)
+        return cheaper
+
+    def count_competitors(self, key: CompetitionKey, exclude_issuer_id: Optional[int] = None) -> int:
+        """Count all competing contracts for a key, excluding an issuer's own."""
+        total = len(self._prices.get(key, []))
+        if exclude_issuer_id is not None:
+            total -= len(self._issuer_prices.get((key, exclude_issuer_id), []))
+        return total
+
+
+# Last index built, keyed by the identity of the contract list it was built from
+_competition_index_cache: Optional[Tuple[List[Dict[str, Any]], CompetitionIndex]] = None
+
+
+async def build_competition_index(all_expanded_contracts: List[Dict[str, Any]]) -> CompetitionIndex:
+    """Build a CompetitionIndex, resolving each distinct start location's region once.
+
+    Args:
+        all_expanded_contracts: Full or blueprint-only list of expanded contracts
+
+    Returns:
+        A populated CompetitionIndex
+    """
+    start_time = time.time()
+    location_ids = {
+        c.get("start_location_id")
+        for c in all_expanded_contracts
+        if not c.get("region_id") and c.get("start_location_id")
+    }
+    location_regions = await region_resolver.resolve_many(location_ids)
+
+    index = CompetitionIndex.from_contracts(all_expanded_contracts, location_regions)
+    logger.info(
+        f"Built competition index: {len(index)} competing contracts from {len(all_expanded_contracts)} "
+        f"expanded contracts ({len(location_ids)} locations resolved) in {time.time() - start_time:.2f}s"
+    )
+    return index
+
+
+async def get_competition_index(all_expanded_contracts: List[Dict[str, Any]]) -> CompetitionIndex:
+    """Return the competition index for a contract list, building it only once per list."""
+    global _competition_index_cache
+    if _competition_index_cache is not None and _competition_index_cache[0] is all_expanded_contracts:
+        return _competition_index_cache[1]
+
+    index = await build_competition_index(all_expanded_contracts)
+    _competition_index_cache = (all_expanded_contracts, index)
+    return index
+
+
+def _matches_issuer_filters(
+    contract: Dict[str, Any], limit_to_issuer_ids: Optional[List[int]], issuer_name_filter: Optional[str]
+) -> bool:
+    """Check an expanded contract against the optional issuer ID and name filters."""
+    if limit_to_issuer_ids and contract.get("issuer_id") not in limit_to_issuer_ids:
+        return False
+
+    if issuer_name_filter:
+        name_filter = issuer_name_filter.lower()
+        return (
+            name_filter in contract.get("issuer_name", "").lower()
+            or name_filter in contract.get("issuer_corporation_name", "").lower()
+            or name_filter in contract.get("title", "").lower()
+        )
+
+    return True
+
+
 async def check_contract_competition(
     contract_data: Dict[str, Any],
     contract_items: List[Dict[str, Any]],
     limit_to_issuer_ids: Optional[List[int]] = None,
     issuer_name_filter: Optional[str] = None,
     all_expanded_contracts: Optional[List[Dict[str, Any]]] = None,
+    competition_index: Optional[CompetitionIndex] = None,
 ) -> Tuple[bool, Optional[float]]:
     """Check if a sell contract has been outbid by cheaper competing contracts in the same region.
 
-    Uses pre-expanded contract data when available, otherwise fetches contracts page by page.
+    Uses a CompetitionIndex over pre-expanded contract data when available, otherwise fetches
+    contracts page by page.
 
     Args:
         contract_data: Contract information dictionary from ESI
@@ -30,6 +202,7 @@ async def check_contract_competition(
         limit_to_issuer_ids: Optional list of issuer IDs to limit competition search to
         issuer_name_filter: Optional text to filter issuers by name (checks issuer name, corp name, and title)
         all_expanded_contracts: Optional list of pre-expanded contracts with full details
+        competition_index: Optional prebuilt index; built from all_expanded_contracts if omitted
 
     Returns:
         Tuple of (is_outbid: bool, competing_price: float or None)
@@ -38,7 +211,7 @@ async def check_contract_competition(
 
     Note:
         Only checks single-item sell contracts (item_exchange type) with positive quantities.
-        When all_expanded_contracts is provided, uses pre-fetched data for better performance.
+        When an index is available each check is a pair of O(log n) lookups.
     """
     if not contract_items or len(contract_items) != 1:
         return False, None  # Only check single item contracts
@@ -60,8 +233,10 @@ async def check_contract_competition(
 
     price_per_item = contract_price / quantity
 
-    # Get contract region
-    region_id = await get_region_from_location(contract_data.get("start_location_id"))
+    # Get contract region, preferring the stamp from the regional crawl
+    region_id = contract_data.get("region_id")
+    if not region_id:
+        region_id = await get_region_from_location(contract_data.get("start_location_id"))
     if not region_id:
         logger.warning(f"Could not determine region for contract {contract_id}")
         return False, None
@@ -81,132 +256,61 @@ async def check_contract_competition(
     competing_price = None
     total_competing_found = 0
 
-    if all_expanded_contracts is None:
-        # Load expanded contracts from cache or fetch if needed
-        logger.info("No expanded contracts provided, loading from cache...")
-        from contract_expansion import fetch_and_expand_all_forge_contracts
-
-        all_expanded_contracts = await fetch_and_expand_all_forge_contracts()
-
-    if all_expanded_contracts and len(all_expanded_contracts) > 0:
-        # Use pre-expanded contracts - much more efficient!
-        logger.debug(f"Using pre-expanded contracts list with {len(all_expanded_contracts)} contracts")
-
-        # Filter contracts for this region and basic criteria
-        region_contracts = []
-        for comp_contract in all_expanded_contracts:
-            comp_start_location = comp_contract.get("start_location_id")
-            if comp_start_location:
-                comp_region_id = await get_region_from_location(comp_start_location)
-                if comp_region_id == region_id:
-                    region_contracts.append(comp_contract)
-
-        logger.debug(f"Found {len(region_contracts)} contracts in region {region_id}")
-
-        for comp_contract in region_contracts:
-            comp_contract_id = comp_contract.get("contract_id")
-            comp_price = comp_contract.get("price", 0)
-            comp_issuer_id = comp_contract.get("issuer_id")
-            comp_issuer_corp_id = comp_contract.get("issuer_corporation_id")
-            comp_title = comp_contract.get("title", "")
-            comp_items = comp_contract.get("items", [])
-
-            # Debug: Log all contracts we're considering
-            logger.debug(
-                f"Evaluating contract {comp_contract_id}: type={comp_contract.get('type')}, status={comp_contract.get('status')}, price={comp_price}, issuer={comp_issuer_id}"
-            )
-
-            # Quick filters that don't require API calls
-            if comp_contract.get("type") != "item_exchange":
-                logger.debug(f"Skipping contract {comp_contract_id}: not item_exchange")
-                continue
-            if comp_contract.get("status") != "outstanding":
-                logger.debug(f"Skipping contract {comp_contract_id}: not outstanding")
-                continue
-            if comp_contract.get("contract_id") == contract_id:
-                logger.debug(f"Skipping contract {comp_contract_id}: same contract")
-                continue
-            if comp_contract.get("issuer_id") == contract_issuer_id:
-                logger.debug(f"Skipping contract {comp_contract_id}: same issuer")
-                continue
+    if competition_index is None:
+        if all_expanded_contracts is None:
+            # Load expanded contracts from cache or fetch if needed
+            logger.info("No expanded contracts provided, loading from cache...")
+            from contract_expansion import load_blueprint_contracts
 
-            # If limiting to specific issuers, check that here
-            if limit_to_issuer_ids and comp_issuer_id not in limit_to_issuer_ids:
-                logger.debug(
-                    f"Skipping contract {comp_contract_id}: issuer {comp_issuer_id} not in allowed list {limit_to_issuer_ids}"
-                )
-                continue
+            all_expanded_contracts = await load_blueprint_contracts()
 
-            # If filtering by issuer name, check names here
-            if issuer_name_filter:
-                issuer_name = comp_contract.get("issuer_name", "")
-                corp_name = comp_contract.get("issuer_corporation_name", "")
+        if all_expanded_contracts and len(all_expanded_contracts) > 0:
+            competition_index = await get_competition_index(all_expanded_contracts)
 
-                # Check if any of the names contain the filter text (case insensitive)
-                name_matches = (
-                    issuer_name_filter.lower() in issuer_name.lower()
-                    or issuer_name_filter.lower() in corp_name.lower()
-                    or issuer_name_filter.lower() in comp_title.lower()
-                )
+    if competition_index is not None:
+        key = (region_id, type_id, bool(is_blueprint_copy))
 
-                if not name_matches:
-                    logger.debug(
-                        f"Skipping contract {comp_contract_id}: name filter '{issuer_name_filter}' not found in '{issuer_name}'/'{corp_name}'/'{comp_title}'"
-                    )
+        if limit_to_issuer_ids or issuer_name_filter:
+            # Filters can't be answered from the sorted prices alone; walk this key's bucket cheapest first
+            for comp_price_per_item, comp_contract in competition_index.iter_bucket(key):
+                if (
+                    comp_contract.get("contract_id") == contract_id
+                    or comp_contract.get("issuer_id") == contract_issuer_id
+                ):
                     continue
-
-                logger.debug(
-                    f"Contract {comp_contract_id} matches name filter: issuer='{issuer_name}', corp='{corp_name}', title='{comp_title}'"
-                )
-
-            if comp_price <= 0:
-                logger.debug(f"Skipping contract {comp_contract_id}: invalid price")
-                continue
-
-            # Use pre-expanded items data
-            if not comp_items or len(comp_items) != 1:
-                logger.debug(f"Skipping contract {comp_contract_id}: not single item or no items")
-                continue
-
-            comp_item = comp_items[0]
-            comp_type_id = comp_item.get("type_id")
-            comp_is_blueprint_copy = comp_item.get("is_blueprint_copy", False)
-            comp_quantity = comp_item.get("quantity", 1)
-
-            logger.debug(
-                f"Contract {comp_contract_id} item: type_id={comp_type_id}, is_blueprint_copy={comp_is_blueprint_copy}, quantity={comp_quantity}"
-            )
-
-            if comp_type_id == type_id and comp_is_blueprint_copy == is_blueprint_copy:
-                if comp_quantity > 0:
-                    final_comp_price_per_item = comp_price / comp_quantity
-                    total_competing_found += 1
-
+                if not _matches_issuer_filters(comp_contract, limit_to_issuer_ids, issuer_name_filter):
+                    continue
+                total_competing_found += 1
+                if comp_price_per_item < price_per_item:
+                    found_cheaper = True
+                    competing_price = comp_price_per_item
                     logger.info(
-                        f"Found competing contract {comp_contract_id}: price_per_item={final_comp_price_per_item:.2f}, our_price={price_per_item:.2f}"
+                        f"Contract {contract_id} outbid by contract {comp_contract.get('contract_id')} with "
+                        f"price_per_item: {comp_price_per_item:.2f}"
                     )
-
-                    if final_comp_price_per_item < price_per_item:
-                        logger.info(
-                            f"Contract {contract_id} outbid by contract {comp_contract_id} with "
-                            f"price_per_item: {final_comp_price_per_item:.2f}"
-                        )
-                        found_cheaper = True
-                        competing_price = final_comp_price_per_item
-                        break  # Found cheaper contract, can stop
-                else:
-                    logger.debug(f"Skipping contract {comp_contract_id}: invalid quantity")
-            else:
-                logger.debug(
-                    f"Skipping contract {comp_contract_id}: type_id mismatch ({comp_type_id} != {type_id}) or blueprint_copy mismatch ({comp_is_blueprint_copy} != {is_blueprint_copy})"
+                break
+        else:
+            total_competing_found = competition_index.count_competitors(key, exclude_issuer_id=contract_issuer_id)
+            cheapest = competition_index.cheapest(
+                key, exclude_issuer_id=contract_issuer_id, exclude_contract_id=contract_id
+            )
+            if cheapest is not None and cheapest[0] < price_per_item:
+                found_cheaper = True
+                competing_price = cheapest[0]
+                undercut_count = competition_index.count_undercutting(
+                    key, price_per_item, exclude_issuer_id=contract_issuer_id
+                )
+                logger.info(
+                    f"Contract {contract_id} outbid by contract {cheapest[1].get('contract_id')} with "
+                    f"price_per_item: {competing_price:.2f} ({undercut_count} cheaper competitors)"
                 )
-
     else:
         # Fallback to original page-by-page approach
         logger.debug("No pre-expanded contracts provided, using page-by-page fetching")
 
         # OPTIMIZED APPROACH: Check first few pages with smart filtering
         max_pages_to_check = 5  # Check up to 5 pages (5000 contracts max)
+        expanded_lookup = contract_lookup(all_expanded_contracts) if all_expanded_contracts else None
 
         for page in range(1, max_pages_to_check + 1):
             try:
@@ -303,12 +407,8 @@ async def check_contract_competition(
 
                     # Check if items are already cached in the contract data
                     comp_items = None
-                    if all_expanded_contracts:
-                        # Find this contract in the expanded contracts
-                        for exp_contract in all_expanded_contracts:
-                            if exp_contract.get("contract_id") == comp_contract_id:
-                                comp_items = exp_contract.get("items", [])
-                                break
+                    if expanded_lookup is not None:
+                        comp_items = expanded_lookup.items_of(comp_contract_id)
 
                     if not comp_items:
                         logger.debug(f"Skipping contract {comp_contract_id}: no cached items available")
@@ -377,6 +477,7 @@ async def check_contract_competition_hybrid(
     limit_to_issuer_ids: Optional[List[int]] = None,
     issuer_name_filter: Optional[str] = None,
     all_expanded_contracts: Optional[List[Dict[str, Any]]] = None,
+    competition_index: Optional[CompetitionIndex] = None,
 ) -> Tuple[bool, Optional[float], Optional[Dict[str, float]]]:
     """Check if a sell contract has been outbid by cheaper competing contracts in the same region.
 
@@ -389,6 +490,7 @@ async def check_contract_competition_hybrid(
         limit_to_issuer_ids: Optional list of issuer IDs to limit competition search to
         issuer_name_filter: Optional text to filter issuers by name (checks issuer name, corp name, and title)
         all_expanded_contracts: Optional list of pre-expanded contracts with full details
+        competition_index: Optional prebuilt index; built from all_expanded_contracts if omitted
 
     Returns:
         Tuple of (is_outbid: bool, competing_price: float or None, market_data: None)
@@ -401,7 +503,12 @@ async def check_contract_competition_hybrid(
     """
     # Only perform contract-to-contract comparison
     is_outbid, competing_price = await check_contract_competition(
-        contract_data, contract_items, limit_to_issuer_ids, issuer_name_filter, all_expanded_contracts
+        contract_data,
+        contract_items,
+        limit_to_issuer_ids,
+        issuer_name_filter,
+        all_expanded_contracts,
+        competition_index,
     )
     return is_outbid, competing_price, None
 
@@ -410,13 +517,18 @@ async def check_contracts_competition_concurrent(
     contract_data_list: List[Dict[str, Any]],
     contract_items_list: List[List[Dict[str, Any]]],
     all_expanded_contracts: Optional[List[Dict[str, Any]]] = None,
+    competition_index: Optional[CompetitionIndex] = None,
 ) -> List[Tuple[bool, Optional[float]]]:
     """Check competition for multiple contracts concurrently.
 
+    The competition index is built once up front and shared by every check, so no
+    check scans the expanded contract list.
+
     Args:
         contract_data_list: List of contract information dictionaries
         contract_items_list: List of contract items lists (corresponding to contract_data_list)
         all_expanded_contracts: Optional list of pre-expanded contracts for competition analysis
+        competition_index: Optional prebuilt index; built from all_expanded_contracts if omitted
 
     Returns:
         List of tuples (is_outbid, competing_price) for each contract
@@ -424,9 +536,23 @@ async def check_contracts_competition_concurrent(
     if len(contract_data_list) != len(contract_items_list):
         raise ValueError("contract_data_list and contract_items_list must have the same length")
 
+    if competition_index is None and contract_data_list:
+        if all_expanded_contracts is None:
+            logger.info("No expanded contracts provided, loading from cache...")
+            from contract_expansion import load_blueprint_contracts
+
+            all_expanded_contracts = await load_blueprint_contracts()
+        if all_expanded_contracts:
+            competition_index = await get_competition_index(all_expanded_contracts)
+
     # Create tasks for concurrent execution
     tasks = [
-        check_contract_competition(contract_data, contract_items, all_expanded_contracts=all_expanded_contracts)
+        check_contract_competition(
+            contract_data,
+            contract_items,
+            all_expanded_contracts=all_expanded_contracts,
+            competition_index=competition_index,
+        )
         for contract_data, contract_items in zip(contract_data_list, contract_items_list)
     ]
 
@@ -4,19 +4,63 @@ Handles expanding contract data with additional information and caching.
 """
 
 import asyncio
-import json
 import logging
 import os
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
-from api_client import fetch_public_contract_items, fetch_public_esi, get_session
+from api_client import contract_expansion_limiter, fetch_public_contract_items_async, fetch_public_esi, get_session
 from cache_manager_contracts import ContractCacheManager
-from config import CACHE_DIR, ESI_BASE_URL
+from config import CACHE_DIR, CONTRACT_EXPANSION_BATCH_SIZE, ESI_BASE_URL
+from contract_prefilter import BlueprintPrefilter
+from contract_store import contract_has_blueprint, get_blueprint_snapshot, get_contract_store
+from sde_store import sde_store
 
 logger = logging.getLogger(__name__)
 
 
+def is_blueprint_original_type(type_id: int, type_data: Optional[Dict[str, Any]]) -> bool:
+    """Return whether a non-copy contract item is a blueprint, preferring the local SDE store."""
+    is_blueprint = sde_store.is_blueprint(type_id)
+    if is_blueprint is not None:
+        return is_blueprint
+    group_id = type_data.get("group_id") if type_data else None
+    return group_id == 2  # Blueprint group
+
+
+async def prefetch_contract_names(
+    contracts: List[Dict[str, Any]], issuer_cache: Dict[str, str], corporation_cache: Dict[str, str]
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Resolve all uncached issuer and corporation names for a set of contracts in bulk.
+
+    Collects every issuer and issuer corporation ID missing from the caches and resolves
+    them together through POST /universe/names/ (1000 IDs per call), instead of one
+    character or corporation GET per contract during expansion.
+
+    Returns:
+        Tuple of (new_issuer_names, new_corporation_names) keyed by ID string
+    """
+    from contract_fetching import get_issuer_names
+
+    issuer_ids = {c["issuer_id"] for c in contracts if c.get("issuer_id") and str(c["issuer_id"]) not in issuer_cache}
+    corp_ids = {
+        c["issuer_corporation_id"]
+        for c in contracts
+        if c.get("issuer_corporation_id") and str(c["issuer_corporation_id"]) not in corporation_cache
+    }
+    if not issuer_ids and not corp_ids:
+        return {}, {}
+
+    names = await get_issuer_names(list(issuer_ids | corp_ids))
+    new_issuer_names = {str(entity_id): names[entity_id] for entity_id in issuer_ids if entity_id in names}
+    new_corporation_names = {str(entity_id): names[entity_id] for entity_id in corp_ids if entity_id in names}
+    logger.info(
+        f"Bulk-resolved {len(new_issuer_names)}/{len(issuer_ids)} issuer and "
+        f"{len(new_corporation_names)}/{len(corp_ids)} corporation names"
+    )
+    return new_issuer_names, new_corporation_names
+
+
 async def expand_single_contract_with_caching(
     contract: Dict[str, Any],
     issuer_cache: Dict[str, str],
@@ -97,13 +141,15 @@ async def expand_single_contract_with_caching(
                     elif type_id_str in new_type_data:
                         type_data = new_type_data[type_id_str]
                     else:
-                        # Need to fetch type data
-                        try:
-                            type_data = await fetch_public_esi(f"/universe/types/{type_id}/")
-                            if type_data:
-                                new_type_data[type_id_str] = type_data
-                        except Exception as e:
-                            logger.warning(f"Failed to fetch type data for {type_id}: {e}")
+                        type_data = sde_store.get_type(type_id)
+                        if type_data is None:
+                            # Need to fetch type data
+                            try:
+                                type_data = await fetch_public_esi(f"/universe/types/{type_id}/")
+                                if type_data:
+                                    new_type_data[type_id_str] = type_data
+                            except Exception as e:
+                                logger.warning(f"Failed to fetch type data for {type_id}: {e}")
 
                     # Build item details
                     item_name = type_data.get("name", f"Type {type_id}") if type_data else f"Type {type_id}"
@@ -122,8 +168,7 @@ async def expand_single_contract_with_caching(
                             item_detail["time_efficiency"] = item.get("time_efficiency", 0)
                             item_detail["material_efficiency"] = item.get("material_efficiency", 0)
                     else:
-                        group_id = type_data.get("group_id") if type_data else None
-                        if group_id == 2:  # Blueprint group
+                        if is_blueprint_original_type(type_id, type_data):
                             item_detail["blueprint_type"] = "BPO"
                             item_detail["time_efficiency"] = None
                             item_detail["material_efficiency"] = None
@@ -138,7 +183,7 @@ async def expand_single_contract_with_caching(
             # No items data available - fetch from public API for public contracts
             try:
                 logger.debug(f"Fetching items for contract {contract_id}")
-                contract_items = await asyncio.to_thread(fetch_public_contract_items, contract_id)
+                contract_items = await fetch_public_contract_items_async(contract_id)
                 logger.debug(f"Fetched {len(contract_items) if contract_items else 0} items for contract {contract_id}")
                 if contract_items:
                     # Store raw items in cache
@@ -158,13 +203,15 @@ async def expand_single_contract_with_caching(
                             elif type_id_str in new_type_data:
                                 type_data = new_type_data[type_id_str]
                             else:
-                                # Need to fetch type data
-                                try:
-                                    type_data = await fetch_public_esi(f"/universe/types/{type_id}/")
-                                    if type_data:
-                                        new_type_data[type_id_str] = type_data
-                                except Exception as e:
-                                    logger.warning(f"Failed to fetch type data for {type_id}: {e}")
+                                type_data = sde_store.get_type(type_id)
+                                if type_data is None:
+                                    # Need to fetch type data
+                                    try:
+                                        type_data = await fetch_public_esi(f"/universe/types/{type_id}/")
+                                        if type_data:
+                                            new_type_data[type_id_str] = type_data
+                                    except Exception as e:
+                                        logger.warning(f"Failed to fetch type data for {type_id}: {e}")
 
                             # Build item details
                             item_name = type_data.get("name", f"Type {type_id}") if type_data else f"Type {type_id}"
@@ -186,8 +233,7 @@ async def expand_single_contract_with_caching(
                                 if "runs" in item:
                                     item_detail["runs"] = item.get("runs", 1)
                             else:
-                                group_id = type_data.get("group_id") if type_data else None
-                                if group_id == 2:  # Blueprint group
+                                if is_blueprint_original_type(type_id, type_data):
                                     item_detail["blueprint_type"] = "BPO"
                                     item_detail["time_efficiency"] = None
                                     item_detail["material_efficiency"] = None
@@ -247,42 +293,28 @@ async def expand_new_contracts_dynamic(
         f"Caches loaded - Issuer: {len(issuer_cache)}, Type: {len(type_cache)}, Corporation: {len(corporation_cache)}"
     )
 
-    # Dynamic parameters
-    batch_size = 50  # Start smaller for new contracts
-    semaphore_limit = 15  # Start with lower concurrency
-    min_batch_size = 25
-    max_batch_size = 200
-    min_semaphore = 5
-    max_semaphore = 50
-
-    rate_limit_hits = 0
-    max_rate_limit_hits = 3  # Reduce concurrency after this many rate limit errors
+    # Resolve all missing names up front so expansion only falls back to per-ID lookups for stragglers
+    new_issuers, new_corps = await prefetch_contract_names(contracts, issuer_cache, corporation_cache)
+    issuer_cache.update(new_issuers)
+    corporation_cache.update(new_corps)
 
+    # Concurrency is owned by the shared AIMD limiter; batches only bound how often caches are merged
+    batch_size = CONTRACT_EXPANSION_BATCH_SIZE
     expanded_contracts = []
-    semaphore = asyncio.Semaphore(semaphore_limit)
 
-    async def expand_contract_batch_dynamic(
-        batch_contracts: List[Dict[str, Any]], batch_num: int
-    ) -> tuple[
-        List[Dict[str, Any]],
-        Dict[str, str],
-        Dict[str, Dict[str, Any]],
-        Dict[str, str],
-        Dict[str, List[Dict[str, Any]]],
-        float,
-        int,
-    ]:
-        """Expand a batch of contracts with error handling for rate limits."""
+    async def expand_contract_batch(
+        batch_contracts: List[Dict[str, Any]],
+    ) -> tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, Dict[str, Any]], Dict[str, str], float]:
+        """Expand a batch of contracts under the adaptive concurrency limiter."""
         batch_start_time = time.time()
         batch_expanded = []
         new_issuer_names: Dict[str, str] = {}
         new_type_data: Dict[str, Dict[str, Any]] = {}
         new_corporation_names: Dict[str, str] = {}
         new_contract_items: Dict[str, List[Dict[str, Any]]] = {}
-        batch_rate_limit_hits = 0
 
         async def expand_single_contract_safe(contract: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-            async with semaphore:
+            async with contract_expansion_limiter.slot():
                 try:
                     return await expand_single_contract_with_caching(
                         contract,
@@ -295,16 +327,8 @@ async def expand_new_contracts_dynamic(
                         new_contract_items,
                     )
                 except Exception as e:
-                    error_msg = str(e).lower()
-                    if "rate limit" in error_msg or "429" in error_msg:
-                        nonlocal batch_rate_limit_hits
-                        batch_rate_limit_hits += 1
-                        logger.warning(f"Rate limit hit for contract {contract['contract_id']}, will retry later")
-                        # Return None to indicate failure, will be retried
-                        return None
-                    else:
-                        logger.error(f"Error expanding contract {contract['contract_id']}: {e}")
-                        return None
+                    logger.error(f"Error expanding contract {contract['contract_id']}: {e}")
+                    return None
 
         # Process contracts in this batch concurrently
         tasks = [expand_single_contract_safe(contract) for contract in batch_contracts]
@@ -315,71 +339,16 @@ async def expand_new_contracts_dynamic(
                 batch_expanded.append(result)
 
         batch_time = time.time() - batch_start_time
-        return (
-            batch_expanded,
-            new_issuer_names,
-            new_type_data,
-            new_corporation_names,
-            new_contract_items,
-            batch_time,
-            batch_rate_limit_hits,
-        )
-
-    # Process in batches with dynamic adjustment
-    remaining_contracts = contracts[:]
-    batch_num = 1
-
-    while remaining_contracts:
-        current_batch = remaining_contracts[:batch_size]
-        remaining_contracts = remaining_contracts[batch_size:]
+        return batch_expanded, new_issuer_names, new_type_data, new_corporation_names, batch_time
 
+    for batch_num, batch_start in enumerate(range(0, len(contracts), batch_size), start=1):
+        current_batch = contracts[batch_start : batch_start + batch_size]
+        batch_expanded, new_issuers, new_types, new_corps, batch_time = await expand_contract_batch(current_batch)
         logger.debug(
-            f"Processing batch {batch_num} with {len(current_batch)} contracts (batch_size={batch_size}, concurrency={semaphore_limit})"
+            f"Batch {batch_num}: {len(batch_expanded)}/{len(current_batch)} contracts expanded in {batch_time:.1f}s "
+            f"(concurrency limit {contract_expansion_limiter.limit})"
         )
 
-        (
-            batch_expanded,
-            new_issuers,
-            new_types,
-            new_corps,
-            new_items,
-            batch_time,
-            batch_rate_limits,
-        ) = await expand_contract_batch_dynamic(current_batch, batch_num)
-
-        # Handle rate limit hits
-        if batch_rate_limits > 0:
-            rate_limit_hits += batch_rate_limits
-            logger.warning(f"Batch {batch_num} hit {batch_rate_limits} rate limits, total: {rate_limit_hits}")
-
-            if rate_limit_hits >= max_rate_limit_hits:
-                # Reduce concurrency significantly
-                old_sem = semaphore_limit
-                semaphore_limit = max(min_semaphore, semaphore_limit // 2)
-                semaphore = asyncio.Semaphore(semaphore_limit)
-                logger.warning(f"Too many rate limits, reducing concurrency: {old_sem} -> {semaphore_limit}")
-                rate_limit_hits = 0  # Reset counter
-
-        # Dynamic adjustment based on performance
-        if batch_time > 20.0:  # Too slow
-            old_batch = batch_size
-            old_sem = semaphore_limit
-            batch_size = max(min_batch_size, int(batch_size * 0.7))
-            semaphore_limit = max(min_semaphore, int(semaphore_limit * 0.8))
-            semaphore = asyncio.Semaphore(semaphore_limit)
-            logger.debug(
-                f"Batch {batch_num} slow ({batch_time:.1f}s), adjusting: batch_size {old_batch}->{batch_size}, concurrency {old_sem}->{semaphore_limit}"
-            )
-        elif batch_time < 3.0 and rate_limit_hits == 0:  # Fast and no rate limits
-            old_batch = batch_size
-            old_sem = semaphore_limit
-            batch_size = min(max_batch_size, int(batch_size * 1.3))
-            semaphore_limit = min(max_semaphore, int(semaphore_limit * 1.2))
-            semaphore = asyncio.Semaphore(semaphore_limit)
-            logger.debug(
-                f"Batch {batch_num} fast ({batch_time:.1f}s), adjusting: batch_size {old_batch}->{batch_size}, concurrency {old_sem}->{semaphore_limit}"
-            )
-
         # Accumulate results
         expanded_contracts.extend(batch_expanded)
 
@@ -388,11 +357,6 @@ async def expand_new_contracts_dynamic(
         type_cache.update(new_types)
         corporation_cache.update(new_corps)
 
-        batch_num += 1
-
-        # Small delay between batches to be respectful
-        await asyncio.sleep(0.1)
-
     # Save updated caches
     await cache_manager.save_issuer_cache(issuer_cache)
     await cache_manager.save_type_cache(type_cache)
@@ -431,16 +395,15 @@ async def expand_all_contracts_async(
         f"Initial caches loaded - Issuer: {len(issuer_cache)}, Type: {len(type_cache)}, Corporation: {len(corporation_cache)}"
     )
 
-    # Process contracts in parallel batches with on-demand fetching and dynamic adjustment
-    batch_size = 100  # Start with smaller batch size
-    semaphore_limit = 20  # Start with lower concurrency
-    min_batch_size = 50
-    max_batch_size = 1000
-    min_semaphore = 10
-    max_semaphore = 200
+    # Resolve all missing names up front so expansion only falls back to per-ID lookups for stragglers
+    new_issuers, new_corps = await prefetch_contract_names(contracts, issuer_cache, corporation_cache)
+    issuer_cache.update(new_issuers)
+    corporation_cache.update(new_corps)
+
+    # Process contracts in parallel batches; concurrency is owned by the shared AIMD limiter
+    batch_size = CONTRACT_EXPANSION_BATCH_SIZE
 
     expanded_contracts = []
-    semaphore = asyncio.Semaphore(semaphore_limit)  # Limit concurrent processing
 
     async def expand_contract_batch(
         batch_contracts: List[Dict[str, Any]], batch_num: int
@@ -461,7 +424,7 @@ async def expand_all_contracts_async(
         new_contract_items: Dict[str, List[Dict[str, Any]]] = {}
 
         async def expand_single_contract(contract: Dict[str, Any]) -> Dict[str, Any]:
-            async with semaphore:
+            async with contract_expansion_limiter.slot():
                 return await expand_single_contract_with_caching(
                     contract,
                     issuer_cache,
@@ -492,16 +455,14 @@ async def expand_all_contracts_async(
     batch_tasks = []
     total_batches = (len(contracts) + batch_size - 1) // batch_size  # Ceiling division
     logger.info(
-        f"Starting parallel processing of {total_batches} batches ({len(contracts)} contracts total) with initial batch_size={batch_size}, concurrency={semaphore_limit}"
+        f"Starting parallel processing of {total_batches} batches ({len(contracts)} contracts total) "
+        f"with batch_size={batch_size}, initial concurrency={contract_expansion_limiter.limit}"
     )
 
-    current_batch_size = batch_size
-    current_semaphore_limit = semaphore_limit
-
-    for batch_start in range(0, len(contracts), current_batch_size):
-        batch_end = min(batch_start + current_batch_size, len(contracts))
+    for batch_start in range(0, len(contracts), batch_size):
+        batch_end = min(batch_start + batch_size, len(contracts))
         batch_contracts = contracts[batch_start:batch_end]
-        batch_num = (batch_start // current_batch_size) + 1
+        batch_num = (batch_start // batch_size) + 1
         logger.info(
             f"Queueing batch {batch_num}: contracts {batch_start} to {batch_end-1} ({len(batch_contracts)} contracts)"
         )
@@ -523,28 +484,6 @@ async def expand_all_contracts_async(
         completed_batches += 1
         batch_expanded, new_issuers, new_types, new_corps, new_items, batch_time = batch_result
 
-        # Dynamic adjustment based on performance
-        if batch_time > 15.0:  # Too slow, reduce concurrency
-            old_batch = current_batch_size
-            old_sem = current_semaphore_limit
-            current_batch_size = max(min_batch_size, int(current_batch_size * 0.8))
-            current_semaphore_limit = max(min_semaphore, int(current_semaphore_limit * 0.9))
-            if current_batch_size != old_batch or current_semaphore_limit != old_sem:
-                logger.info(
-                    f"Batch {completed_batches} slow ({batch_time:.1f}s), adjusting: batch_size {old_batch}->{current_batch_size}, concurrency {old_sem}->{current_semaphore_limit}"
-                )
-                semaphore = asyncio.Semaphore(current_semaphore_limit)  # Update semaphore
-        elif batch_time < 5.0:  # Fast, can increase
-            old_batch = current_batch_size
-            old_sem = current_semaphore_limit
-            current_batch_size = min(max_batch_size, int(current_batch_size * 1.2))
-            current_semaphore_limit = min(max_semaphore, int(current_semaphore_limit * 1.1))
-            if current_batch_size != old_batch or current_semaphore_limit != old_sem:
-                logger.info(
-                    f"Batch {completed_batches} fast ({batch_time:.1f}s), adjusting: batch_size {old_batch}->{current_batch_size}, concurrency {old_sem}->{current_semaphore_limit}"
-                )
-                semaphore = asyncio.Semaphore(current_semaphore_limit)  # Update semaphore
-
         # Log progress
         elapsed = time.time() - start_time
         progress_pct = (completed_batches / total_batches) * 100
@@ -650,7 +589,7 @@ async def apply_cached_data_to_contracts(contracts: List[Dict[str, Any]]) -> Lis
                     type_id = item.get("type_id")
                     if type_id:
                         type_id_str = str(type_id)
-                        type_data = type_cache.get(type_id_str, {})
+                        type_data = type_cache.get(type_id_str) or sde_store.get_type(type_id) or {}
 
                         # Build item details using cached type data
                         item_name = type_data.get("name", f"Type {type_id}") if type_data else f"Type {type_id}"
@@ -669,8 +608,7 @@ async def apply_cached_data_to_contracts(contracts: List[Dict[str, Any]]) -> Lis
                             item_detail["material_efficiency"] = item.get("material_efficiency", 0)
                             item_detail["runs"] = item.get("runs", 1)
                         else:
-                            group_id = type_data.get("group_id") if type_data else None
-                            if group_id == 2:  # Blueprint group
+                            if is_blueprint_original_type(type_id, type_data):
                                 item_detail["blueprint_type"] = "BPO"
                                 item_detail["time_efficiency"] = None
                                 item_detail["material_efficiency"] = None
@@ -699,80 +637,100 @@ async def apply_cached_data_to_contracts(contracts: List[Dict[str, Any]]) -> Lis
 async def fetch_and_expand_all_forge_contracts() -> List[Dict[str, Any]]:
     """Fetch and expand all contracts from The Forge region with incremental caching.
 
-    Only processes new contracts, removes expired ones, and ensures cache reflects real-world EVE Online state.
-    Returns blueprint-only contracts cache for competition analysis.
+    Only processes new contracts, removes expired ones, and ensures the contract store reflects
+    real-world EVE Online state. Unchanged contracts are never re-read or rewritten.
+    Returns blueprint-only contracts for competition analysis.
     """
+    from contract_fetching import FORGE_REGION_ID, crawl_region_contracts
+
     logger.info("Starting incremental contract processing for The Forge region...")
 
-    # Load existing expanded contracts cache
-    cache_file = os.path.join(CACHE_DIR, "all_contracts_forge.json")
-    existing_expanded = []
-    existing_contract_ids = set()
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, "r") as f:
-                existing_expanded = json.load(f)
-                existing_contract_ids = {str(c["contract_id"]) for c in existing_expanded}
-            logger.info(f"Loaded {len(existing_expanded)} existing expanded contracts from cache")
-        except Exception as e:
-            logger.warning(f"Failed to load existing cache: {e}")
-            existing_expanded = []
-            existing_contract_ids = set()
+    # One-time import of the legacy JSON snapshot
+    store = get_contract_store()
+    store.import_json(os.path.join(CACHE_DIR, "all_contracts_forge.json"), default_region_id=FORGE_REGION_ID)
+    existing_contract_ids = store.contract_ids(FORGE_REGION_ID)
+    logger.info(f"Contract store holds {len(existing_contract_ids)} expanded Forge contracts")
 
     # Fetch current contracts from API
     logger.info("Fetching current contracts from EVE Online API...")
-    from contract_fetching import fetch_all_contracts_in_region
-
-    current_contracts = await fetch_all_contracts_in_region(10000002)  # The Forge region
-    current_contract_ids = {str(c["contract_id"]) for c in current_contracts}
+    crawl = await crawl_region_contracts(FORGE_REGION_ID)
+    current_contracts = crawl.contracts
+    current_contract_ids = {int(c["contract_id"]) for c in current_contracts}
     logger.info(f"Fetched {len(current_contracts)} current contracts from API")
 
-    # Identify new contracts (in API but not in cache)
+    # Identify new contracts (in API but not in the store)
     new_contract_ids = current_contract_ids - existing_contract_ids
-    new_contracts = [c for c in current_contracts if str(c["contract_id"]) in new_contract_ids]
+    new_contracts = [c for c in current_contracts if int(c["contract_id"]) in new_contract_ids]
 
-    # Identify removed contracts (in cache but not in API - expired/fulfilled/deleted)
-    removed_contract_ids = existing_contract_ids - current_contract_ids
+    # Identify removed contracts (in the store but not in API - expired/fulfilled/deleted).
+    # A partial crawl cannot tell a removed contract from one on a failed page, so keep them all.
+    if crawl.complete:
+        removed_contract_ids = existing_contract_ids - current_contract_ids
+    else:
+        removed_contract_ids = set()
+        logger.warning(
+            f"Contract crawl incomplete (failed pages: {crawl.failed_pages}), keeping cached contracts not seen"
+        )
 
     logger.info(
         f"Cache synchronization: {len(new_contract_ids)} new contracts, {len(removed_contract_ids)} removed contracts"
     )
 
-    # Remove expired contracts from cache
+    # Remove expired contracts from the store
     if removed_contract_ids:
-        existing_expanded = [c for c in existing_expanded if str(c["contract_id"]) not in removed_contract_ids]
+        store.delete_many(removed_contract_ids)
         logger.info(f"Removed {len(removed_contract_ids)} expired contracts from cache")
 
-    # Expand new contracts
+    # Expand new contracts, most likely blueprint contracts first (or only, in skip mode)
+    expanded_new: List[Dict[str, Any]] = []
     if new_contracts:
-        logger.info(f"Expanding {len(new_contracts)} new contracts...")
-        expanded_new, _ = await expand_new_contracts_dynamic(new_contracts)
-
-        # Add to cache
-        existing_expanded.extend(expanded_new)
+        prefilter = BlueprintPrefilter(issuer_history=store.issuer_blueprint_history(FORGE_REGION_ID))
+        if prefilter.mode in ("skip", "measure"):
+            prefilter.cached_items = await ContractCacheManager(CACHE_DIR).load_contract_items_cache()
+        to_expand, skipped = prefilter.select(new_contracts)
+
+        logger.info(f"Expanding {len(to_expand)} new contracts...")
+        expanded_new, _ = await expand_new_contracts_dynamic(to_expand)
+        store.upsert_many(expanded_new, default_region_id=FORGE_REGION_ID)
         logger.info(f"Added {len(expanded_new)} expanded contracts to cache")
+        if prefilter.mode == "measure":
+            prefilter.measure_recall(expanded_new, skipped)
     else:
         logger.info("No new contracts to expand")
 
-    # Save updated cache
-    try:
-        with open(cache_file, "w") as f:
-            json.dump(existing_expanded, f, indent=2, default=str)
-        logger.info(f"Saved updated cache with {len(existing_expanded)} contracts")
-    except Exception as e:
-        logger.error(f"Failed to save cache: {e}")
-        raise
-
-    # Build and return blueprint-only contracts cache for competition analysis
-    blueprint_contracts = await build_blueprint_contracts_cache(existing_expanded)
+    # Apply the same diff to the blueprint-only snapshot used for competition analysis
+    snapshot = get_blueprint_snapshot()
+    if snapshot.exists:
+        snapshot.apply(expanded_new, removed_contract_ids)
+    else:
+        snapshot.rebuild(await load_blueprint_contracts_from_store(FORGE_REGION_ID))
+
+    blueprint_contracts = snapshot.contracts(FORGE_REGION_ID)
     logger.info(f"Returning {len(blueprint_contracts)} blueprint contracts for competition analysis")
     return blueprint_contracts
 
 
+async def load_blueprint_contracts() -> List[Dict[str, Any]]:
+    """Return the Forge blueprint contracts from the persisted snapshot.
+
+    Reads only the small blueprint-only snapshot; the full contract set is synced first
+    only when no snapshot exists yet.
+    """
+    from contract_fetching import FORGE_REGION_ID
+
+    snapshot = get_blueprint_snapshot()
+    if not snapshot.exists:
+        return await fetch_and_expand_all_forge_contracts()
+    blueprint_contracts = snapshot.contracts(FORGE_REGION_ID)
+    logger.info(f"Loaded {len(blueprint_contracts)} blueprint contracts from the snapshot")
+    return blueprint_contracts
+
+
 async def build_blueprint_contracts_cache(all_expanded_contracts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Build a cache containing only contracts with blueprints for competition analysis.
 
     This reduces memory usage by ~95% since only ~5% of contracts contain blueprints.
+    Use load_blueprint_contracts_from_store() to query the contract store instead.
 
     Args:
         all_expanded_contracts: Full list of expanded contracts
@@ -781,25 +739,33 @@ async def build_blueprint_contracts_cache(all_expanded_contracts: List[Dict[str,
         List of contracts that contain blueprints
     """
     logger.info(f"Building blueprint-only contracts cache from {len(all_expanded_contracts)} total contracts...")
+    blueprint_contracts = [contract for contract in all_expanded_contracts if contract_has_blueprint(contract)]
+    logger.info(
+        f"Blueprint contracts cache built: {len(blueprint_contracts)} contracts "
+        f"({len(blueprint_contracts) / max(len(all_expanded_contracts), 1) * 100:.1f}% of total contracts)"
+    )
+    return blueprint_contracts
 
-    blueprint_contracts = []
-    blueprint_count = 0
 
-    for contract in all_expanded_contracts:
-        if contract.get("type") == "item_exchange" and contract.get("items"):
-            has_blueprint = False
-            for item in contract["items"]:
-                if item.get("blueprint_type") in ["BPO", "BPC"]:
-                    has_blueprint = True
-                    blueprint_count += 1
-                    break
+async def load_blueprint_contracts_from_store(region_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Load only the contracts with blueprints from the contract store.
+
+    Queries the contract store's blueprint index instead of scanning the whole expanded set;
+    only ~5% of contracts contain blueprints.
+
+    Args:
+        region_id: Region to limit the query to, or None for all stored regions
 
-            if has_blueprint:
-                blueprint_contracts.append(contract)
+    Returns:
+        List of contracts that contain blueprints
+    """
+    store = get_contract_store()
+    blueprint_contracts = store.blueprint_contracts(region_id)
+    total_contracts = store.count(region_id)
 
     logger.info(
-        f"Blueprint contracts cache built: {len(blueprint_contracts)} contracts with {blueprint_count} blueprint items "
-        f"({len(blueprint_contracts)/len(all_expanded_contracts)*100:.1f}% of total contracts)"
+        f"Loaded {len(blueprint_contracts)} blueprint contracts of {total_contracts} stored contracts "
+        f"({len(blueprint_contracts) / max(total_contracts, 1) * 100:.1f}%)"
     )
 
     return blueprint_contracts
@@ -4,22 +4,31 @@ Handles fetching contract data from ESI API.
 """
 
 import asyncio
+import atexit
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import aiohttp
 
 from api_client import (
+    esi_governor,
     fetch_esi,
-    fetch_public_contracts_async,
+    fetch_public_contracts_page,
     fetch_public_esi,
     get_session,
     validate_api_response,
     validate_input_params,
 )
-from config import CACHE_DIR, ESI_BASE_URL
+from cache_store import get_cache_store, load_file_cache, table_for_file
+from config import CACHE_BACKEND, ESI_BASE_URL, REGION_CACHE_FILE, REGION_CRAWL_CONCURRENCY
+from sde_store import sde_store
+from universe_topology import universe_topology
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +39,12 @@ FORGE_REGION_ID = 10000002
 async def _fetch_universe_data(sess, endpoint: str) -> Optional[Dict[str, Any]]:
     """Fetch data from ESI universe endpoints with error handling."""
     try:
-        async with sess.get(
+        async with esi_governor.request(), sess.get(
             f"{ESI_BASE_URL}{endpoint}",
             headers={"Accept": "application/json"},
             timeout=aiohttp.ClientTimeout(total=30),
         ) as response:
+            esi_governor.observe(response)
             response.raise_for_status()
             return await response.json()
     except (aiohttp.ClientError, asyncio.TimeoutError):
@@ -58,6 +68,253 @@ async def _get_region_from_system_id(sess, system_id: int) -> Optional[int]:
     return constellation_data.get("region_id")
 
 
+class RegionResolver:
+    """Process-wide location -> region resolver backed by the region_cache table of the cache store.
+
+    The region table is read from disk once and kept in memory. NPC stations and solar systems
+    known to the local SDE store resolve without any calls. Other misses fetch the location's
+    solar system and map it to a region with the preloaded universe topology, falling back to
+    walking solar system -> constellation -> region over ESI for systems it doesn't know.
+    Concurrent lookups for the same location or solar system share one request. Locations that
+    could not be resolved are not looked up again for unresolvable_ttl seconds. New entries
+    are written back in the background a few seconds after the last change, one row per new
+    location.
+    """
+
+    STRUCTURE_ID_THRESHOLD = 1000000000000
+
+    def __init__(self, cache_file: str = REGION_CACHE_FILE, save_delay: float = 5.0, unresolvable_ttl: float = 600.0):
+        self.cache_file = cache_file
+        self.save_delay = save_delay
+        self.unresolvable_ttl = unresolvable_ttl
+        self._regions: Dict[int, int] = {}
+        self._system_regions: Dict[int, int] = {}
+        # Location ID -> time after which a failed lookup is tried again
+        self._unresolvable: Dict[int, float] = {}
+        self._pending_locations: Dict[int, "asyncio.Task[Optional[int]]"] = {}
+        self._pending_systems: Dict[int, "asyncio.Task[Optional[int]]"] = {}
+        self._loaded = False
+        self._unsaved: Dict[int, int] = {}
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "resolved": 0, "failed": 0, "saves": 0}
+
+    def _ensure_loaded(self) -> None:
+        """Load the region table from disk on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if CACHE_BACKEND == "sqlite":
+                data = load_file_cache(self.cache_file)
+            else:
+                with open(self.cache_file, "r") as f:
+                    data = json.load(f)
+            self._regions = {int(location_id): int(region_id) for location_id, region_id in data.items() if region_id}
+            logger.info(f"Loaded {len(self._regions)} location regions from {self.cache_file}")
+        except (FileNotFoundError, json.JSONDecodeError, ValueError, TypeError, sqlite3.Error):
+            self._regions = {}
+        atexit.register(self.flush)
+
+    def get_cached(self, location_id: Optional[int]) -> Optional[int]:
+        """Return the region for a location if already known, without any network calls."""
+        if not location_id:
+            return None
+        self._ensure_loaded()
+        return self._regions.get(location_id)
+
+    def remember(self, location_id: int, region_id: int) -> None:
+        """Record a known location -> region mapping and schedule a background save."""
+        self._ensure_loaded()
+        if not location_id or not region_id or self._regions.get(location_id) == region_id:
+            return
+        self._regions[location_id] = region_id
+        self._unsaved[location_id] = region_id
+        self._schedule_save()
+
+    async def resolve(self, location_id: Optional[int]) -> Optional[int]:
+        """Resolve a single location ID (station or structure) to its region ID."""
+        if not location_id:
+            return None
+        self._ensure_loaded()
+
+        region_id = self._regions.get(location_id) or self._static_region(location_id)
+        if region_id:
+            self.stats["hits"] += 1
+            return region_id
+        if self._is_unresolvable(location_id):
+            self.stats["hits"] += 1
+            return None
+
+        self.stats["misses"] += 1
+        task = self._pending_locations.get(location_id)
+        if task is None:
+            task = asyncio.ensure_future(self._resolve_from_esi(location_id))
+            self._pending_locations[location_id] = task
+            task.add_done_callback(lambda _: self._pending_locations.pop(location_id, None))
+        return await asyncio.shield(task)
+
+    async def resolve_many(self, location_ids: Iterable[Optional[int]]) -> Dict[int, int]:
+        """Resolve many location IDs at once, fetching all misses concurrently.
+
+        Args:
+            location_ids: Station or structure IDs; duplicates and falsy IDs are ignored
+
+        Returns:
+            Mapping of location ID to region ID for every location that could be resolved
+        """
+        self._ensure_loaded()
+        results: Dict[int, int] = {}
+        misses: List[int] = []
+        for location_id in dict.fromkeys(location_ids):
+            if not location_id:
+                continue
+            region_id = self._regions.get(location_id) or self._static_region(location_id)
+            if region_id:
+                results[location_id] = region_id
+            elif not self._is_unresolvable(location_id):
+                misses.append(location_id)
+
+        self.stats["hits"] += len(results)
+        if misses:
+            logger.info(f"Resolving regions for {len(misses)} uncached locations...")
+            resolved = await asyncio.gather(*(self.resolve(location_id) for location_id in misses))
+            results.update({location_id: region_id for location_id, region_id in zip(misses, resolved) if region_id})
+
+        return results
+
+    def _is_unresolvable(self, location_id: int) -> bool:
+        """Whether a recent lookup of the location failed, forgetting failures that have expired."""
+        retry_at = self._unresolvable.get(location_id)
+        if retry_at is None:
+            return False
+        if time.monotonic() < retry_at:
+            return True
+        del self._unresolvable[location_id]
+        return False
+
+    def _static_region(self, location_id: int) -> Optional[int]:
+        """Look a location up in the SDE store, memoizing hits in memory without persisting them."""
+        if location_id >= self.STRUCTURE_ID_THRESHOLD:
+            return None
+        region_id = sde_store.region_of_location(location_id)
+        if region_id:
+            self._regions[location_id] = region_id
+        return region_id
+
+    async def _resolve_from_esi(self, location_id: int) -> Optional[int]:
+        """Walk location -> solar system -> region over ESI and memoize the result."""
+        sess = await get_session()
+
+        solar_system_id = None
+        if location_id >= self.STRUCTURE_ID_THRESHOLD:  # Structure
+            struct_data = await _fetch_universe_data(sess, f"/universe/structures/{location_id}")
+            if struct_data:
+                solar_system_id = struct_data.get("solar_system_id")
+        else:  # Station
+            station_data = await _fetch_universe_data(sess, f"/universe/stations/{location_id}")
+            if station_data:
+                solar_system_id = station_data.get("system_id")
+
+        region_id = await self._resolve_system(sess, solar_system_id) if solar_system_id else None
+
+        if region_id:
+            self.stats["resolved"] += 1
+            self.remember(location_id, region_id)
+        else:
+            self.stats["failed"] += 1
+            # Failures may be transient (timeouts, 5xx, error budget), so they are only remembered for a while
+            self._unresolvable[location_id] = time.monotonic() + self.unresolvable_ttl
+        return region_id
+
+    async def _resolve_system(self, sess, system_id: int) -> Optional[int]:
+        """Resolve a solar system to its region, sharing in-flight lookups."""
+        region_id = self._system_regions.get(system_id) or sde_store.region_of_system(system_id)
+        if not region_id:
+            await universe_topology.ensure_loaded()
+            region_id = universe_topology.get_system_region(system_id)
+        if region_id:
+            self._system_regions[system_id] = region_id
+            return region_id
+
+        task = self._pending_systems.get(system_id)
+        if task is None:
+            task = asyncio.ensure_future(_get_region_from_system_id(sess, system_id))
+            self._pending_systems[system_id] = task
+            task.add_done_callback(lambda _: self._pending_systems.pop(system_id, None))
+
+        region_id = await asyncio.shield(task)
+        if region_id:
+            self._system_regions[system_id] = region_id
+        return region_id
+
+    def _schedule_save(self) -> None:
+        """Debounce a background write of the region table."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.save_delay, self._start_background_save, loop)
+
+    def _start_background_save(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Take the pending entries on the loop thread and hand only the write off to the default executor."""
+        self._save_handle = None
+        snapshot = self._take_unsaved()
+        if snapshot is None:
+            return
+        write = loop.run_in_executor(None, self._write, *snapshot)
+        # Done callbacks run on the loop thread, so a failed write is merged back there as well
+        write.add_done_callback(lambda future: future.result() or self._restore_unsaved(snapshot[0]))
+
+    def flush(self) -> None:
+        """Write regions learned since the last flush to disk."""
+        snapshot = self._take_unsaved()
+        if snapshot is not None and not self._write(*snapshot):
+            self._restore_unsaved(snapshot[0])
+
+    def _take_unsaved(self) -> Optional[Tuple[Dict[int, int], Dict[int, int]]]:
+        """Swap out the unsaved entries, with a copy of the full table for the JSON backend."""
+        if not self._unsaved:
+            return None
+        pending, self._unsaved = self._unsaved, {}
+        return pending, (dict(self._regions) if CACHE_BACKEND != "sqlite" else {})
+
+    def _restore_unsaved(self, pending: Dict[int, int]) -> None:
+        self._unsaved = {**pending, **self._unsaved}
+
+    def _write(self, pending: Dict[int, int], regions: Dict[int, int]) -> bool:
+        """Persist a snapshot taken by _take_unsaved(); safe to run off the loop thread.
+
+        Returns:
+            True if the entries were saved
+        """
+        with self._save_lock:
+            try:
+                if CACHE_BACKEND == "sqlite":
+                    get_cache_store(os.path.dirname(self.cache_file)).put_many(
+                        table_for_file(self.cache_file),
+                        {str(location_id): region_id for location_id, region_id in pending.items()},
+                    )
+                else:
+                    os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+                    tmp_file = f"{self.cache_file}.tmp"
+                    with open(tmp_file, "w") as f:
+                        json.dump({str(location_id): region_id for location_id, region_id in regions.items()}, f)
+                    os.replace(tmp_file, self.cache_file)
+                self.stats["saves"] += 1
+                logger.debug(f"Saved {len(pending)} new location regions for {self.cache_file}")
+                return True
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Failed to save region cache {self.cache_file}: {e}")
+                return False
+
+
+# Process-wide resolver shared by contract fetching, competition checks and utils
+region_resolver = RegionResolver()
+
+
 @validate_input_params((int, type(None)))
 async def get_region_from_location(location_id: Optional[int]) -> Optional[int]:
     """Get region ID from a location ID (station or structure) with caching.
@@ -72,49 +329,59 @@ async def get_region_from_location(location_id: Optional[int]) -> Optional[int]:
         Region ID if found, None if location cannot be resolved
 
     Note:
-        Results are cached in 'cache/region_cache.json' to avoid repeated ESI calls.
+        Thin wrapper over the process-wide region_resolver, which keeps
+        'cache/region_cache.json' in memory and saves it in the background.
         Structure lookups require appropriate access permissions.
     """
-    if not location_id:
-        return None
+    return await region_resolver.resolve(location_id)
 
-    # Load cache
-    cache_file = os.path.join(CACHE_DIR, "region_cache.json")
-    try:
-        with open(cache_file, "r") as f:
-            region_cache = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        region_cache = {}
 
-    location_id_str = str(location_id)
-    if location_id_str in region_cache:
-        return region_cache[location_id_str]
+NAMES_BATCH_SIZE = 1000  # ESI limit of IDs per /universe/names/ call
+NAMES_SPLIT_WAYS = 8  # Parts a rejected batch is split into
 
-    region_id = None
-    sess = await get_session()
 
-    # Determine solar system ID based on location type
-    solar_system_id = None
-    if location_id >= 1000000000000:  # Structure
-        struct_data = await _fetch_universe_data(sess, f"/universe/structures/{location_id}")
-        if struct_data:
-            solar_system_id = struct_data.get("solar_system_id")
-    else:  # Station
-        station_data = await _fetch_universe_data(sess, f"/universe/stations/{location_id}")
-        if station_data:
-            solar_system_id = station_data.get("system_id")
+async def _post_universe_names(sess, ids: List[int], name_map: Dict[int, str]) -> None:
+    """Resolve one batch of IDs via POST /universe/names/, isolating invalid IDs on 404.
 
-    if solar_system_id:
-        region_id = await _get_region_from_system_id(sess, solar_system_id)
+    ESI rejects the whole batch with 404 if any ID is unknown, and every 404 counts against
+    the error budget. A rejected batch is therefore split NAMES_SPLIT_WAYS ways and the parts
+    retried concurrently, and batches of at most NAMES_SPLIT_WAYS IDs are retried one ID at
+    a time, so one invalid ID among 1000 costs five 404s rather than one per halving.
+    """
+    invalid_id_in_batch = False
+    try:
+        async with esi_governor.request(), sess.post(
+            f"{ESI_BASE_URL}/universe/names/",
+            json=ids,
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response:
+            esi_governor.observe(response)
+            if response.status == 404:
+                invalid_id_in_batch = True
+            else:
+                response.raise_for_status()
+                names_data = await response.json()
+
+                # Build mapping from response
+                for name_info in names_data:
+                    entity_id = name_info.get("id")
+                    name = name_info.get("name")
+                    if entity_id and name:
+                        name_map[entity_id] = name
 
-    # Cache the result
-    if region_id:
-        region_cache[location_id_str] = region_id
-        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-        with open(cache_file, "w") as f:
-            json.dump(region_cache, f, indent=2)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning(f"Failed to resolve names for {len(ids)} IDs: {e}")
 
-    return region_id
+    # Split outside the request so the parts do not wait on a governor slot this call still holds
+    if invalid_id_in_batch:
+        if len(ids) == 1:
+            logger.debug(f"ID {ids[0]} cannot be resolved to a name")
+            return
+        part_size = 1 if len(ids) <= NAMES_SPLIT_WAYS else -(-len(ids) // NAMES_SPLIT_WAYS)
+        await asyncio.gather(
+            *(_post_universe_names(sess, ids[i : i + part_size], name_map) for i in range(0, len(ids), part_size))
+        )
 
 
 async def get_issuer_names(issuer_ids: List[int]) -> Dict[int, str]:
@@ -126,7 +393,7 @@ async def get_issuer_names(issuer_ids: List[int]) -> Dict[int, str]:
         issuer_ids: List of character/corporation IDs to resolve
 
     Returns:
-        Dictionary mapping IDs to resolved names
+        Dictionary mapping IDs to resolved names; IDs ESI cannot resolve are omitted
 
     Note:
         Uses POST to /universe/names/ for batch resolution.
@@ -138,33 +405,16 @@ async def get_issuer_names(issuer_ids: List[int]) -> Dict[int, str]:
     # Remove duplicates while preserving order
     unique_ids = list(dict.fromkeys(issuer_ids))
 
-    name_map = {}
+    name_map: Dict[int, str] = {}
     sess = await get_session()
 
-    # Process in batches of 1000 (ESI limit)
-    batch_size = 1000
-    for i in range(0, len(unique_ids), batch_size):
-        batch_ids = unique_ids[i : i + batch_size]
-
-        try:
-            async with sess.post(
-                f"{ESI_BASE_URL}/universe/names/",
-                json=batch_ids,
-                headers={"Accept": "application/json", "Content-Type": "application/json"},
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                response.raise_for_status()
-                names_data = await response.json()
-
-                # Build mapping from response
-                for name_info in names_data:
-                    entity_id = name_info.get("id")
-                    name = name_info.get("name")
-                    if entity_id and name:
-                        name_map[entity_id] = name
-
-        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-            logger.warning(f"Failed to resolve names for batch {i//batch_size + 1}: {e}")
+    # Batches of up to 1000 (ESI limit) go out concurrently, paced by the ESI governor
+    await asyncio.gather(
+        *(
+            _post_universe_names(sess, unique_ids[i : i + NAMES_BATCH_SIZE], name_map)
+            for i in range(0, len(unique_ids), NAMES_BATCH_SIZE)
+        )
+    )
 
     return name_map
 
@@ -251,42 +501,75 @@ async def fetch_corporation_contracts(corp_id: int, access_token: str) -> Option
     return await fetch_esi(endpoint, None, access_token)  # Corp contracts don't need char_id
 
 
-async def fetch_all_contracts_in_region(region_id: int) -> List[Dict[str, Any]]:
-    """Fetch all contracts from a region with safety limits."""
+@dataclass
+class RegionCrawlResult:
+    """Outcome of a regional public contract crawl."""
+
+    region_id: int
+    contracts: List[Dict[str, Any]] = field(default_factory=list)
+    total_pages: int = 0
+    failed_pages: List[int] = field(default_factory=list)
+    truncated: bool = False
+
+    @property
+    def complete(self) -> bool:
+        """True if every page was fetched and nothing was cut off by the safety limits."""
+        return not self.failed_pages and not self.truncated
+
+
+async def crawl_region_contracts(
+    region_id: int, max_concurrency: int = REGION_CRAWL_CONCURRENCY, max_pages: int = 100, max_contracts: int = 50000
+) -> RegionCrawlResult:
+    """Fetch every public contract page of a region concurrently.
+
+    Page 1 supplies the X-Pages total; the remaining pages are then fetched concurrently
+    under a bounded semaphore, each with its own retries. Pages that still fail are listed
+    in ``failed_pages`` so a partial crawl is never mistaken for a complete one.
+
+    Every returned contract is stamped with ``region_id``, and each start location seen is
+    recorded in the region resolver, so downstream code never has to walk
+    location -> system -> constellation -> region for these contracts.
+    """
     logger.info(f"Fetching all contracts from region {region_id}")
+    result = RegionCrawlResult(region_id=region_id)
 
-    all_contracts = []
-    page = 1
-    max_pages = 100  # Increased safety limit
-    max_contracts = 50000  # Configurable limit to prevent excessive memory usage
+    first_page, total_pages = await fetch_public_contracts_page(region_id, page=1)
+    if first_page is None:
+        result.failed_pages.append(1)
+        logger.error(f"Failed to fetch page 1 of region {region_id} contracts, crawl aborted")
+        return result
 
-    while page <= max_pages:
-        logger.info(f"Fetching page {page}...")
-        contracts = await fetch_public_contracts_async(region_id, page=page)
+    result.total_pages = max(total_pages, 1)
+    if result.total_pages > max_pages:
+        logger.warning(f"Region {region_id} has {result.total_pages} pages, limiting crawl to {max_pages}")
+        result.truncated = True
+    last_page = min(result.total_pages, max_pages)
 
-        if not contracts:
-            logger.info(f"No more contracts or invalid response on page {page}, stopping")
-            break
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
 
-        logger.info(f"Found {len(contracts)} contracts on page {page}")
+    async def fetch_page(page: int) -> Optional[List[Dict[str, Any]]]:
+        async with semaphore:
+            contracts, _ = await fetch_public_contracts_page(region_id, page=page)
+            return contracts
 
-        # Debug: print types of first 5 contracts
-        if page == 1:
-            for i, c in enumerate(contracts[:5]):
-                logger.info(f"Contract {i}: type={c.get('type')}, status={c.get('status')}, price={c.get('price')}")
+    remaining_pages = list(range(2, last_page + 1))
+    remaining = await asyncio.gather(*(fetch_page(page) for page in remaining_pages))
+    pages = [(1, first_page)] + list(zip(remaining_pages, remaining))
+
+    seen_locations: Set[int] = set()
+    for page, contracts in pages:
+        if contracts is None:
+            result.failed_pages.append(page)
+            continue
 
-        # Validate and store contracts
         for contract in contracts:
             if not isinstance(contract, dict) or "contract_id" not in contract:
                 logger.warning(f"Invalid contract data on page {page}: {contract}")
                 continue
 
-            contract_id = contract["contract_id"]
-            contract_type = contract.get("type")
-
             contract_data = {
-                "contract_id": contract_id,
-                "type": contract_type,
+                "contract_id": contract["contract_id"],
+                "type": contract.get("type"),
                 "price": contract.get("price", 0),
                 "issuer_id": contract.get("issuer_id"),
                 "issuer_corporation_id": contract.get("issuer_corporation_id"),
@@ -296,17 +579,35 @@ async def fetch_all_contracts_in_region(region_id: int) -> List[Dict[str, Any]]:
                 "date_expired": contract.get("date_expired"),
                 "volume": contract.get("volume", 1),
                 "status": "outstanding",  # Public endpoint only returns active contracts
+                "region_id": region_id,  # Known from the crawl, saves a location -> region lookup later
             }
+            result.contracts.append(contract_data)
 
-            all_contracts.append(contract_data)
-            logger.debug(f"Stored contract {contract_id} of type {contract_type}")
+            start_location_id = contract_data["start_location_id"]
+            if start_location_id and start_location_id not in seen_locations:
+                seen_locations.add(start_location_id)
+                region_resolver.remember(start_location_id, region_id)
 
-            # Check contract limit
-            if len(all_contracts) >= max_contracts:
+            if len(result.contracts) >= max_contracts:
                 logger.warning(f"Reached contract limit of {max_contracts}, stopping")
-                return all_contracts
+                result.truncated = True
+                return result
+
+    if result.failed_pages:
+        logger.error(
+            f"Partial crawl of region {region_id}: pages {result.failed_pages} of {result.total_pages} failed, "
+            f"{len(result.contracts)} contracts fetched"
+        )
+    else:
+        logger.info(f"Total contracts found: {len(result.contracts)} across {result.total_pages} pages")
+    return result
 
-        page += 1
 
-    logger.info(f"Total contracts found: {len(all_contracts)}")
-    return all_contracts
+async def fetch_all_contracts_in_region(region_id: int) -> List[Dict[str, Any]]:
+    """Fetch all contracts from a region with safety limits.
+
+    Thin wrapper around crawl_region_contracts for callers that only need the contracts;
+    use crawl_region_contracts directly to find out whether the crawl was complete.
+    """
+    result = await crawl_region_contracts(region_id)
+    return result.contracts
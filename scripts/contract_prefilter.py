@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+EVE Observer Contract Prefilter
+Scores new public contracts by how likely they are to contain blueprints,
+using only the header fields of the contract list and what earlier syncs
+learned, before any contract items are fetched.
+
+Modes (CONTRACT_PREFILTER_MODE):
+    off      expand every new contract in list order
+    rank     expand every new contract, most likely blueprint contracts first
+    skip     don't fetch items for item exchanges scoring below the minimum score
+    measure  expand everything, then report the recall and API calls skip mode would give
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import CONTRACT_PREFILTER_MIN_SCORE, CONTRACT_PREFILTER_MODE
+from contract_store import contract_has_blueprint
+from sde_store import sde_store
+
+logger = logging.getLogger(__name__)
+
+PREFILTER_MODES = ("off", "rank", "skip", "measure")
+
+# Blueprints are 0.01 m3 each, so a contract of only blueprints is tiny
+SMALL_CONTRACT_VOLUME = 1.0
+MEDIUM_CONTRACT_VOLUME = 100.0
+
+TITLE_PATTERN = re.compile(r"\b(bpos?|bpcs?|blueprints?|copy|copies|runs?|me\s*\d+|te\s*\d+)\b", re.IGNORECASE)
+
+# Sightings needed before an issuer's blueprint ratio outweighs the neutral prior
+MIN_ISSUER_SIGHTINGS = 3
+
+
+class BlueprintPrefilter:
+    """Blueprint-likelihood scoring and selection of new contracts to expand.
+
+    Args:
+        mode: One of PREFILTER_MODES
+        min_score: Score below which skip mode leaves an item exchange unexpanded
+        issuer_history: issuer_id -> (item exchanges seen, of which with blueprints), e.g. from
+            ContractStore.issuer_blueprint_history()
+        cached_items: contract_id -> raw items already fetched for that contract in an earlier sighting
+    """
+
+    def __init__(
+        self,
+        mode: str = CONTRACT_PREFILTER_MODE,
+        min_score: float = CONTRACT_PREFILTER_MIN_SCORE,
+        issuer_history: Optional[Dict[int, Tuple[int, int]]] = None,
+        cached_items: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ):
+        if mode not in PREFILTER_MODES:
+            logger.warning(f"Unknown contract prefilter mode '{mode}', using 'rank'")
+            mode = "rank"
+        self.mode = mode
+        self.min_score = min_score
+        self.issuer_history = issuer_history or {}
+        self.cached_items = cached_items or {}
+
+    def _cached_items_score(self, contract_id: Any) -> Optional[float]:
+        """Exact answer from items fetched earlier: 1.0 or 0.0, or None if unknown."""
+        items = self.cached_items.get(str(contract_id))
+        if items is None:
+            return None
+        unknown = False
+        for item in items:
+            if item.get("is_blueprint_copy"):
+                return 1.0
+            is_blueprint = sde_store.is_blueprint(item.get("type_id"))
+            if is_blueprint:
+                return 1.0
+            unknown = unknown or is_blueprint is None
+        return None if unknown else 0.0
+
+    def score(self, contract: Dict[str, Any]) -> float:
+        """Estimate how likely a contract is to contain a blueprint, between 0 and 1."""
+        if contract.get("type") != "item_exchange":
+            return 0.0
+
+        cached = self._cached_items_score(contract.get("contract_id"))
+        if cached is not None:
+            return cached
+
+        score = 0.0
+        volume = contract.get("volume")
+        if volume is not None:
+            if volume <= SMALL_CONTRACT_VOLUME:
+                score += 0.4
+            elif volume <= MEDIUM_CONTRACT_VOLUME:
+                score += 0.15
+
+        if TITLE_PATTERN.search(contract.get("title") or ""):
+            score += 0.3
+
+        seen, with_blueprints = self.issuer_history.get(contract.get("issuer_id"), (0, 0))
+        if seen >= MIN_ISSUER_SIGHTINGS:
+            score += 0.4 * with_blueprints / seen
+        else:
+            score += 0.1  # Unknown issuer: neutral prior
+
+        return min(score, 1.0)
+
+    def select(self, contracts: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Choose which new contracts to expand.
+
+        Returns:
+            Tuple of (contracts to expand, contracts skip mode leaves out). In measure mode the
+            second list holds the contracts skip mode would have left out, though all are expanded.
+        """
+        if self.mode == "off" or not contracts:
+            return contracts, []
+
+        scores = {id(contract): self.score(contract) for contract in contracts}
+        ranked = sorted(contracts, key=lambda c: scores[id(c)], reverse=True)
+        below = [c for c in ranked if c.get("type") == "item_exchange" and scores[id(c)] < self.min_score]
+
+        if self.mode == "skip":
+            below_ids = {id(c) for c in below}
+            selected = [c for c in ranked if id(c) not in below_ids]
+            logger.info(
+                f"Contract prefilter: expanding {len(selected)} contracts, skipping {len(below)} item exchanges "
+                f"scoring below {self.min_score}"
+            )
+            return selected, below
+        if self.mode == "measure":
+            return ranked, below
+        return ranked, []
+
+    def measure_recall(self, expanded: List[Dict[str, Any]], would_skip: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compare a full expansion with what skip mode would have kept.
+
+        Args:
+            expanded: Every expanded new contract
+            would_skip: The contracts select() would have skipped
+
+        Returns:
+            Blueprint contracts found, missed by skip mode, recall and item requests saved
+        """
+        skipped_ids = {c.get("contract_id") for c in would_skip}
+        blueprint_ids = {c.get("contract_id") for c in expanded if contract_has_blueprint(c)}
+        missed = len(blueprint_ids & skipped_ids)
+        item_exchanges = sum(1 for c in expanded if c.get("type") == "item_exchange")
+        result = {
+            "blueprint_contracts": len(blueprint_ids),
+            "missed": missed,
+            "recall": round(1 - missed / len(blueprint_ids), 4) if blueprint_ids else 1.0,
+            "item_requests": item_exchanges,
+            "item_requests_saved": len(skipped_ids),
+        }
+        logger.info(
+            f"Contract prefilter recall at min score {self.min_score}: {result['recall']:.1%} "
+            f"({missed} of {len(blueprint_ids)} blueprint contracts missed), "
+            f"{len(skipped_ids)} of {item_exchanges} item requests saved"
+        )
+        return result
@@ -11,6 +11,8 @@ from contract_bpo import (
     save_bpo_contracts,
 )
 from contract_competition import (
+    CompetitionIndex,
+    build_competition_index,
     check_contract_competition,
     check_contract_competition_hybrid,
     check_contracts_competition_concurrent,
@@ -22,8 +24,12 @@ from contract_expansion import (
     expand_new_contracts_dynamic,
     expand_single_contract_with_caching,
     fetch_and_expand_all_forge_contracts,
+    load_blueprint_contracts,
+    load_blueprint_contracts_from_store,
 )
 from contract_fetching import (
+    RegionCrawlResult,
+    crawl_region_contracts,
     fetch_all_contracts_in_region,
     fetch_character_contract_items,
     fetch_character_contracts,
@@ -51,6 +57,8 @@ from contract_wordpress import (
 # For backward compatibility, also import the main function
 __all__ = [
     # Competition analysis
+    "CompetitionIndex",
+    "build_competition_index",
     "check_contract_competition",
     "check_contract_competition_hybrid",
     "check_contracts_competition_concurrent",
@@ -59,6 +67,8 @@ __all__ = [
     "fetch_corporation_contract_items",
     "fetch_character_contracts",
     "fetch_corporation_contracts",
+    "RegionCrawlResult",
+    "crawl_region_contracts",
     "fetch_all_contracts_in_region",
     "get_region_from_location",
     "get_issuer_names",
@@ -69,6 +79,8 @@ __all__ = [
     "apply_cached_data_to_contracts",
     "fetch_and_expand_all_forge_contracts",
     "build_blueprint_contracts_cache",
+    "load_blueprint_contracts",
+    "load_blueprint_contracts_from_store",
     # WordPress integration
     "generate_contract_title",
     "update_contract_in_wp",
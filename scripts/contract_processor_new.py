@@ -20,6 +20,7 @@ from contract_bpo import get_user_single_bpo_contracts
 from contract_competition import check_contracts_competition_concurrent
 from contract_expansion import fetch_and_expand_all_forge_contracts
 from contract_fetching import fetch_character_contracts
+from contract_store import contract_lookup
 from contract_wordpress import batch_update_contracts_in_wp
 from utils import parse_arguments
 
@@ -85,6 +86,7 @@ async def process_character_contracts(
         if all_expanded_contracts is None:
             logger.info("Fetching all expanded contracts from The Forge region for competition analysis...")
             all_expanded_contracts = await fetch_and_expand_all_forge_contracts()
+        expanded_lookup = contract_lookup(all_expanded_contracts or [])
 
         # Collect contracts that need competition checking
         contracts_to_check = []
@@ -105,12 +107,7 @@ async def process_character_contracts(
             # Check if this contract needs competition checking
             if contract.get("status") == "outstanding" and contract.get("type") == "item_exchange":
                 # Fetch contract items for competition checking
-                contract_items = None
-                if all_expanded_contracts:
-                    for expanded_contract in all_expanded_contracts:
-                        if expanded_contract.get("contract_id") == contract["contract_id"]:
-                            contract_items = expanded_contract.get("items", [])
-                            break
+                contract_items = expanded_lookup.items_of(contract["contract_id"])
 
                 if contract_items:
                     contracts_to_check.append(contract)
@@ -276,9 +273,9 @@ async def fetch_all_contract_items_for_contracts(contracts: List[Dict[str, Any]]
     """Pre-fetch all contract items for the given contracts in parallel and store in cache.
 
     NOTE: This function is deprecated. Contract items are now assumed to be pre-cached
-    in the all_contracts_forge.json file. No fetching is performed.
+    in the contract store. No fetching is performed.
     """
-    logger.info("Contract items are assumed to be pre-cached in all_contracts_forge.json - skipping fetch")
+    logger.info("Contract items are assumed to be pre-cached in the contract store - skipping fetch")
     return
 
 
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+EVE Observer Contract Store
+Incremental SQLite store for expanded public contracts, keyed by contract_id.
+
+Replaces the all_contracts_forge.json snapshot: a sync only inserts new
+contracts and deletes removed ones, unchanged rows are never rewritten, and
+contracts can be streamed or queried by region, item type or blueprint content
+without loading the whole set.
+
+The blueprint-bearing subset is also kept as a small JSON snapshot
+(BlueprintSnapshot), updated with the same diff, so competition checks can
+start from it without opening the full store.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config import BLUEPRINT_CONTRACTS_FILE, CACHE_DB_NAME, CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+BLUEPRINT_TYPES = ("BPO", "BPC")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    contract_id INTEGER PRIMARY KEY,
+    region_id INTEGER,
+    type TEXT,
+    has_blueprint INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contracts_region ON contracts (region_id);
+CREATE INDEX IF NOT EXISTS contracts_blueprint ON contracts (region_id) WHERE has_blueprint = 1;
+CREATE TABLE IF NOT EXISTS contract_item_types (
+    contract_id INTEGER NOT NULL,
+    type_id INTEGER NOT NULL,
+    PRIMARY KEY (type_id, contract_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS contract_item_types_contract ON contract_item_types (contract_id);
+CREATE TABLE IF NOT EXISTS contract_store_migrations (source TEXT PRIMARY KEY);
+"""
+
+
+def contract_has_blueprint(contract: Dict[str, Any]) -> bool:
+    """Whether an expanded contract is an item exchange containing a BPO or BPC."""
+    return contract.get("type") == "item_exchange" and any(
+        item.get("blueprint_type") in BLUEPRINT_TYPES for item in contract.get("items") or []
+    )
+
+
+class ContractLookup:
+    """contract_id lookups over a list of expanded contracts, without copying the list.
+
+    The index is built on first lookup and rebuilt when the list's length changes, so contracts
+    appended to the list later are found. Call refresh() after replacing contracts in place.
+    Lookups by item type for competition checks go through contract_competition.CompetitionIndex.
+    """
+
+    def __init__(self, contracts: List[Dict[str, Any]]):
+        self.contracts = contracts
+        self._indexed_len = -1
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+
+    def refresh(self) -> None:
+        self._indexed_len = -1
+
+    def get(self, contract_id: Any) -> Optional[Dict[str, Any]]:
+        """Return the expanded contract with this ID, or None."""
+        if self._indexed_len != len(self.contracts):
+            self._by_id = {int(contract.get("contract_id") or 0): contract for contract in self.contracts}
+            self._indexed_len = len(self.contracts)
+        return self._by_id.get(int(contract_id or 0))
+
+    def items_of(self, contract_id: Any) -> Optional[List[Dict[str, Any]]]:
+        """Return the items of an expanded contract, or None if the contract isn't in the list."""
+        contract = self.get(contract_id)
+        return contract.get("items", []) if contract is not None else None
+
+
+class ExpandedContracts(list):
+    """List of expanded contracts that carries its own ContractLookup.
+
+    Behaves exactly like the list it replaces; the store and the blueprint snapshot return
+    these so every caller shares one index per list.
+    """
+
+    @property
+    def lookup(self) -> ContractLookup:
+        if "_lookup" not in self.__dict__:
+            self._lookup = ContractLookup(self)
+        return self._lookup
+
+    def get(self, contract_id: Any) -> Optional[Dict[str, Any]]:
+        """Return the expanded contract with this ID, or None."""
+        return self.lookup.get(contract_id)
+
+    def items_of(self, contract_id: Any) -> Optional[List[Dict[str, Any]]]:
+        """Return the items of an expanded contract, or None if the contract isn't in the list."""
+        return self.lookup.items_of(contract_id)
+
+
+def contract_lookup(contracts: List[Dict[str, Any]]) -> ContractLookup:
+    """Return the shared lookup of an ExpandedContracts, or a new one over a plain list.
+
+    A lookup over a plain list indexes it on first use, so callers should keep it for all
+    their lookups rather than calling this once per contract.
+    """
+    if isinstance(contracts, ExpandedContracts):
+        return contracts.lookup
+    return ContractLookup(contracts)
+
+
+class ContractStore:
+    """Expanded contracts in SQLite with region, item type and blueprint indexes."""
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.stats = {"inserted": 0, "deleted": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def contract_ids(self, region_id: Optional[int] = None) -> Set[int]:
+        """Return the IDs of all stored contracts, optionally limited to one region."""
+        query, params = "SELECT contract_id FROM contracts", ()
+        if region_id is not None:
+            query, params = query + " WHERE region_id = ?", (region_id,)
+        return {row[0] for row in self._connection().execute(query, params)}
+
+    def count(self, region_id: Optional[int] = None) -> int:
+        """Return the number of stored contracts."""
+        if region_id is None:
+            return self._connection().execute("SELECT COUNT(*) FROM contracts").fetchone()[0]
+        return (
+            self._connection().execute("SELECT COUNT(*) FROM contracts WHERE region_id = ?", (region_id,)).fetchone()[0]
+        )
+
+    def upsert_many(self, contracts: Iterable[Dict[str, Any]], default_region_id: Optional[int] = None) -> int:
+        """Insert or replace expanded contracts in one transaction.
+
+        Args:
+            contracts: Expanded contract dictionaries with a contract_id
+            default_region_id: Region stamped on contracts that don't carry one
+
+        Returns:
+            Number of contracts written
+        """
+        rows = []
+        item_rows = []
+        for contract in contracts:
+            if default_region_id is not None:
+                contract.setdefault("region_id", default_region_id)
+            contract_id = int(contract["contract_id"])
+            rows.append(
+                (
+                    contract_id,
+                    contract.get("region_id"),
+                    contract.get("type"),
+                    int(contract_has_blueprint(contract)),
+                    json.dumps(contract, separators=(",", ":"), default=str),
+                )
+            )
+            type_ids = {item.get("type_id") for item in contract.get("items") or [] if item.get("type_id")}
+            item_rows.extend((contract_id, type_id) for type_id in type_ids)
+        if not rows:
+            return 0
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany("DELETE FROM contract_item_types WHERE contract_id = ?", [(row[0],) for row in rows])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO contracts (contract_id, region_id, type, has_blueprint, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO contract_item_types (contract_id, type_id) VALUES (?, ?)", item_rows
+                )
+        self.stats["inserted"] += len(rows)
+        return len(rows)
+
+    def delete_many(self, contract_ids: Iterable[int]) -> int:
+        """Delete contracts by ID in one transaction."""
+        params = [(int(contract_id),) for contract_id in contract_ids]
+        if not params:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany("DELETE FROM contract_item_types WHERE contract_id = ?", params)
+                conn.executemany("DELETE FROM contracts WHERE contract_id = ?", params)
+        self.stats["deleted"] += len(params)
+        return len(params)
+
+    def iter_contracts(
+        self, region_id: Optional[int] = None, blueprints_only: bool = False, batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream stored contracts without loading the whole set into memory."""
+        conditions, params = [], []
+        if region_id is not None:
+            conditions.append("region_id = ?")
+            params.append(region_id)
+        if blueprints_only:
+            conditions.append("has_blueprint = 1")
+        query = "SELECT data FROM contracts"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cursor = self._connection().execute(query + " ORDER BY contract_id", params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for (data,) in rows:
+                yield json.loads(data)
+
+    def blueprint_contracts(self, region_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return all contracts containing a BPO or BPC, using the blueprint index."""
+        return ExpandedContracts(self.iter_contracts(region_id, blueprints_only=True))
+
+    def contracts_with_type(self, type_id: int, region_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return all contracts containing at least one item of the given type."""
+        query = (
+            "SELECT c.data FROM contract_item_types t JOIN contracts c ON c.contract_id = t.contract_id "
+            "WHERE t.type_id = ?"
+        )
+        params: List[Any] = [type_id]
+        if region_id is not None:
+            query += " AND c.region_id = ?"
+            params.append(region_id)
+        return [json.loads(data) for (data,) in self._connection().execute(query, params)]
+
+    def issuer_blueprint_history(self, region_id: Optional[int] = None) -> Dict[int, Tuple[int, int]]:
+        """Return issuer_id -> (stored item exchanges, of which containing blueprints)."""
+        query = (
+            "SELECT json_extract(data, '$.issuer_id'), COUNT(*), SUM(has_blueprint) FROM contracts "
+            "WHERE type = 'item_exchange'"
+        )
+        params: List[Any] = []
+        if region_id is not None:
+            query += " AND region_id = ?"
+            params.append(region_id)
+        rows = self._connection().execute(query + " GROUP BY 1", params)
+        return {issuer_id: (seen, with_blueprints) for issuer_id, seen, with_blueprints in rows if issuer_id}
+
+    def import_json(self, json_file: str, default_region_id: Optional[int] = None) -> int:
+        """Import a legacy JSON contract list once; later calls are no-ops.
+
+        Returns:
+            Number of imported contracts
+        """
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM contract_store_migrations WHERE source = ?", (json_file,)).fetchone():
+            return 0
+        imported = 0
+        if os.path.exists(json_file):
+            try:
+                with open(json_file, "r") as f:
+                    contracts = json.load(f)
+                imported = self.upsert_many(contracts, default_region_id)
+                logger.info(f"Migrated {imported} contracts from {json_file} into the contract store")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Could not migrate contracts from {json_file}: {e}")
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO contract_store_migrations (source) VALUES (?)", (json_file,))
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+
+class BlueprintSnapshot:
+    """Persisted list of the stored contracts that contain a BPO or BPC.
+
+    Kept in sync by applying the same added/removed diff as the contract store, and
+    rewritten only when that diff touches a blueprint contract. Otherwise the file is only
+    touched, so its modification time always tells when it was last synced.
+    """
+
+    def __init__(self, snapshot_file: str):
+        self.snapshot_file = snapshot_file
+        self._contracts: Optional[Dict[int, Dict[str, Any]]] = None
+        self._mtime: Optional[float] = None
+        # Lists handed out by contracts(), reused until the snapshot changes so callers can cache on identity
+        self._views: Dict[Optional[int], List[Dict[str, Any]]] = {}
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.snapshot_file)
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the snapshot was last synced with the contract store, or None if there is none."""
+        try:
+            return time.time() - os.path.getmtime(self.snapshot_file)
+        except OSError:
+            return None
+
+    def _ensure_loaded(self) -> Dict[int, Dict[str, Any]]:
+        """Read the snapshot file, again only if it changed on disk since the last read."""
+        try:
+            mtime = os.path.getmtime(self.snapshot_file)
+        except OSError:
+            mtime = None
+        if self._contracts is None or mtime != self._mtime:
+            contracts: Dict[int, Dict[str, Any]] = {}
+            if mtime is not None:
+                try:
+                    with open(self.snapshot_file, "r") as f:
+                        contracts = {int(c["contract_id"]): c for c in json.load(f)}
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Could not read blueprint contract snapshot {self.snapshot_file}: {e}")
+            self._contracts, self._mtime = contracts, mtime
+            self._views.clear()
+        return self._contracts
+
+    def contracts(self, region_id: Optional[int] = None) -> ExpandedContracts:
+        """Return the blueprint contracts in the snapshot, ordered by contract ID."""
+        contracts = self._ensure_loaded()
+        if region_id not in self._views:
+            self._views[region_id] = ExpandedContracts(
+                contracts[contract_id]
+                for contract_id in sorted(contracts)
+                if region_id is None or contracts[contract_id].get("region_id") == region_id
+            )
+        return self._views[region_id]
+
+    def apply(self, added: Iterable[Dict[str, Any]], removed_ids: Iterable[int]) -> int:
+        """Apply a contract store diff, saving only if a blueprint contract was added or removed.
+
+        Returns:
+            Number of snapshot entries added or removed
+        """
+        contracts = self._ensure_loaded()
+        changes = 0
+        for contract_id in removed_ids:
+            if contracts.pop(int(contract_id), None) is not None:
+                changes += 1
+        for contract in added:
+            if contract_has_blueprint(contract):
+                contracts[int(contract["contract_id"])] = contract
+                changes += 1
+        if changes or not self.exists:
+            self._views.clear()
+            self._save()
+        else:
+            self._touch()
+        return changes
+
+    def rebuild(self, contracts: Iterable[Dict[str, Any]]) -> int:
+        """Replace the snapshot with the blueprint contracts of an iterable of contracts."""
+        self._contracts = {int(c["contract_id"]): c for c in contracts if contract_has_blueprint(c)}
+        self._views.clear()
+        self._save()
+        return len(self._contracts)
+
+    def _touch(self) -> None:
+        """Mark the unchanged snapshot as synced without rewriting it."""
+        try:
+            os.utime(self.snapshot_file)
+            self._mtime = os.path.getmtime(self.snapshot_file)
+        except OSError as e:
+            logger.warning(f"Could not touch blueprint contract snapshot {self.snapshot_file}: {e}")
+
+    def _save(self) -> None:
+        """Write the snapshot atomically."""
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_file) or ".", exist_ok=True)
+            tmp_file = f"{self.snapshot_file}.tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(
+                    [self._contracts[contract_id] for contract_id in sorted(self._contracts)],
+                    f,
+                    separators=(",", ":"),
+                    default=str,
+                )
+            os.replace(tmp_file, self.snapshot_file)
+            self._mtime = os.path.getmtime(self.snapshot_file)
+        except OSError as e:
+            logger.error(f"Failed to save blueprint contract snapshot {self.snapshot_file}: {e}")
+
+
+_contract_store: Optional[ContractStore] = None
+_blueprint_snapshot: Optional[BlueprintSnapshot] = None
+
+
+def get_contract_store() -> ContractStore:
+    """Return the process-wide contract store in the cache database."""
+    global _contract_store
+    if _contract_store is None:
+        _contract_store = ContractStore(os.path.join(CACHE_DIR, CACHE_DB_NAME))
+    return _contract_store
+
+
+def get_blueprint_snapshot() -> BlueprintSnapshot:
+    """Return the process-wide blueprint contract snapshot."""
+    global _blueprint_snapshot
+    if _blueprint_snapshot is None:
+        _blueprint_snapshot = BlueprintSnapshot(BLUEPRINT_CONTRACTS_FILE)
+    return _blueprint_snapshot
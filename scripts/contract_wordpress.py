@@ -9,11 +9,12 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from api_client import fetch_type_icon, validate_input_params, wp_request
+from api_client import fetch_type_icon, validate_input_params, wp_batch_client, wp_request, wp_write_limiter
 from blueprint_processor import update_blueprint_from_asset_in_wp
 from cache_manager import load_blueprint_cache, load_blueprint_type_cache
-from config import WORDPRESS_BATCH_SIZE
 from contract_fetching import fetch_character_contract_items, fetch_corporation_contract_items
+from contract_store import ExpandedContracts, contract_lookup
+from wp_post_index import wp_post_index
 
 logger = logging.getLogger(__name__)
 
@@ -183,19 +184,22 @@ async def update_contract_in_wp(
 
     slug = f"contract-{contract_id}"
     # Check if post exists by slug
-    existing_posts = await wp_request("GET", f"/wp/v2/eve_contract?slug={slug}")
-    existing_post = existing_posts[0] if existing_posts else None
+    if wp_post_index.is_loaded("eve_contract"):
+        existing_post = wp_post_index.get("eve_contract", slug)
+    else:
+        existing_posts = await wp_request("GET", f"/wp/v2/eve_contract?slug={slug}")
+        existing_post = existing_posts[0] if existing_posts else None
 
     # Fetch contract items if we have access token
     contract_items = None
+    expanded_match = None
     if access_token:
         # First try to get items from the expanded contracts cache
         if all_expanded_contracts:
-            for expanded_contract in all_expanded_contracts:
-                if expanded_contract.get("contract_id") == contract_id:
-                    contract_items = expanded_contract.get("items", [])
-                    logger.debug(f"Using cached items for contract {contract_id}: {len(contract_items)} items")
-                    break
+            expanded_match = contract_lookup(all_expanded_contracts).get(contract_id)
+            if expanded_match is not None:
+                contract_items = expanded_match.get("items", [])
+                logger.debug(f"Using cached items for contract {contract_id}: {len(contract_items)} items")
 
         # If not found in cache, fetch individually (fallback)
         if contract_items is None:
@@ -204,12 +208,12 @@ async def update_contract_in_wp(
             elif not for_corp and entity_id:
                 contract_items = await fetch_character_contract_items(entity_id, contract_id, access_token)
 
-    # Get region ID from start location
+    # Get region ID, preferring the stamp from the regional crawl over a location lookup
     from contract_fetching import get_region_from_location
 
-    region_id = None
+    region_id = contract_data.get("region_id") or (expanded_match or {}).get("region_id")
     start_location_id = contract_data.get("start_location_id")
-    if start_location_id:
+    if not region_id and start_location_id:
         region_id = await get_region_from_location(start_location_id)
 
     # Check if contract contains blueprints - only track contracts with blueprints
@@ -324,6 +328,11 @@ async def update_contract_in_wp(
         if "_eve_contract_competing_price" in post_data["meta"]:
             del post_data["meta"]["_eve_contract_competing_price"]
 
+    # Skip the write when nothing but timestamps changed since the stored version
+    if wp_post_index.unchanged("eve_contract", existing_post, post_data):
+        logger.info(f"{post_data['slug']} unchanged, skipping update")
+        return
+
     if existing_post:
         existing_meta = existing_post.get("meta", {})
         # Send alert if this is newly outbid
@@ -351,6 +360,7 @@ async def update_contract_in_wp(
         # Update existing
         post_id = existing_post["id"]
         result = await wp_request("PUT", f"/wp/v2/eve_contract/{post_id}", post_data)
+        wp_post_index.record("eve_contract", result)
     else:
         # Create new (without region_id to avoid ACF protection issues)
         # Add thumbnail from first contract item
@@ -360,6 +370,7 @@ async def update_contract_in_wp(
                 image_url = await fetch_type_icon(first_item_type_id, size=512)
                 post_data["meta"]["_thumbnail_external_url"] = image_url
         result = await wp_request("POST", "/wp/v2/eve_contract", post_data)
+        wp_post_index.record("eve_contract", result)
 
     if result:
         logger.info(f"Updated contract: {contract_id} - {title}")
@@ -415,19 +426,22 @@ async def update_contract_in_wp_with_competition_result(
 
     slug = f"contract-{contract_id}"
     # Check if post exists by slug
-    existing_posts = await wp_request("GET", f"/wp/v2/eve_contract?slug={slug}")
-    existing_post = existing_posts[0] if existing_posts else None
+    if wp_post_index.is_loaded("eve_contract"):
+        existing_post = wp_post_index.get("eve_contract", slug)
+    else:
+        existing_posts = await wp_request("GET", f"/wp/v2/eve_contract?slug={slug}")
+        existing_post = existing_posts[0] if existing_posts else None
 
     # Fetch contract items if we have access token
     contract_items = None
+    expanded_match = None
     if access_token:
         # First try to get items from the expanded contracts cache
         if all_expanded_contracts:
-            for expanded_contract in all_expanded_contracts:
-                if expanded_contract.get("contract_id") == contract_id:
-                    contract_items = expanded_contract.get("items", [])
-                    logger.debug(f"Using cached items for contract {contract_id}: {len(contract_items)} items")
-                    break
+            expanded_match = contract_lookup(all_expanded_contracts).get(contract_id)
+            if expanded_match is not None:
+                contract_items = expanded_match.get("items", [])
+                logger.debug(f"Using cached items for contract {contract_id}: {len(contract_items)} items")
 
         # If not found in cache, fetch individually (fallback)
         if contract_items is None:
@@ -436,12 +450,12 @@ async def update_contract_in_wp_with_competition_result(
             elif not for_corp and entity_id:
                 contract_items = await fetch_character_contract_items(entity_id, contract_id, access_token)
 
-    # Get region ID from start location
+    # Get region ID, preferring the stamp from the regional crawl over a location lookup
     from contract_fetching import get_region_from_location
 
-    region_id = None
+    region_id = contract_data.get("region_id") or (expanded_match or {}).get("region_id")
     start_location_id = contract_data.get("start_location_id")
-    if start_location_id:
+    if not region_id and start_location_id:
         region_id = await get_region_from_location(start_location_id)
 
     # Check if contract contains blueprints - only track contracts with blueprints
@@ -545,6 +559,11 @@ async def update_contract_in_wp_with_competition_result(
         if "_eve_contract_competing_price" in post_data["meta"]:
             del post_data["meta"]["_eve_contract_competing_price"]
 
+    # Skip the write when nothing but timestamps changed since the stored version
+    if wp_post_index.unchanged("eve_contract", existing_post, post_data):
+        logger.info(f"{post_data['slug']} unchanged, skipping update")
+        return
+
     if existing_post:
         existing_meta = existing_post.get("meta", {})
         # Send alert if this is newly outbid
@@ -571,7 +590,8 @@ async def update_contract_in_wp_with_competition_result(
 
         # Update existing
         post_id = existing_post["id"]
-        result = await wp_request("PUT", f"/wp/v2/eve_contract/{post_id}", post_data)
+        result = await wp_batch_client.write("PUT", f"/wp/v2/eve_contract/{post_id}", post_data)
+        wp_post_index.record("eve_contract", result)
     else:
         # Create new (without region_id to avoid ACF protection issues)
         # Add thumbnail from first contract item
@@ -580,7 +600,8 @@ async def update_contract_in_wp_with_competition_result(
             if first_item_type_id:
                 image_url = await fetch_type_icon(first_item_type_id, size=512)
                 post_data["meta"]["_thumbnail_external_url"] = image_url
-        result = await wp_request("POST", "/wp/v2/eve_contract", post_data)
+        result = await wp_batch_client.write("POST", "/wp/v2/eve_contract", post_data)
+        wp_post_index.record("eve_contract", result)
 
     if result:
         logger.info(f"Updated contract: {contract_id} - {title}")
@@ -616,22 +637,12 @@ async def batch_update_contracts_in_wp(
         blueprint_cache = load_blueprint_cache()
 
     logger.info(f"Batch updating {len(contract_updates)} contracts in WordPress...")
+    if all_expanded_contracts is not None and not isinstance(all_expanded_contracts, ExpandedContracts):
+        all_expanded_contracts = ExpandedContracts(all_expanded_contracts)  # Indexed once for all updates below
 
-    # Process contracts in batches to avoid overwhelming WordPress
-    batch_size = WORDPRESS_BATCH_SIZE  # Configurable batch size for WordPress updates
-    total_processed = 0
-
-    for i in range(0, len(contract_updates), batch_size):
-        batch = contract_updates[i : i + batch_size]
-        logger.info(
-            f"Processing batch {i//batch_size + 1}/{(len(contract_updates) + batch_size - 1)//batch_size} "
-            f"({len(batch)} contracts)"
-        )
-
-        # Create tasks for concurrent processing within the batch
-        update_tasks = []
-        for update_info in batch:
-            task = update_contract_in_wp_with_competition_result(
+    async def limited_update(update_info: Dict[str, Any]) -> None:
+        async with wp_write_limiter.slot():
+            await update_contract_in_wp_with_competition_result(
                 update_info["contract"]["contract_id"],
                 update_info["contract"],
                 update_info["is_outbid"],
@@ -642,15 +653,10 @@ async def batch_update_contracts_in_wp(
                 blueprint_cache,
                 all_expanded_contracts,
             )
-            update_tasks.append(task)
-
-        # Execute batch concurrently
-        await asyncio.gather(*update_tasks, return_exceptions=True)
-        total_processed += len(batch)
 
-        # Small delay between batches to be respectful to WordPress
-        if i + batch_size < len(contract_updates):
-            await asyncio.sleep(0.5)
+    # Concurrency against WordPress is tuned by the shared AIMD write limiter
+    await asyncio.gather(*(limited_update(update_info) for update_info in contract_updates), return_exceptions=True)
+    total_processed = len(contract_updates)
 
     logger.info(f"Completed batch update of {total_processed} contracts")
 
@@ -675,6 +681,7 @@ async def cleanup_contract_posts(allowed_corp_ids: set, allowed_issuer_ids: set)
 
     contracts = await wp_request("GET", "/wp/v2/eve_contract", {"per_page": 100})
     if contracts:
+        to_delete = []
         for contract in contracts:
             meta = contract.get("meta", {})
             status = meta.get("_eve_contract_status")
@@ -702,8 +709,15 @@ async def cleanup_contract_posts(allowed_corp_ids: set, allowed_issuer_ids: set)
                 logger.info(f"EXPIRED CONTRACT TO DELETE MANUALLY: {title} (ID: {contract_id})")
 
             if should_delete:
-                result = await wp_request("DELETE", f"/wp/v2/eve_contract/{contract['id']}", {"force": True})
-                if result:
-                    logger.info(f"Deleted contract: {contract_id}")
-                else:
-                    logger.error(f"Failed to delete contract: {contract_id}")
+                to_delete.append((contract, contract_id))
+
+        # Deletes go out in /batch/v1 calls of up to 25
+        results = await wp_batch_client.write_many(
+            [("DELETE", f"/wp/v2/eve_contract/{contract['id']}", {"force": True}) for contract, _ in to_delete]
+        )
+        for (contract, contract_id), result in zip(to_delete, results):
+            if result and not isinstance(result, Exception):
+                wp_post_index.forget("eve_contract", contract.get("slug", f"contract-{contract_id}"))
+                logger.info(f"Deleted contract: {contract_id}")
+            else:
+                logger.error(f"Failed to delete contract: {contract_id}")
@@ -7,18 +7,19 @@ Handles processing of corporation-specific data.
 import argparse
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from api_client import fetch_esi, fetch_public_esi, wp_request
+from api_client import fetch_esi, fetch_public_esi, iter_esi_pages, wp_request
 from blueprint_processor import (
-    extract_blueprints_from_assets,
     extract_blueprints_from_contracts,
     extract_blueprints_from_industry_jobs,
+    process_blueprints_from_asset_pages,
     update_blueprint_from_asset_in_wp,
     update_blueprint_in_wp,
 )
 from config import ALLOWED_CORPORATIONS, SKIP_CORPORATION_ASSETS
 from data_processors import process_blueprints_parallel
+from wp_post_index import wp_post_index
 
 logger = logging.getLogger(__name__)
 
@@ -114,22 +115,39 @@ async def fetch_corporation_industry_jobs(corp_id: int, access_token: str) -> Op
     return await fetch_esi(endpoint, corp_id, access_token)
 
 
-async def fetch_corporation_assets(corp_id: int, access_token: str) -> Optional[Dict[str, Any]]:
+async def fetch_corporation_assets(corp_id: int, access_token: str) -> List[Dict[str, Any]]:
     """
     Fetch corporation assets from ESI.
 
     Retrieves the complete list of items owned by the corporation across all locations,
-    including items in stations, structures, and ships.
+    including items in stations, structures, and ships. All X-Pages pages are fetched
+    concurrently and concatenated.
 
     Args:
         corp_id: EVE corporation ID to fetch assets for.
         access_token: Valid OAuth2 access token for authentication.
 
     Returns:
-        Optional[Dict[str, Any]]: Assets data array if successful.
+        List[Dict[str, Any]]: Assets data array from every page.
     """
-    endpoint = f"/corporations/{corp_id}/assets/"
-    return await fetch_esi(endpoint, None, access_token)  # Corp endpoint doesn't need char_id
+    assets = []
+    async for page in iter_corporation_assets(corp_id, access_token):
+        assets.extend(page)
+    return assets
+
+
+def iter_corporation_assets(corp_id: int, access_token: str) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream corporation asset pages from ESI as they arrive.
+
+    Args:
+        corp_id: EVE corporation ID to fetch assets for.
+        access_token: Valid OAuth2 access token for authentication.
+
+    Returns:
+        AsyncIterator[List[Dict[str, Any]]]: Async iterator over asset pages.
+    """
+    return iter_esi_pages(f"/corporations/{corp_id}/assets/", None, access_token)  # Corp endpoint doesn't need char_id
 
 
 async def fetch_corporation_logo(corp_id: int) -> Optional[Dict[str, Any]]:
@@ -328,7 +346,7 @@ async def process_corporation_blueprints_from_assets(
     """
     Process corporation blueprints from corporation assets.
 
-    Extracts blueprints from corporation asset lists and processes them.
+    Streams asset pages and processes the blueprints on each page while later pages download.
     Can be disabled via SKIP_CORPORATION_ASSETS configuration.
 
     Args:
@@ -345,28 +363,21 @@ async def process_corporation_blueprints_from_assets(
         logger.info("Skipping corporation assets processing (SKIP_CORPORATION_ASSETS=true)")
         return
 
-    corp_assets = await fetch_corporation_assets(corp_id, access_token)
-    if corp_assets:
-        logger.info(f"Fetched {len(corp_assets)} corporation assets")
-        asset_blueprints = await extract_blueprints_from_assets(corp_assets, "corp", corp_id, access_token)
-        if asset_blueprints:
-            logger.info(f"Corporation asset blueprints: {len(asset_blueprints)} items")
-            # Process blueprints in parallel
-            await process_blueprints_parallel(
-                asset_blueprints,
-                update_blueprint_from_asset_in_wp,
-                wp_post_id_cache,
-                corp_id,
-                access_token,
-                blueprint_cache,
-                location_cache,
-                structure_cache,
-                failed_structures,
-            )
-        else:
-            logger.info("No blueprints found in corporation assets")
+    blueprint_count = await process_blueprints_from_asset_pages(
+        iter_corporation_assets(corp_id, access_token),
+        "corp",
+        corp_id,
+        access_token,
+        wp_post_id_cache,
+        blueprint_cache,
+        location_cache,
+        structure_cache,
+        failed_structures,
+    )
+    if blueprint_count:
+        logger.info(f"Corporation asset blueprints: {blueprint_count} items")
     else:
-        logger.info("No corporation assets found or access denied")
+        logger.info("No blueprints found in corporation assets")
 
 
 async def process_corporation_blueprints_from_industry_jobs(
@@ -514,12 +525,12 @@ async def process_corporation_contracts(
         all_expanded_contracts: Optional list of pre-expanded contracts for competition analysis.
     """
     from contract_processor import update_contract_in_wp
-    from contract_expansion import fetch_and_expand_all_forge_contracts
+    from contract_expansion import load_blueprint_contracts
 
-    # Use provided all_expanded_contracts or fetch if not provided
+    # Use provided all_expanded_contracts or load the blueprint snapshot if not provided
     if all_expanded_contracts is None:
-        logger.info("No expanded contracts provided, fetching for corporation contract processing...")
-        all_expanded_contracts = await fetch_and_expand_all_forge_contracts()
+        logger.info("No expanded contracts provided, loading blueprint contracts for corporation contracts...")
+        all_expanded_contracts = await load_blueprint_contracts()
 
     corp_contracts = await fetch_corporation_contracts(corp_id, access_token)
     if corp_contracts:
@@ -567,8 +578,11 @@ async def update_corporation_in_wp(corp_id: int, corp_data: Dict[str, Any]) -> N
     """
     slug = f"corporation-{corp_id}"
     # Check if post exists by slug
-    existing_posts = await wp_request("GET", f"/wp/v2/eve_corporation?slug={slug}")
-    existing_post = existing_posts[0] if existing_posts else None
+    if wp_post_index.is_loaded("eve_corporation"):
+        existing_post = wp_post_index.get("eve_corporation", slug)
+    else:
+        existing_posts = await wp_request("GET", f"/wp/v2/eve_corporation?slug={slug}")
+        existing_post = existing_posts[0] if existing_posts else None
 
     post_data = {
         "title": corp_data.get("name", f"Corporation {corp_id}"),
@@ -590,13 +604,20 @@ async def update_corporation_in_wp(corp_id: int, corp_data: Dict[str, Any]) -> N
     # Remove null values
     post_data["meta"] = {k: v for k, v in post_data["meta"].items() if v is not None}
 
+    # Skip the write when nothing but timestamps changed since the stored version
+    if wp_post_index.unchanged("eve_corporation", existing_post, post_data):
+        logger.info(f"{post_data['slug']} unchanged, skipping update")
+        return
+
     if existing_post:
         # Update existing
         post_id = existing_post["id"]
         result = await wp_request("PUT", f"/wp/v2/eve_corporation/{post_id}", post_data)
+        wp_post_index.record("eve_corporation", result)
     else:
         # Create new
         result = await wp_request("POST", "/wp/v2/eve_corporation", post_data)
+        wp_post_index.record("eve_corporation", result)
 
     if result:
         logger.info(f"Updated corporation: {corp_data.get('name', corp_id)}")
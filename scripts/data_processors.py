@@ -18,11 +18,13 @@ from api_client import (
     ESIRequestError,
     WordPressAuthError,
     WordPressRequestError,
+    blueprint_limiter,
     fetch_esi,
     fetch_public_esi,
     fetch_type_icon,
     format_error_message,
     log_audit_event,
+    wp_batch_client,
     wp_request,
 )
 from cache_manager import (
@@ -40,6 +42,7 @@ from cache_manager import (
     set_cached_wp_post_id,
 )
 from config import WP_APP_PASSWORD, WP_USERNAME
+from wp_post_index import wp_post_index
 
 logger = logging.getLogger(__name__)
 
@@ -67,8 +70,8 @@ async def process_blueprints_parallel(
     Process multiple blueprints concurrently using asyncio for improved performance.
 
     Executes blueprint update operations in parallel to reduce total processing time
-    when handling large numbers of blueprints. Uses asyncio.gather with a semaphore
-    to limit concurrent requests and prevent overwhelming the WordPress API.
+    when handling large numbers of blueprints. Uses asyncio.gather under the shared
+    adaptive blueprint limiter to avoid overwhelming the ESI and WordPress APIs.
 
     Args:
         blueprints: List of blueprint data dictionaries from ESI API.
@@ -83,8 +86,8 @@ async def process_blueprints_parallel(
 
     Note:
         Exceptions during individual blueprint processing are caught and logged
-        but don't stop processing of other blueprints. Limits concurrency to 10
-        simultaneous requests to avoid overwhelming the API.
+        but don't stop processing of other blueprints. Concurrency follows the
+        AIMD-tuned blueprint_limiter rather than a fixed cap.
     """
     import asyncio
 
@@ -93,11 +96,8 @@ async def process_blueprints_parallel(
 
     logger.info(f"Starting async processing of {total_blueprints} blueprints")
 
-    # Semaphore to limit concurrent requests to prevent overwhelming the API
-    semaphore = asyncio.Semaphore(10)  # Limit to 10 concurrent requests
-
     async def limited_update_func(bp):
-        async with semaphore:
+        async with blueprint_limiter.slot():
             return await update_func(bp, wp_post_id_cache, *args, **kwargs)
 
     tasks = [limited_update_func(bp) for bp in blueprints]
@@ -164,6 +164,11 @@ async def update_or_create_blueprint_post(
             image_url = await fetch_type_icon(type_id, size=512)
             post_data["meta"]["_thumbnail_external_url"] = image_url
 
+    # Skip the write when nothing but timestamps changed since the stored version
+    if wp_post_index.unchanged("eve_blueprint", existing_post, post_data):
+        logger.info(f"{post_data['slug']} unchanged, skipping update")
+        return
+
     if existing_post:
         # Check if data has changed before updating
         existing_meta = existing_post.get("meta", {})
@@ -186,6 +191,7 @@ async def update_or_create_blueprint_post(
         post_id = existing_post["id"]
         try:
             result = await wp_request("PUT", f"/wp/v2/eve_blueprint/{post_id}", post_data)
+            wp_post_index.record("eve_blueprint", result)
             if result:
                 logger.info(f"Updated blueprint: {item_id}")
                 log_audit_event("BLUEPRINT_UPDATE", str(char_id), {"item_id": item_id, "post_id": post_id})
@@ -197,6 +203,7 @@ async def update_or_create_blueprint_post(
         # Create new
         try:
             new_post = await wp_request("POST", "/wp/v2/eve_blueprint", post_data)
+            wp_post_index.record("eve_blueprint", new_post)
             if new_post:
                 set_cached_wp_post_id(wp_post_id_cache, "eve_blueprint", item_id, new_post["id"])
                 logger.info(f"Created new blueprint: {item_id}")
@@ -227,8 +234,11 @@ async def update_character_in_wp(char_id: int, char_data: Dict[str, Any]) -> Non
     slug = f"character-{char_id}"
     # Check if post exists by slug
     try:
-        existing_posts = await wp_request("GET", f"/wp/v2/eve_character?slug={slug}")
-        existing_post = existing_posts[0] if existing_posts else None
+        if wp_post_index.is_loaded("eve_character"):
+            existing_post = wp_post_index.get("eve_character", slug)
+        else:
+            existing_posts = await wp_request("GET", f"/wp/v2/eve_character?slug={slug}")
+            existing_post = existing_posts[0] if existing_posts else None
     except (WordPressAuthError, WordPressRequestError) as e:
         logger.error(f"Failed to fetch existing character post for {char_id}: {e}")
         return
@@ -271,11 +281,17 @@ async def update_character_in_wp(char_id: int, char_data: Dict[str, Any]) -> Non
         else:
             logger.info(f"Portrait unchanged for character: {char_data['name']}")
 
+    # Skip the write when nothing but timestamps changed since the stored version
+    if wp_post_index.unchanged("eve_character", existing_post, post_data):
+        logger.info(f"{post_data['slug']} unchanged, skipping update")
+        return
+
     if existing_post:
         # Update existing
         post_id = existing_post["id"]
         try:
             result = await wp_request("PUT", f"/wp/v2/eve_character/{post_id}", post_data)
+            wp_post_index.record("eve_character", result)
             if result:
                 logger.info(f"Updated character: {char_data['name']}")
                 log_audit_event("CHARACTER_UPDATE", str(char_id), {"name": char_data["name"], "post_id": post_id})
@@ -287,6 +303,7 @@ async def update_character_in_wp(char_id: int, char_data: Dict[str, Any]) -> Non
         # Create new
         try:
             result = await wp_request("POST", "/wp/v2/eve_character", post_data)
+            wp_post_index.record("eve_character", result)
             if result:
                 logger.info(f"Created character: {char_data['name']}")
                 log_audit_event("CHARACTER_CREATE", str(char_id), {"name": char_data["name"], "post_id": result["id"]})
@@ -321,8 +338,11 @@ async def update_character_skills_in_wp(char_id: int, skills_data: Dict[str, Any
     slug = f"character-{char_id}"
     # Check if post exists by slug
     try:
-        existing_posts = await wp_request("GET", f"/wp/v2/eve_character?slug={slug}")
-        existing_post = existing_posts[0] if existing_posts else None
+        if wp_post_index.is_loaded("eve_character"):
+            existing_post = wp_post_index.get("eve_character", slug)
+        else:
+            existing_posts = await wp_request("GET", f"/wp/v2/eve_character?slug={slug}")
+            existing_post = existing_posts[0] if existing_posts else None
     except (WordPressAuthError, WordPressRequestError) as e:
         logger.error(f"Failed to fetch character post for skills update {char_id}: {e}")
         return
@@ -336,8 +356,12 @@ async def update_character_skills_in_wp(char_id: int, skills_data: Dict[str, Any
                 "_eve_last_updated": datetime.now(timezone.utc).isoformat(),
             }
         }
+        if wp_post_index.unchanged("eve_character", existing_post, post_data, hash_field="_eve_skills_hash"):
+            logger.info(f"Skills for character {char_id} unchanged, skipping update")
+            return
         try:
             result = await wp_request("PUT", f"/wp/v2/eve_character/{post_id}", post_data)
+            wp_post_index.record("eve_character", result)
             if result:
                 logger.info(f"Updated skills for character {char_id}")
             else:
@@ -526,7 +550,12 @@ async def _find_existing_blueprint_post(item_id: int, wp_post_id_cache: Dict[str
     cached_post_id = get_cached_wp_post_id(wp_post_id_cache, "eve_blueprint", item_id)
 
     existing_post = None
-    if cached_post_id:
+    if wp_post_index.is_loaded("eve_blueprint"):
+        # Sync-start index already holds every blueprint post
+        existing_post = wp_post_index.get("eve_blueprint", slug)
+        if existing_post:
+            set_cached_wp_post_id(wp_post_id_cache, "eve_blueprint", item_id, existing_post["id"])
+    elif cached_post_id:
         # Use direct post ID lookup
         try:
             existing_post = await wp_request("GET", f"/wp/v2/eve_blueprint/{cached_post_id}")
@@ -640,9 +669,10 @@ async def update_blueprint_in_wp(
         if existing_post:
             logger.info(f"Deleting WordPress post for blueprint {item_id} (type no longer exists)")
             try:
-                result = await wp_request("DELETE", f"/wp/v2/eve_blueprint/{existing_post['id']}")
+                result = await wp_batch_client.write("DELETE", f"/wp/v2/eve_blueprint/{existing_post['id']}")
                 if result:
                     # Remove from cache
+                    wp_post_index.forget("eve_blueprint", f"blueprint-{item_id}")
                     wp_post_id_cache["eve_blueprint"].pop(str(item_id), None)
                     save_wp_post_id_cache(wp_post_id_cache)
                     log_audit_event("BLUEPRINT_DELETE", str(char_id), {"item_id": item_id, "reason": "type_deleted"})
@@ -14,8 +14,8 @@ from typing import Any, Dict, List, Optional, Tuple
 from api_client import cleanup_session, fetch_esi, refresh_token, send_email
 from blueprint_processor import (
     cleanup_blueprint_posts,
-    extract_blueprints_from_assets,
     extract_blueprints_from_industry_jobs,
+    process_blueprints_from_asset_pages,
     update_blueprint_from_asset_in_wp,
     update_blueprint_in_wp,
 )
@@ -26,7 +26,12 @@ from cache_manager import (
     load_structure_cache,
     load_wp_post_id_cache,
 )
-from character_processor import fetch_character_skills, process_character_planets, update_character_skills_in_wp
+from character_processor import (
+    fetch_character_skills,
+    iter_character_assets,
+    process_character_planets,
+    update_character_skills_in_wp,
+)
 from config import ALLOWED_CORP_IDS, CACHE_DIR, LOG_FILE, LOG_LEVEL
 from contract_processor import cleanup_contract_posts, process_character_contracts
 from data_processors import fetch_character_data, update_character_in_wp
@@ -192,20 +197,17 @@ async def process_asset_blueprints(
         structure_cache: Structure name cache.
         failed_structures: Failed structure cache.
     """
-    assets = await fetch_esi(f"/characters/{char_id}/assets", char_id, access_token)
-    if assets:
-        asset_blueprints = await extract_blueprints_from_assets(assets, "char", char_id, access_token)
-        for bp in asset_blueprints:
-            await update_blueprint_from_asset_in_wp(
-                bp,
-                wp_post_id_cache,
-                char_id,
-                access_token,
-                blueprint_cache,
-                location_cache,
-                structure_cache,
-                failed_structures,
-            )
+    await process_blueprints_from_asset_pages(
+        iter_character_assets(char_id, access_token),
+        "char",
+        char_id,
+        access_token,
+        wp_post_id_cache,
+        blueprint_cache,
+        location_cache,
+        structure_cache,
+        failed_structures,
+    )
 
 
 async def process_job_blueprints(
@@ -442,7 +444,7 @@ async def cleanup_old_posts(allowed_corp_ids, allowed_issuer_ids):
     logger.info("Starting cleanup of old posts...")
 
     await cleanup_contract_posts(allowed_corp_ids, allowed_issuer_ids)
-    cleanup_blueprint_posts()
+    await cleanup_blueprint_posts()
 
     logger.info("Cleanup completed.")
 
@@ -15,7 +15,18 @@ from typing import Any, Dict, List, Tuple
 import psutil
 from dotenv import load_dotenv
 
-from api_client import api_call_counter, cleanup_session, get_session, refresh_token
+from api_client import (
+    adaptive_limiters,
+    api_call_counter,
+    cleanup_session,
+    esi_etag_store,
+    esi_governor,
+    esi_single_flight,
+    get_session,
+    refresh_token,
+    wp_batch_client,
+    wp_rate_limiter,
+)
 from cache_manager import load_wp_post_id_cache
 from config import CHARACTER_PROCESSING_CONCURRENCY, LOG_FILE, LOG_LEVEL, TOKENS_FILE, WORDPRESS_BATCH_SIZE
 from corporation_processor import process_corporation_data
@@ -27,7 +38,10 @@ from fetch_data import (
     initialize_caches,
     process_character_data,
 )
+from sde_store import sde_store
+from universe_topology import universe_topology
 from utils import parse_arguments
+from wp_post_index import wp_post_index
 
 load_dotenv()
 
@@ -176,6 +190,15 @@ async def log_performance_metrics(
         "cache_hit_rate": cache_stats.get("hit_rate", 0),
         "cache_hits": cache_stats.get("hits", 0),
         "cache_misses": cache_stats.get("misses", 0),
+        "esi_etag": esi_etag_store.get_stats(),
+        "esi_single_flight": esi_single_flight.get_stats(),
+        "esi_governor": esi_governor.get_stats(),
+        "adaptive_limiters": {limiter.name: limiter.get_stats() for limiter in adaptive_limiters},
+        "sde_store": sde_store.get_stats(),
+        "universe_topology": universe_topology.get_stats(),
+        "wp_post_index": wp_post_index.get_stats(),
+        "wp_batch": wp_batch_client.get_stats(),
+        "wp_rate_limiter": wp_rate_limiter.get_stats(),
         "character_concurrency": CHARACTER_PROCESSING_CONCURRENCY,
         "wordpress_batch_size": WORDPRESS_BATCH_SIZE,
     }
@@ -295,6 +318,9 @@ async def main() -> None:
         start_time = time.time()
         args = parse_arguments()
         clear_log_file()
+        if args.respect_expiry:
+            esi_etag_store.respect_expiry = True
+            logger.info("Respecting ESI Expires headers: unexpired responses will be served from cache")
         
         # Update initialization stage
         stages["initialization"]["status"] = "running"
@@ -359,9 +385,17 @@ async def main() -> None:
         update_sync_status("processing", 35.0, "Processing corporation and character data...", "", stages)
         
         process_start = time.time()
+        # Index existing posts once so the updaters don't look each one up by slug
+        await wp_post_index.load()
         await process_all_data(corp_members, caches, args, tokens)
         process_time = time.time() - process_start
         logger.info(f"Data processing completed in {process_time:.2f}s")
+        skipped_writes = wp_post_index.get_stats()["skipped_writes"]
+        if skipped_writes:
+            logger.info(
+                "Skipped unchanged WordPress writes: "
+                + ", ".join(f"{post_type}={count}" for post_type, count in sorted(skipped_writes.items()))
+            )
         
         stages["processing"]["progress"] = 90
         stages["processing"]["message"] = f"Data processing completed in {process_time:.2f}s"
@@ -417,6 +451,7 @@ async def main() -> None:
         from cache_manager import flush_pending_saves, log_cache_performance
 
         flush_pending_saves()
+        esi_etag_store.flush()
         log_cache_performance()
         cleanup_pid_file()
         # Don't cleanup status file immediately - let it persist for a bit so dashboard can show final status
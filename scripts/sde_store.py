@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+EVE Observer Static Data Store
+Imports a local Static Data Export (SDE) dump into an indexed SQLite file and
+serves type, group and universe topology lookups from it.
+
+The importer reads the CSV flavour of the SDE published by Fuzzwork
+(invTypes, invGroups, invCategories, staStations, mapSolarSystems,
+mapConstellations, mapRegions; plain or .bz2 compressed):
+
+    python sde_store.py import /path/to/sde_csv
+
+Lookups return None for IDs the dump does not know (e.g. types or systems
+added after it was built), so callers can fall back to ESI.
+"""
+
+import argparse
+import bz2
+import csv
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from config import SDE_DB_FILE
+
+logger = logging.getLogger(__name__)
+
+BLUEPRINT_CATEGORY_ID = 9
+
+SDE_TABLES = {
+    "invCategories": ("type_categories", {"categoryID": "category_id", "categoryName": "name"}),
+    "invGroups": ("type_groups", {"groupID": "group_id", "categoryID": "category_id", "groupName": "name"}),
+    "invTypes": ("types", {"typeID": "type_id", "groupID": "group_id", "typeName": "name"}),
+    "mapRegions": ("regions", {"regionID": "region_id", "regionName": "name"}),
+    "mapConstellations": (
+        "constellations",
+        {"constellationID": "constellation_id", "regionID": "region_id", "constellationName": "name"},
+    ),
+    "mapSolarSystems": (
+        "solar_systems",
+        {
+            "solarSystemID": "system_id",
+            "constellationID": "constellation_id",
+            "regionID": "region_id",
+            "solarSystemName": "name",
+        },
+    ),
+    "staStations": (
+        "stations",
+        {"stationID": "station_id", "solarSystemID": "system_id", "regionID": "region_id", "stationName": "name"},
+    ),
+}
+
+SCHEMA = """
+CREATE TABLE type_categories (category_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE type_groups (group_id INTEGER PRIMARY KEY, category_id INTEGER, name TEXT);
+CREATE TABLE types (type_id INTEGER PRIMARY KEY, group_id INTEGER, category_id INTEGER, name TEXT);
+CREATE TABLE regions (region_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE constellations (constellation_id INTEGER PRIMARY KEY, region_id INTEGER, name TEXT);
+CREATE TABLE solar_systems (system_id INTEGER PRIMARY KEY, constellation_id INTEGER, region_id INTEGER, name TEXT);
+CREATE TABLE stations (station_id INTEGER PRIMARY KEY, system_id INTEGER, region_id INTEGER, name TEXT);
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _open_sde_csv(source_dir: str, name: str):
+    """Open an SDE CSV file, accepting plain or bz2-compressed dumps."""
+    for filename, opener in ((f"{name}.csv", open), (f"{name}.csv.bz2", bz2.open)):
+        path = os.path.join(source_dir, filename)
+        if os.path.exists(path):
+            return opener(path, "rt", encoding="utf-8", newline="")
+    raise FileNotFoundError(f"SDE file {name}.csv not found in {source_dir}")
+
+
+def _read_rows(source_dir: str, name: str, columns: Dict[str, str]) -> Iterator[tuple]:
+    """Yield the selected columns of an SDE CSV file, with "None" mapped to NULL."""
+    with _open_sde_csv(source_dir, name) as f:
+        for row in csv.DictReader(f):
+            yield tuple(None if row[column] in ("", "None") else row[column] for column in columns)
+
+
+def import_sde(source_dir: str, db_file: str = SDE_DB_FILE) -> Dict[str, int]:
+    """Build the SDE store from a directory of SDE CSV files.
+
+    The database is built in a temporary file and swapped in atomically, so a
+    running process never sees a half-imported store.
+
+    Args:
+        source_dir: Directory containing the SDE CSV dumps
+        db_file: Destination SQLite file
+
+    Returns:
+        Number of rows imported per table
+
+    Raises:
+        FileNotFoundError: If a required SDE file is missing
+    """
+    os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+    tmp_file = f"{db_file}.tmp"
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    counts = {}
+    conn = sqlite3.connect(tmp_file)
+    try:
+        conn.executescript(SCHEMA)
+        for sde_name, (table, columns) in SDE_TABLES.items():
+            if table == "types":
+                continue  # Imported below, denormalized with its category
+            placeholders = ",".join("?" * len(columns))
+            conn.executemany(
+                f"INSERT INTO {table} ({','.join(columns.values())}) VALUES ({placeholders})",
+                _read_rows(source_dir, sde_name, columns),
+            )
+            counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+        group_categories = dict(conn.execute("SELECT group_id, category_id FROM type_groups"))
+        conn.executemany(
+            "INSERT INTO types (type_id, group_id, category_id, name) VALUES (?, ?, ?, ?)",
+            (
+                (type_id, group_id, group_categories.get(int(group_id)) if group_id else None, name)
+                for type_id, group_id, name in _read_rows(source_dir, "invTypes", SDE_TABLES["invTypes"][1])
+            ),
+        )
+        counts["types"] = conn.execute("SELECT COUNT(*) FROM types").fetchone()[0]
+
+        conn.executemany(
+            "INSERT INTO metadata (key, value) VALUES (?, ?)",
+            [("imported_at", str(int(time.time()))), ("source", os.path.abspath(source_dir))],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_file, db_file)
+    logger.info(f"Imported SDE from {source_dir} into {db_file}: {counts}")
+    return counts
+
+
+class SDEStore:
+    """Read-only lookups over an imported SDE database.
+
+    The database is opened lazily on first use; if it doesn't exist every lookup
+    returns None and callers fall back to ESI. All lookups are primary-key reads
+    memoized in memory, so repeated lookups never touch the disk.
+    """
+
+    def __init__(self, db_file: str = SDE_DB_FILE):
+        self.db_file = db_file
+        self._conn: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self._lock = threading.Lock()
+        self._memo: Dict[tuple, Any] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    @property
+    def available(self) -> bool:
+        """Whether an imported SDE database is present."""
+        return self._connection() is not None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the database read-only on first use."""
+        if not self._opened:
+            self._opened = True
+            if os.path.exists(self.db_file):
+                try:
+                    self._conn = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True, check_same_thread=False)
+                    logger.info(f"Using SDE store {self.db_file}")
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to open SDE store {self.db_file}: {e}")
+        return self._conn
+
+    def _lookup(self, query: str, key: int) -> Optional[tuple]:
+        """Run a single-row primary key lookup, memoizing the result."""
+        if not key:
+            return None
+        key = int(key)
+        memo_key = (query, key)
+        if memo_key in self._memo:
+            row = self._memo[memo_key]
+        else:
+            conn = self._connection()
+            if conn is None:
+                return None
+            with self._lock:
+                row = conn.execute(query, (key,)).fetchone()
+            self._memo[memo_key] = row
+        self.stats["hits" if row else "misses"] += 1
+        return row
+
+    def reload(self) -> None:
+        """Drop the open connection and memoized lookups, e.g. after a re-import."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._opened = False
+            self._memo.clear()
+
+    def get_type(self, type_id: int) -> Optional[Dict[str, Any]]:
+        """Return ESI-shaped type data ({"type_id", "name", "group_id", "category_id"}) or None."""
+        row = self._lookup("SELECT name, group_id, category_id FROM types WHERE type_id = ?", type_id)
+        if row is None:
+            return None
+        return {"type_id": int(type_id), "name": row[0], "group_id": row[1], "category_id": row[2]}
+
+    def type_name(self, type_id: int) -> Optional[str]:
+        """Return the type name, or None if the type is unknown."""
+        type_data = self.get_type(type_id)
+        return type_data["name"] if type_data else None
+
+    def is_blueprint(self, type_id: int) -> Optional[bool]:
+        """Return whether the type is in the Blueprint category, or None if the type is unknown."""
+        type_data = self.get_type(type_id)
+        return type_data["category_id"] == BLUEPRINT_CATEGORY_ID if type_data else None
+
+    def region_of_system(self, system_id: int) -> Optional[int]:
+        """Return the region containing a solar system."""
+        row = self._lookup("SELECT region_id FROM solar_systems WHERE system_id = ?", system_id)
+        return row[0] if row else None
+
+    def region_of_location(self, location_id: int) -> Optional[int]:
+        """Return the region of an NPC station or solar system.
+
+        Player structures are not part of the SDE and always return None.
+        """
+        row = self._lookup("SELECT region_id FROM stations WHERE station_id = ?", location_id)
+        if row:
+            return row[0]
+        return self.region_of_system(location_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return lookup statistics."""
+        return {**self.stats, "available": self._conn is not None}
+
+
+# Process-wide store shared by blueprint classification, contract expansion and region resolution
+sde_store = SDEStore()
+
+
+def main() -> None:
+    """Command line entry point for importing an SDE dump."""
+    parser = argparse.ArgumentParser(description="Manage the local EVE Static Data Export store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Import SDE CSV files into the local store")
+    import_parser.add_argument("source_dir", help="Directory containing the SDE CSV dump")
+    import_parser.add_argument("--db", default=SDE_DB_FILE, help="Destination SQLite file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.command == "import":
+        counts = import_sde(args.source_dir, args.db)
+        for table, count in counts.items():
+            print(f"{table}: {count}")
+
+
+if __name__ == "__main__":
+    main()
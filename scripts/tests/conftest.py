@@ -12,3 +12,58 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "unit: Unit tests")
     config.addinivalue_line("markers", "integration: Integration tests")
     config.addinivalue_line("markers", "slow: Slow running tests")
+
+
+@pytest.fixture(autouse=True)
+def reset_esi_governor():
+    """Keep 420/429 pauses recorded by one test from throttling the next."""
+    from api_client import esi_governor
+
+    esi_governor.reset()
+    yield
+    esi_governor.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolate_universe_topology(tmp_path, monkeypatch):
+    """Keep region lookups from reading the real topology cache or downloading the universe."""
+    from universe_topology import UniverseTopology
+
+    monkeypatch.setattr(
+        "contract_fetching.universe_topology", UniverseTopology(str(tmp_path / "universe_topology.json"), preload=False)
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolate_cache_store(tmp_path, monkeypatch):
+    """Keep tests from creating or writing the SQLite cache store in the real cache directory."""
+    from cache_store import SQLiteCacheStore
+
+    store = SQLiteCacheStore(str(tmp_path / "eve_cache.sqlite"))
+    monkeypatch.setattr("cache_store.get_cache_store", lambda cache_dir=None: store)
+    yield
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def isolate_contract_store(tmp_path, monkeypatch):
+    """Keep tests from syncing contracts into the real cache database and blueprint snapshot."""
+    from contract_store import BlueprintSnapshot, ContractStore
+
+    store = ContractStore(str(tmp_path / "eve_cache.sqlite"))
+    monkeypatch.setattr("contract_store._contract_store", store)
+    monkeypatch.setattr(
+        "contract_store._blueprint_snapshot", BlueprintSnapshot(str(tmp_path / "blueprint_contracts_forge.json"))
+    )
+    yield
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_wp_post_index():
+    """Keep posts indexed by one test from answering slug lookups in the next."""
+    from wp_post_index import wp_post_index
+
+    wp_post_index.clear()
+    yield
+    wp_post_index.clear()
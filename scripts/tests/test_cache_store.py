@@ -0,0 +1,48 @@
+"""Tests for cache_store.py."""
+import gzip
+import json
+import os
+import sys
+import time
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache_store import SQLiteCacheStore, load_file_cache, save_file_cache
+
+
+class TestSQLiteCacheStore:
+    """Test the SQLite cache backend."""
+
+    def test_replace_all_writes_only_changes(self, tmp_path):
+        store = SQLiteCacheStore(str(tmp_path / "eve_cache.sqlite"))
+        cache = {str(i): f"Location {i}" for i in range(500)}
+        assert store.replace_all("location_names", cache) == 500
+
+        cache["42"] = "Renamed"
+        cache["500"] = "New location"
+        del cache["7"]
+        written_before = store.stats["rows_written"]
+
+        assert store.replace_all("location_names", cache) == 3
+        assert store.stats["rows_written"] - written_before == 2
+        assert SQLiteCacheStore(store.db_file).get_all("location_names") == cache
+
+    def test_dict_values_expire(self, tmp_path):
+        store = SQLiteCacheStore(str(tmp_path / "eve_cache.sqlite"))
+        store.put_many("type_data_cache", {"587": {"name": "Rifter"}, "34": "Tritanium"}, ttl_seconds=0.01)
+        time.sleep(0.02)
+
+        assert store.get("type_data_cache", "587") is None
+        assert store.get_all("type_data_cache") == {"34": "Tritanium"}
+        assert store.stats["rows_expired"] == 1
+
+    def test_legacy_json_migrated_once(self, tmp_path):
+        cache_file = str(tmp_path / "blueprint_names.json")
+        with gzip.open(cache_file, "wt", encoding="utf-8") as f:
+            json.dump({"1001": "Rifter Blueprint"}, f)
+
+        assert load_file_cache(cache_file) == {"1001": "Rifter Blueprint"}
+
+        save_file_cache(cache_file, {})
+        assert load_file_cache(cache_file) == {}  # Deleted entries are not re-imported from the JSON file
@@ -0,0 +1,117 @@
+"""Tests for contract_competition.py functions."""
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_competition import CompetitionIndex, check_contract_competition, check_contracts_competition_concurrent
+
+FORGE = 10000002
+JITA_44 = 60003760
+
+
+def make_contract(contract_id, price, type_id=1001, quantity=1, issuer_id=500, is_blueprint_copy=False, **extra):
+    """Build an expanded single-item contract."""
+    contract = {
+        "contract_id": contract_id,
+        "type": "item_exchange",
+        "status": "outstanding",
+        "price": price,
+        "issuer_id": issuer_id,
+        "start_location_id": JITA_44,
+        "items": [{"type_id": type_id, "quantity": quantity, "is_blueprint_copy": is_blueprint_copy}],
+    }
+    contract.update(extra)
+    return contract
+
+
+class TestCompetitionIndex:
+    """Test CompetitionIndex lookups."""
+
+    def setup_method(self):
+        self.contracts = [
+            make_contract(1, 300.0, issuer_id=10),
+            make_contract(2, 100.0, issuer_id=20),
+            make_contract(3, 200.0, issuer_id=10),
+            make_contract(4, 50.0, is_blueprint_copy=True),
+            make_contract(5, 400.0, quantity=2, issuer_id=30),  # 200 per item
+            make_contract(6, 10.0, type="courier"),
+            {**make_contract(7, 10.0), "items": []},
+        ]
+        self.index = CompetitionIndex.from_contracts(self.contracts, {JITA_44: FORGE})
+        self.key = (FORGE, 1001, False)
+
+    def test_only_eligible_contracts_indexed(self):
+        assert len(self.index) == 5
+        assert [price for price, _ in self.index.iter_bucket(self.key)] == [100.0, 200.0, 200.0, 300.0]
+
+    def test_cheapest_excludes_own_issuer(self):
+        price, contract = self.index.cheapest(self.key)
+        assert (price, contract["contract_id"]) == (100.0, 2)
+
+        price, contract = self.index.cheapest(self.key, exclude_issuer_id=20)
+        assert price == 200.0
+        assert contract["issuer_id"] != 20
+
+    def test_count_undercutting(self):
+        assert self.index.count_undercutting(self.key, 250.0) == 3
+        assert self.index.count_undercutting(self.key, 250.0, exclude_issuer_id=10) == 2
+        assert self.index.count_undercutting(self.key, 100.0) == 0
+        assert self.index.count_competitors(self.key, exclude_issuer_id=10) == 2
+
+    def test_region_stamp_takes_precedence(self):
+        index = CompetitionIndex.from_contracts([make_contract(1, 100.0, region_id=10000043)])
+        assert index.count_competitors((10000043, 1001, False)) == 1
+
+
+class TestCheckContractCompetition:
+    """Test check_contract_competition with a prebuilt index."""
+
+    @pytest.mark.asyncio
+    @patch("contract_competition.get_region_from_location", new_callable=AsyncMock)
+    async def test_outbid_uses_cheapest_competitor(self, mock_region):
+        mock_region.return_value = FORGE
+        index = CompetitionIndex.from_contracts(
+            [make_contract(2, 150.0, issuer_id=20), make_contract(3, 120.0, issuer_id=30)], {JITA_44: FORGE}
+        )
+        ours = make_contract(1, 200.0, issuer_id=10)
+
+        result = await check_contract_competition(ours, ours["items"], competition_index=index)
+
+        assert result == (True, 120.0)
+
+    @pytest.mark.asyncio
+    @patch("contract_competition.get_region_from_location", new_callable=AsyncMock)
+    async def test_issuer_filter_walks_bucket(self, mock_region):
+        mock_region.return_value = FORGE
+        index = CompetitionIndex.from_contracts(
+            [make_contract(2, 150.0, issuer_id=20), make_contract(3, 120.0, issuer_id=30)], {JITA_44: FORGE}
+        )
+        ours = make_contract(1, 200.0, issuer_id=10)
+
+        result = await check_contract_competition(
+            ours, ours["items"], limit_to_issuer_ids=[20], competition_index=index
+        )
+
+        assert result == (True, 150.0)
+
+    @pytest.mark.asyncio
+    @patch("contract_competition.region_resolver.resolve_many", new_callable=AsyncMock)
+    @patch("contract_competition.get_region_from_location", new_callable=AsyncMock)
+    async def test_concurrent_builds_index_once(self, mock_region, mock_resolve_many):
+        mock_region.return_value = FORGE
+        mock_resolve_many.return_value = {JITA_44: FORGE}
+        expanded = [make_contract(2, 150.0, issuer_id=20)]
+        ours = [make_contract(1, 200.0, issuer_id=10), make_contract(3, 100.0, issuer_id=10)]
+
+        with patch(
+            "contract_competition.CompetitionIndex.from_contracts", wraps=CompetitionIndex.from_contracts
+        ) as mock_build:
+            results = await check_contracts_competition_concurrent(ours, [c["items"] for c in ours], expanded)
+
+        assert results == [(True, 150.0), (False, None)]
+        assert mock_build.call_count == 1
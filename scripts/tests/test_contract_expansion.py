@@ -0,0 +1,33 @@
+"""Tests for contract_expansion.py functions."""
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_expansion import prefetch_contract_names
+
+
+class TestPrefetchContractNames:
+    """Test bulk name resolution ahead of expansion."""
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.get_issuer_names", new_callable=AsyncMock)
+    async def test_only_uncached_ids_resolved_in_one_call(self, mock_get_names):
+        mock_get_names.return_value = {2: "Bob", 20: "Bob Corp"}
+        contracts = [
+            {"contract_id": 1, "issuer_id": 1, "issuer_corporation_id": 10},
+            {"contract_id": 2, "issuer_id": 2, "issuer_corporation_id": 20},
+            {"contract_id": 3, "issuer_id": 2, "issuer_corporation_id": 20},
+            {"contract_id": 4, "issuer_id": 3, "issuer_corporation_id": 20},
+        ]
+
+        issuers, corps = await prefetch_contract_names(contracts, {"1": "Alice"}, {"10": "Alice Corp"})
+
+        mock_get_names.assert_called_once()
+        assert sorted(mock_get_names.call_args.args[0]) == [2, 3, 20]
+        assert issuers == {"2": "Bob"}
+        assert corps == {"20": "Bob Corp"}
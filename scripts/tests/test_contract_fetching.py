@@ -0,0 +1,184 @@
+"""Tests for contract_fetching.py functions."""
+import asyncio
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache_store import load_file_cache
+from contract_fetching import RegionResolver, crawl_region_contracts, fetch_all_contracts_in_region, get_issuer_names
+
+
+@pytest.fixture
+def region_cache_file(tmp_path):
+    """Region cache file with one known station."""
+    cache_file = tmp_path / "region_cache.json"
+    cache_file.write_text(json.dumps({"60003760": 10000002}))
+    return str(cache_file)
+
+
+class TestRegionResolver:
+    """Test the in-memory region resolver."""
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.get_session", new_callable=AsyncMock)
+    @patch("contract_fetching._fetch_universe_data", new_callable=AsyncMock)
+    async def test_cached_location_needs_no_calls(self, mock_fetch, mock_session, region_cache_file):
+        resolver = RegionResolver(region_cache_file)
+
+        assert await resolver.resolve(60003760) == 10000002
+        assert await resolver.resolve(60003760) == 10000002
+        mock_fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.get_session", new_callable=AsyncMock)
+    @patch("contract_fetching._get_region_from_system_id", new_callable=AsyncMock)
+    @patch("contract_fetching._fetch_universe_data", new_callable=AsyncMock)
+    async def test_resolve_many_shares_system_lookups(
+        self, mock_fetch, mock_system_region, mock_session, region_cache_file
+    ):
+        mock_fetch.return_value = {"system_id": 30000142}
+        mock_system_region.return_value = 10000002
+        resolver = RegionResolver(region_cache_file, save_delay=60)
+
+        result = await resolver.resolve_many([60003760, 60008494, 60008494, 60003466, None])
+
+        assert result == {60003760: 10000002, 60008494: 10000002, 60003466: 10000002}
+        assert mock_fetch.call_count == 2  # One station lookup per uncached location
+        assert mock_system_region.call_count == 1  # Both stations share one system
+
+        resolver.flush()
+        assert load_file_cache(region_cache_file) == {"60003760": 10000002, "60008494": 10000002, "60003466": 10000002}
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.get_session", new_callable=AsyncMock)
+    @patch("contract_fetching._fetch_universe_data", new_callable=AsyncMock)
+    async def test_unresolvable_location_not_retried(self, mock_fetch, mock_session, region_cache_file):
+        mock_fetch.return_value = None
+        resolver = RegionResolver(region_cache_file)
+
+        assert await resolver.resolve(1035466617946) is None
+        assert await resolver.resolve(1035466617946) is None
+        assert mock_fetch.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.get_session", new_callable=AsyncMock)
+    @patch("contract_fetching._fetch_universe_data", new_callable=AsyncMock)
+    async def test_failed_lookup_retried_after_ttl(self, mock_fetch, mock_session, region_cache_file):
+        mock_fetch.side_effect = [None, {"solar_system_id": 30000142}]
+        resolver = RegionResolver(region_cache_file, unresolvable_ttl=0)
+        resolver._system_regions[30000142] = 10000002
+
+        assert await resolver.resolve(1035466617946) is None  # e.g. a timeout
+        assert await resolver.resolve(1035466617946) == 10000002
+        assert mock_fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_background_save_writes_a_snapshot(self, region_cache_file):
+        resolver = RegionResolver(region_cache_file, save_delay=60)
+        resolver.remember(60008494, 10000002)
+        resolver._save_handle.cancel()
+        resolver._start_background_save(asyncio.get_running_loop())
+        resolver.remember(60003466, 10000043)  # Learned while the first write runs
+        resolver._save_handle.cancel()
+
+        await asyncio.sleep(0.1)
+        assert resolver._unsaved == {60003466: 10000043}
+        assert load_file_cache(region_cache_file)["60008494"] == 10000002
+
+
+class TestCrawlRegionContracts:
+    """Test the regional public contract crawl."""
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.region_resolver")
+    @patch("contract_fetching.fetch_public_contracts_page", new_callable=AsyncMock)
+    async def test_contracts_stamped_with_region(self, mock_fetch_page, mock_resolver):
+        mock_fetch_page.return_value = (
+            [
+                {"contract_id": 1, "type": "item_exchange", "start_location_id": 60003760},
+                {"contract_id": 2, "type": "item_exchange", "start_location_id": 60003760},
+            ],
+            1,
+        )
+
+        contracts = await fetch_all_contracts_in_region(10000002)
+
+        assert [c["region_id"] for c in contracts] == [10000002, 10000002]
+        mock_resolver.remember.assert_called_once_with(60003760, 10000002)
+        mock_fetch_page.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.region_resolver")
+    @patch("contract_fetching.fetch_public_contracts_page", new_callable=AsyncMock)
+    async def test_remaining_pages_fetched_from_x_pages(self, mock_fetch_page, mock_resolver):
+        async def fetch_page(region_id, page):
+            if page == 3:
+                return None, 0
+            return [{"contract_id": page, "type": "item_exchange"}], 4
+
+        mock_fetch_page.side_effect = fetch_page
+
+        result = await crawl_region_contracts(10000002, max_concurrency=2)
+
+        assert sorted(call.kwargs["page"] for call in mock_fetch_page.call_args_list) == [1, 2, 3, 4]
+        assert [c["contract_id"] for c in result.contracts] == [1, 2, 4]
+        assert result.total_pages == 4
+        assert result.failed_pages == [3]
+        assert not result.complete
+
+
+class TestGetIssuerNames:
+    """Test bulk /universe/names/ resolution."""
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.get_session", new_callable=AsyncMock)
+    async def test_invalid_id_isolated_by_splitting(self, mock_get_session):
+        known = {1: "Alice", 2: "Bob", 3: "Alice Corp"}
+        posted = []
+
+        @asynccontextmanager
+        async def mock_post(url, json=None, **kwargs):
+            posted.append(list(json))
+            response = MagicMock(status=200 if all(i in known for i in json) else 404)
+            response.json = AsyncMock(return_value=[{"id": i, "name": known[i]} for i in json if i in known])
+            yield response
+
+        mock_get_session.return_value = MagicMock(post=mock_post)
+
+        names = await get_issuer_names([1, 2, 3, 999, 2])
+
+        assert names == known
+        assert posted[0] == [1, 2, 3, 999]
+        assert len(posted) < 8
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.get_session", new_callable=AsyncMock)
+    async def test_invalid_id_costs_few_errors_and_batches_run_concurrently(self, mock_get_session):
+        posted = []
+        in_flight = {"now": 0, "peak": 0}
+
+        @asynccontextmanager
+        async def mock_post(url, json=None, **kwargs):
+            posted.append(list(json))
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0)
+            response = MagicMock(status=404 if 1500 in json else 200)
+            response.json = AsyncMock(return_value=[{"id": i, "name": f"Pilot {i}"} for i in json])
+            in_flight["now"] -= 1
+            yield response
+
+        mock_get_session.return_value = MagicMock(post=mock_post)
+
+        names = await get_issuer_names(list(range(1, 2001)))
+
+        assert len(names) == 1999 and 1500 not in names
+        assert sum(1 for ids in posted if 1500 in ids) <= 5  # 404s charged to the error budget
+        assert in_flight["peak"] > 1
@@ -0,0 +1,48 @@
+"""Tests for contract_prefilter.py."""
+import os
+import sys
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_prefilter import BlueprintPrefilter
+
+CONTRACTS = [
+    {"contract_id": 1, "type": "item_exchange", "volume": 25000.0, "title": "", "issuer_id": 90000001},
+    {"contract_id": 2, "type": "item_exchange", "volume": 0.01, "title": "Rifter BPC 10 runs", "issuer_id": 90000002},
+    {"contract_id": 3, "type": "courier", "volume": 5000.0, "title": "", "issuer_id": 90000003},
+    {"contract_id": 4, "type": "item_exchange", "volume": 50000.0, "title": "", "issuer_id": 90000004},
+]
+
+
+class TestBlueprintPrefilter:
+    """Test blueprint-likelihood scoring of contract headers."""
+
+    def test_skip_mode_ranks_and_skips_unlikely_item_exchanges(self):
+        prefilter = BlueprintPrefilter(
+            mode="skip",
+            min_score=0.2,
+            issuer_history={90000004: (10, 9)},
+            cached_items={"1": [{"type_id": 587, "is_blueprint_copy": False}]},
+        )
+
+        selected, skipped = prefilter.select(CONTRACTS)
+
+        # Contract 4 is bulky but its issuer mostly sells blueprints; couriers never need item requests
+        assert [c["contract_id"] for c in selected] == [2, 4, 3]
+        assert [c["contract_id"] for c in skipped] == [1]
+
+    def test_measure_mode_expands_everything_and_reports_recall(self):
+        prefilter = BlueprintPrefilter(mode="measure", min_score=0.2)
+        selected, would_skip = prefilter.select(CONTRACTS)
+        expanded = [
+            dict(c, items=[{"type_id": 691, "blueprint_type": "BPC" if c["contract_id"] in (2, 4) else None}])
+            for c in selected
+        ]
+
+        result = prefilter.measure_recall(expanded, would_skip)
+
+        assert len(selected) == 4
+        assert [c["contract_id"] for c in would_skip] == [1, 4]
+        assert result["recall"] == 0.5  # Contract 4 holds a blueprint despite its bulky header
+        assert result["item_requests_saved"] == 2
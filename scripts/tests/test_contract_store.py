@@ -0,0 +1,130 @@
+"""Tests for contract_store.py."""
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_expansion import (
+    build_blueprint_contracts_cache,
+    fetch_and_expand_all_forge_contracts,
+    load_blueprint_contracts,
+    load_blueprint_contracts_from_store,
+)
+from contract_fetching import RegionCrawlResult
+from contract_store import (
+    BlueprintSnapshot,
+    ContractStore,
+    ExpandedContracts,
+    contract_lookup,
+    get_blueprint_snapshot,
+    get_contract_store,
+)
+
+
+def _contract(contract_id, blueprint_type=None, type_id=587):
+    items = [{"type_id": type_id, "blueprint_type": blueprint_type}] if blueprint_type else []
+    return {"contract_id": contract_id, "type": "item_exchange", "items": items}
+
+
+class TestContractStore:
+    """Test the incremental contract store."""
+
+    def test_indexed_queries(self, tmp_path):
+        store = ContractStore(str(tmp_path / "eve_cache.sqlite"))
+        store.upsert_many(
+            [_contract(1, "BPO", 1001), _contract(2), _contract(3, "BPC", 1002)], default_region_id=10000002
+        )
+
+        assert store.contract_ids(10000002) == {1, 2, 3}
+        assert [c["contract_id"] for c in store.blueprint_contracts(10000002)] == [1, 3]
+        assert [c["contract_id"] for c in store.contracts_with_type(1002)] == [3]
+
+        store.delete_many([3])
+        assert store.count() == 2
+        assert store.contracts_with_type(1002) == []
+
+    def test_legacy_json_imported_once(self, tmp_path):
+        legacy_file = str(tmp_path / "all_contracts_forge.json")
+        with open(legacy_file, "w") as f:
+            json.dump([_contract(1, "BPO")], f)
+        store = ContractStore(str(tmp_path / "eve_cache.sqlite"))
+
+        assert store.import_json(legacy_file, default_region_id=10000002) == 1
+        store.delete_many([1])
+        assert store.import_json(legacy_file, default_region_id=10000002) == 0
+        assert store.count() == 0
+
+    @pytest.mark.asyncio
+    @patch("contract_expansion.expand_new_contracts_dynamic", new_callable=AsyncMock)
+    @patch("contract_fetching.crawl_region_contracts", new_callable=AsyncMock)
+    async def test_sync_only_expands_new_contracts(self, mock_crawl, mock_expand):
+        store = get_contract_store()
+        store.upsert_many([_contract(1, "BPO"), _contract(2, "BPC")], default_region_id=10000002)
+        mock_crawl.return_value = RegionCrawlResult(
+            region_id=10000002,
+            contracts=[{"contract_id": 2, "type": "item_exchange"}, {"contract_id": 4, "type": "item_exchange"}],
+        )
+        mock_expand.side_effect = lambda contracts: (
+            [_contract(c["contract_id"], "BPO") for c in contracts],
+            {},
+        )
+
+        blueprint_contracts = await fetch_and_expand_all_forge_contracts()
+
+        assert [c["contract_id"] for c in mock_expand.call_args[0][0]] == [4]
+        assert [c["contract_id"] for c in blueprint_contracts] == [2, 4]
+        assert store.get_stats() == {"inserted": 3, "deleted": 1}
+
+        # The snapshot was built from the same diff and is served without another crawl
+        assert get_blueprint_snapshot().exists
+        assert [c["contract_id"] for c in await load_blueprint_contracts()] == [2, 4]
+        assert mock_crawl.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_blueprint_filter_from_list_and_from_store(self):
+        contracts = [_contract(1, "BPO"), _contract(2), _contract(3, "BPC")]
+        get_contract_store().upsert_many(contracts, default_region_id=10000002)
+
+        assert [c["contract_id"] for c in await build_blueprint_contracts_cache(contracts)] == [1, 3]
+        assert [c["contract_id"] for c in await load_blueprint_contracts_from_store(10000002)] == [1, 3]
+        assert await load_blueprint_contracts_from_store(10000043) == []
+
+    def test_snapshot_only_saved_for_blueprint_changes(self, tmp_path):
+        snapshot = BlueprintSnapshot(str(tmp_path / "blueprint_contracts_forge.json"))
+        snapshot.rebuild([_contract(1, "BPO"), _contract(2)])
+        inode = os.stat(snapshot.snapshot_file).st_ino
+        os.utime(snapshot.snapshot_file, (0, 0))
+
+        assert snapshot.apply([_contract(3)], [2]) == 0
+        assert os.stat(snapshot.snapshot_file).st_ino == inode  # Not rewritten...
+        assert snapshot.age < 60  # ...but marked as synced
+
+        assert snapshot.apply([_contract(4, "BPC")], [1]) == 2
+        reloaded = BlueprintSnapshot(snapshot.snapshot_file)
+        assert [c["contract_id"] for c in reloaded.contracts()] == [4]
+
+
+class TestExpandedContracts:
+    """Test the indexed expanded contract list."""
+
+    def test_lookup_indexes_the_callers_list_without_copying(self):
+        contracts = [_contract(1, "BPO", 1001), _contract(2), _contract(3, "BPC", 1001)]
+        lookup = contract_lookup(contracts)
+
+        assert lookup.contracts is contracts
+        assert lookup.items_of(3) == [{"type_id": 1001, "blueprint_type": "BPC"}]
+        assert lookup.items_of(99) is None
+
+        contracts.append(_contract(4, "BPO", 1002))  # Changes after the lookup was made are seen
+        assert lookup.get(4)["contract_id"] == 4
+
+    def test_expanded_contracts_share_one_lookup(self):
+        indexed = ExpandedContracts([_contract(1, "BPO", 1001)])
+
+        assert contract_lookup(indexed) is indexed.lookup
+        assert indexed.get(1)["contract_id"] == 1 and indexed == [_contract(1, "BPO", 1001)]
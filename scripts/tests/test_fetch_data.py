@@ -2,6 +2,7 @@
 import asyncio
 import os
 import sys
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -11,7 +12,25 @@ import pytest
 # Add the scripts directory to the path so we can import modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from api_client import ApiConfig, ESIApiError, ESIAuthError, ESIRequestError, fetch_esi, fetch_public_esi
+from api_client import (
+    AdaptiveConcurrencyLimiter,
+    ApiConfig,
+    DynamicRateLimiter,
+    ESIApiError,
+    ESIAuthError,
+    ESIGovernor,
+    ESIRequestError,
+    ETagStore,
+    SingleFlight,
+    WordPressBatchClient,
+    WordPressRequestError,
+    fetch_esi,
+    fetch_public_contract_items_async,
+    fetch_public_contracts_page,
+    fetch_public_esi,
+    get_response_expiry,
+    iter_esi_pages,
+)
 from character_processor import check_industry_job_completions, check_planet_extraction_completions
 from fetch_data import collect_corporation_members
 
@@ -211,6 +230,370 @@ class TestFetchFunctions:
             await fetch_esi("/test/endpoint", 123, "invalid_token")
 
 
+class TestConditionalRequests:
+    """Test ETag / If-None-Match handling in ESI fetches."""
+
+    @pytest.mark.asyncio
+    @patch("api_client.get_session")
+    @patch("api_client.api_config")
+    async def test_not_modified_served_from_store(self, mock_api_config, mock_get_session, tmp_path):
+        mock_api_config.esi_max_retries = 3
+        mock_api_config.esi_base_url = "https://esi.evetech.net/latest"
+        store = ETagStore(str(tmp_path / "esi_etags.json"))
+
+        first = MagicMock(status=200, headers={"ETag": '"abc"'})
+        first.json = AsyncMock(return_value={"test": "data"})
+        second = MagicMock(status=304, headers={"ETag": '"abc"'})
+        responses = iter([first, second])
+        sent_headers = []
+
+        @asynccontextmanager
+        async def mock_get(url, headers=None):
+            sent_headers.append(headers)
+            yield next(responses)
+
+        mock_session = AsyncMock()
+        mock_session.get = mock_get
+        mock_get_session.return_value = mock_session
+
+        with patch("api_client.esi_etag_store", store):
+            assert await fetch_public_esi("/markets/prices/") == {"test": "data"}
+            assert await fetch_public_esi("/markets/prices/") == {"test": "data"}
+
+        assert "If-None-Match" not in sent_headers[0]
+        assert sent_headers[1]["If-None-Match"] == '"abc"'
+        stats = store.get_stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["bytes_saved"] > 0
+
+        store.flush()
+        reloaded = ETagStore(store.cache_file)
+        assert reloaded.request_headers(ETagStore.make_key("/markets/prices/")) == {"If-None-Match": '"abc"'}
+
+    @pytest.mark.asyncio
+    @patch("api_client.get_session")
+    async def test_respect_expiry_skips_network(self, mock_get_session, tmp_path):
+        store = ETagStore(str(tmp_path / "esi_etags.json"), respect_expiry=True)
+        key = ETagStore.make_key("/markets/prices/")
+        store.store(key, None, {"cached": True}, 0.0, expires_at=time.time() + 300)
+        store.store(ETagStore.make_key("/status/"), None, {"stale": True}, 0.0, expires_at=time.time() - 1)
+
+        with patch("api_client.esi_etag_store", store):
+            assert await fetch_public_esi("/markets/prices/") == {"cached": True}
+        mock_get_session.assert_not_called()
+
+        assert store.get_fresh(ETagStore.make_key("/status/")) is None
+        store.respect_expiry = False
+        assert store.get_fresh(key) is None
+
+    @pytest.mark.asyncio
+    @patch("api_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("api_client.get_session")
+    @patch("api_client.api_config")
+    async def test_contract_pages_use_etags_and_never_read_errors_as_end(
+        self, mock_api_config, mock_get_session, mock_sleep, tmp_path
+    ):
+        mock_api_config.esi_max_retries = 3
+        mock_api_config.esi_base_url = "https://esi.evetech.net/latest"
+        first = MagicMock(status=200, headers={"ETag": '"p1"', "X-Pages": "3"})
+        first.json = AsyncMock(return_value=[{"contract_id": 1}])
+        not_modified = MagicMock(status=304, headers={"ETag": '"p1"', "X-Pages": "3"})
+        responses = iter([first, not_modified] + [MagicMock(status=503, headers={})] * 3)
+        sent_headers = []
+
+        @asynccontextmanager
+        async def mock_get(url, headers=None):
+            sent_headers.append(headers)
+            yield next(responses)
+
+        mock_get_session.return_value = MagicMock(get=mock_get)
+
+        with patch("api_client.esi_etag_store", ETagStore(str(tmp_path / "esi_etags.json"))):
+            assert await fetch_public_contracts_page(10000002, page=1) == ([{"contract_id": 1}], 3)
+            assert await fetch_public_contracts_page(10000002, page=1) == ([{"contract_id": 1}], 3)
+            assert await fetch_public_contracts_page(10000002, page=2) == (None, 0)  # Not an empty last page
+
+        assert sent_headers[1]["If-None-Match"] == '"p1"'
+
+    @pytest.mark.asyncio
+    @patch("api_client.get_session")
+    @patch("api_client.api_config")
+    async def test_not_modified_after_eviction_refetches(self, mock_api_config, mock_get_session, tmp_path):
+        mock_api_config.esi_max_retries = 3
+        mock_api_config.esi_base_url = "https://esi.evetech.net/latest"
+        store = ETagStore(str(tmp_path / "esi_etags.json"), max_entries=1, backend="json")
+        store.store(ETagStore.make_key("/markets/prices/"), '"abc"', {"old": True}, 0.0)
+        full = MagicMock(status=200, headers={"ETag": '"def"'})
+        full.json = AsyncMock(return_value={"new": True})
+        responses = iter([MagicMock(status=304, headers={}), full])
+        sent_headers = []
+
+        @asynccontextmanager
+        async def mock_get(url, headers=None):
+            sent_headers.append(dict(headers))
+            store.store(ETagStore.make_key("/status/"), '"x"', {}, 0.0)  # Evicts the entry mid-request
+            yield next(responses)
+
+        mock_get_session.return_value = MagicMock(get=mock_get)
+
+        with patch("api_client.esi_etag_store", store):
+            assert await fetch_public_esi("/markets/prices/") == {"new": True}
+
+        assert sent_headers[0]["If-None-Match"] == '"abc"'
+        assert "If-None-Match" not in sent_headers[1]
+
+    def test_response_expiry_uses_server_date(self):
+        response = MagicMock(
+            headers={"Date": "Fri, 16 Oct 2026 12:00:00 GMT", "Expires": "Fri, 16 Oct 2026 12:05:00 GMT"}
+        )
+        assert 299 <= get_response_expiry(response) - time.time() <= 300
+        assert get_response_expiry(MagicMock(headers={"Expires": "garbage"})) is None
+
+    @pytest.mark.asyncio
+    @patch("api_client.get_session")
+    @patch("api_client.api_config")
+    async def test_concurrent_identical_requests_coalesced(self, mock_api_config, mock_get_session, tmp_path):
+        mock_api_config.esi_max_retries = 3
+        mock_api_config.esi_base_url = "https://esi.evetech.net/latest"
+        response = MagicMock(status=200, headers={})
+        response.json = AsyncMock(return_value={"name": "Rifter"})
+        calls = []
+
+        @asynccontextmanager
+        async def mock_get(url, headers=None):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            yield response
+
+        mock_session = AsyncMock()
+        mock_session.get = mock_get
+        mock_get_session.return_value = mock_session
+        single_flight = SingleFlight()
+
+        with patch("api_client.esi_single_flight", single_flight), patch(
+            "api_client.esi_etag_store", ETagStore(str(tmp_path / "esi_etags.json"))
+        ):
+            results = await asyncio.gather(*(fetch_public_esi("/universe/types/587/") for _ in range(5)))
+
+        assert results == [{"name": "Rifter"}] * 5
+        assert len(calls) == 1
+        assert single_flight.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    @patch("api_client.get_session")
+    @patch("api_client.api_config")
+    async def test_iter_esi_pages_fetches_remaining_pages(self, mock_api_config, mock_get_session, tmp_path):
+        mock_api_config.esi_max_retries = 3
+        mock_api_config.esi_base_url = "https://esi.evetech.net/latest"
+        requested = []
+
+        @asynccontextmanager
+        async def mock_get(url, headers=None):
+            page = int(url.rsplit("page=", 1)[1])
+            requested.append(page)
+            response = MagicMock(status=200, headers={"X-Pages": "3"})
+            response.json = AsyncMock(return_value=[{"item_id": page}])
+            yield response
+
+        mock_session = AsyncMock()
+        mock_session.get = mock_get
+        mock_get_session.return_value = mock_session
+
+        with patch("api_client.esi_etag_store", ETagStore(str(tmp_path / "esi_etags.json"))):
+            pages = [page async for page in iter_esi_pages("/characters/1/assets/", 1, "token")]
+
+        assert requested[0] == 1
+        assert sorted(requested) == [1, 2, 3]
+        assert sorted(page[0]["item_id"] for page in pages) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    @patch("api_client.get_session")
+    @patch("api_client.api_config")
+    async def test_public_contract_items_follow_x_pages(self, mock_api_config, mock_get_session, tmp_path):
+        mock_api_config.esi_max_retries = 3
+        mock_api_config.esi_base_url = "https://esi.evetech.net/latest"
+        requested = []
+
+        @asynccontextmanager
+        async def mock_get(url, headers=None):
+            requested.append(url.rsplit("/contracts/public/items/", 1)[1])
+            page = int(url.rsplit("page=", 1)[1]) if "page=" in url else 1
+            response = MagicMock(status=200, headers={"X-Pages": "2"})
+            response.json = AsyncMock(return_value=[{"record_id": page, "type_id": 691}])
+            yield response
+
+        mock_session = AsyncMock()
+        mock_session.get = mock_get
+        mock_get_session.return_value = mock_session
+
+        with patch("api_client.esi_etag_store", ETagStore(str(tmp_path / "esi_etags.json"))):
+            items = await fetch_public_contract_items_async(123)
+
+        assert requested == ["123/", "123/?page=2"]
+        assert [item["record_id"] for item in items] == [1, 2]
+
+    def test_entries_scoped_by_subject(self, tmp_path):
+        store = ETagStore(str(tmp_path / "esi_etags.json"))
+        store.store(ETagStore.make_key("/characters/1/assets/", "char:1"), '"x"', [], 0.0)
+
+        assert store.request_headers(ETagStore.make_key("/characters/1/assets/", "char:1"))
+        assert store.request_headers(ETagStore.make_key("/characters/1/assets/", "char:2")) == {}
+
+    def test_served_bodies_are_copies_and_memory_is_bounded(self, tmp_path):
+        store = ETagStore(str(tmp_path / "esi_etags.json"), max_entries=2)
+        for endpoint in ("/a/", "/b/", "/c/"):
+            store.store(ETagStore.make_key(endpoint), '"x"', {"items": [1]}, 0.0)
+
+        served = store.record_not_modified(ETagStore.make_key("/c/"))
+        served["items"].append(2)
+        assert store.record_not_modified(ETagStore.make_key("/c/")) == {"items": [1]}
+        assert store.get_stats()["entries_in_memory"] == 2
+
+        store.flush()
+        reloaded = ETagStore(store.cache_file)
+        assert reloaded.record_not_modified(ETagStore.make_key("/a/")) == {"items": [1]}  # Evicted from memory only
+
+
+class TestESIGovernor:
+    """Test the global ESI request governor."""
+
+    def test_budget_paces_then_pauses(self):
+        governor = ESIGovernor(10, soft_budget=50, hard_budget=10)
+        governor.observe(
+            MagicMock(status=200, headers={"X-ESI-Error-Limit-Remain": "90", "X-ESI-Error-Limit-Reset": "30"})
+        )
+        assert governor.throttle_delay() == 0
+
+        governor.observe(
+            MagicMock(status=200, headers={"X-ESI-Error-Limit-Remain": "30", "X-ESI-Error-Limit-Reset": "30"})
+        )
+        assert 0 < governor.throttle_delay() < 30 / 10
+
+        governor.observe(
+            MagicMock(status=200, headers={"X-ESI-Error-Limit-Remain": "8", "X-ESI-Error-Limit-Reset": "30"})
+        )
+        assert governor.throttle_delay() > 29
+        assert governor.get_stats()["min_error_budget"] == 8
+
+    def test_error_limited_response_pauses_everyone(self):
+        governor = ESIGovernor(10)
+        governor.observe(MagicMock(status=420, headers={"X-ESI-Error-Limit-Reset": "12"}))
+
+        assert 12 < governor.throttle_delay() <= 13
+        assert governor.get_stats()["error_limited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_in_flight_limit_enforced(self):
+        governor = ESIGovernor(2)
+
+        async def request():
+            async with governor.request():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        stats = governor.get_stats()
+        assert stats["requests"] == 6
+        assert stats["peak_in_flight"] == 2
+        assert stats["in_flight"] == 0
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test the AIMD concurrency limiter."""
+
+    def test_additive_increase_per_window(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=4, max_limit=10, latency_target=1.0)
+        for _ in range(4):
+            limiter.record(0.1)
+        assert limiter.limit == 5
+
+    def test_multiplicative_decrease_once_per_window(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=10, min_limit=2, latency_target=1.0)
+        for _ in range(10):
+            limiter.record(0.1)
+        limiter.record(0.1, throttled=True)
+        limiter.record(5.0)  # Same window, must not cut again
+
+        assert limiter.limit == 7
+        assert [step["reason"] for step in limiter.trajectory] == ["initial", "increase", "throttled"]
+
+    @pytest.mark.asyncio
+    async def test_resize_keeps_admitted_tasks_and_admits_on_growth(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=3, max_limit=10)
+        for _ in range(3):
+            await limiter.acquire()
+
+        limiter.set_limit(1)
+        limiter.release()
+        limiter.release()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()  # One still in flight, limit is 1
+
+        limiter.set_limit(2)
+        await asyncio.sleep(0)
+        assert waiter.done()
+        assert limiter.in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_congestion_signal_cuts_limit(self):
+        events = [0]
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=4, max_limit=10, congestion_signal=lambda: events[0])
+
+        for _ in range(4):
+            async with limiter.slot():
+                pass
+        assert limiter.limit == 5
+
+        async with limiter.slot():
+            events[0] += 1
+        assert limiter.limit == 3
+
+
+class TestDynamicRateLimiter:
+    """Test the FIFO token-bucket WordPress rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_never_exceed_rate(self):
+        limiter = DynamicRateLimiter(base_calls_per_minute=60, clock=lambda: 1000.0)
+        delays = []
+        all_waiting = asyncio.Event()
+        release = asyncio.Event()
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+            if len(delays) == 99:
+                all_waiting.set()
+            await release.wait()
+
+        with patch("api_client.asyncio.sleep", side_effect=fake_sleep):
+            callers = asyncio.ensure_future(asyncio.gather(*(limiter.wait_if_needed() for _ in range(100))))
+            await all_waiting.wait()
+            assert limiter.queue_depth == 99
+            release.set()
+            await callers
+
+        # Arrival order is slot order, one second apart at 60 calls per minute
+        starts = [0.0] + delays
+        assert starts == [float(i) for i in range(100)]
+        assert max(sum(1 for t in starts if window <= t < window + 60) for window in starts) == 60
+        assert limiter.queue_depth == 0
+
+    def test_errors_lower_the_rate(self):
+        now = [0.0]
+        limiter = DynamicRateLimiter(base_calls_per_minute=60, clock=lambda: now[0])
+        for _ in range(10):
+            limiter.record_response_time(0.5)
+            limiter.record_error()
+        limiter._adjust_rate()
+        assert limiter.current_rate < 60
+
+        now[0] = 200.0  # Samples left the sliding window
+        limiter._prune(now[0])
+        assert limiter.get_stats()["queue_depth"] == 0
+        assert not limiter._response_times and limiter._response_time_total == 0
+
+
 class TestCollectCorporationMembers:
     """Test corporation member collection functionality."""
 
@@ -593,6 +976,80 @@ class TestBlueprintProcessing:
         assert isinstance(results[2], Exception)
         assert str(results[2]) == "Test error"
 
+    @pytest.mark.asyncio
+    @patch("blueprint_processor.save_blueprint_type_cache")
+    @patch("blueprint_processor.load_blueprint_type_cache")
+    @patch("blueprint_processor.fetch_public_esi", new_callable=AsyncMock)
+    async def test_extract_blueprints_from_assets_classifies_in_bulk(self, mock_fetch, mock_load, mock_save):
+        """Unknown types are resolved once each and the type cache is saved once."""
+        from blueprint_processor import extract_blueprints_from_assets
+
+        mock_load.return_value = {"34": False}
+        type_names = {1001: "Rifter Blueprint", 1002: "Tritanium Scrap"}
+        mock_fetch.side_effect = lambda endpoint: {"name": type_names[int(endpoint.rsplit("/", 1)[1])]}
+        assets = [
+            {"item_id": 1, "type_id": 34, "quantity": 100},
+            {
+                "item_id": 2,
+                "type_id": 1002,
+                "location_id": 60003760,
+                "items": [{"item_id": 3, "type_id": 1001, "quantity": -1}, {"item_id": 4, "type_id": 1001}],
+            },
+            {"item_id": 5, "type_id": 1001, "quantity": -1},
+        ]
+
+        blueprints = await extract_blueprints_from_assets(assets, "char", 123, "token")
+
+        assert [bp["item_id"] for bp in blueprints] == [3, 5]
+        assert blueprints[0]["location_id"] == 60003760  # Inherited from the container
+        assert mock_fetch.call_count == 2
+        mock_save.assert_called_once()
+        assert mock_save.call_args.args[0] == {"34": False, "1001": True, "1002": False}
+
+    @pytest.mark.asyncio
+    @patch("fetch_data.update_blueprint_from_asset_in_wp", new_callable=AsyncMock)
+    @patch("fetch_data.fetch_esi", new_callable=AsyncMock)
+    async def test_process_job_blueprints_updates_each_job_blueprint(self, mock_fetch_esi, mock_update):
+        """Blueprints in active industry jobs are sent to the asset blueprint updater."""
+        from fetch_data import process_job_blueprints
+
+        mock_fetch_esi.return_value = [{"blueprint_id": 7, "blueprint_type_id": 1001, "station_id": 60003760}]
+
+        await process_job_blueprints(123, "token", {}, {}, {}, {}, {})
+
+        mock_update.assert_awaited_once()
+        assert mock_update.call_args.args[0]["item_id"] == 7
+
+    @pytest.mark.asyncio
+    @patch("blueprint_processor.wp_batch_client")
+    @patch("blueprint_processor.wp_request", new_callable=AsyncMock)
+    async def test_cleanup_blueprint_posts_batches_deletes(self, mock_wp_request, mock_batch_client):
+        """BPC posts and blueprints of other corporations are deleted together through the batch client."""
+        from blueprint_processor import cleanup_blueprint_posts
+
+        blueprints = [
+            {"id": 1, "slug": "blueprint-1", "meta": {"_eve_bp_quantity": -2, "_eve_bp_item_id": 1}},
+            {"id": 2, "slug": "blueprint-2", "meta": {"_eve_bp_quantity": -1, "_eve_bp_item_id": 2}},
+            {
+                "id": 3,
+                "slug": "blueprint-3",
+                "meta": {"_eve_bp_quantity": -1, "_eve_bp_owner_id": 5, "_eve_bp_source": "corp_assets"},
+            },
+        ]
+        mock_wp_request.side_effect = lambda method, endpoint: (
+            blueprints if endpoint.startswith("/wp/v2/eve_blueprint") else [{"title": {"rendered": "Other Corp"}}]
+        )
+        mock_batch_client.write_many = AsyncMock(return_value=[{"deleted": True}, {"deleted": True}])
+
+        await cleanup_blueprint_posts()
+
+        mock_batch_client.write_many.assert_awaited_once_with(
+            [
+                ("DELETE", "/wp/v2/eve_blueprint/1", {"force": True}),
+                ("DELETE", "/wp/v2/eve_blueprint/3", {"force": True}),
+            ]
+        )
+
 
 class TestWordPressAPIIntegration:
     """Test WordPress API integration functionality."""
@@ -699,6 +1156,77 @@ class TestWordPressAPIIntegration:
         with pytest.raises(WordPressAuthError):
             await wp_request("GET", "/wp-json/wp/v2/posts/123")
 
+    @pytest.mark.asyncio
+    async def test_batch_client_packs_writes_and_maps_results(self):
+        """Concurrent writes go out as /batch/v1 calls of up to max_requests, one result per caller."""
+        batches = []
+
+        async def fake_wp_request(method, endpoint, data=None):
+            batches.append(data["requests"])
+            return {
+                "responses": [
+                    {"status": 400, "body": {"code": "rest_invalid_param"}}
+                    if request["path"].endswith("/13")
+                    else {"status": 200, "body": {"id": int(request["path"].rsplit("/", 1)[1])}}
+                    for request in data["requests"]
+                ]
+            }
+
+        client = WordPressBatchClient(max_requests=25, enabled=True)
+        with patch("api_client.wp_request", side_effect=fake_wp_request):
+            results = await client.write_many(
+                [("PUT", f"/wp/v2/eve_contract/{post_id}", {"title": "Contract"}) for post_id in range(30)]
+            )
+
+        assert [len(requests) for requests in batches] == [25, 5]
+        assert batches[0][0] == {"method": "PUT", "path": "/wp/v2/eve_contract/0", "body": {"title": "Contract"}}
+        assert results[12] == {"id": 12} and results[29] == {"id": 29}
+        assert isinstance(results[13], WordPressRequestError)
+        assert client.get_stats()["batches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_client_falls_back_without_batch_route(self):
+        """A server without /batch/v1 gets single requests from then on."""
+        calls = []
+
+        async def fake_wp_request(method, endpoint, data=None):
+            calls.append((method, endpoint))
+            return None if endpoint == "/batch/v1" else {"deleted": True}
+
+        client = WordPressBatchClient(enabled=True)
+        with patch("api_client.wp_request", side_effect=fake_wp_request):
+            assert await client.write("DELETE", "/wp/v2/eve_contract/1", {"force": True}) == {"deleted": True}
+            assert await client.write("DELETE", "/wp/v2/eve_contract/2", {"force": True}) == {"deleted": True}
+
+        assert calls == [
+            ("POST", "/batch/v1"),
+            ("DELETE", "/wp/v2/eve_contract/1"),
+            ("DELETE", "/wp/v2/eve_contract/2"),
+        ]
+        assert client.supported is False
+
+    @pytest.mark.asyncio
+    async def test_batch_client_sends_singly_when_batch_post_fails(self):
+        """A failed /batch/v1 POST retries its writes one by one instead of failing them all."""
+        calls = []
+
+        async def fake_wp_request(method, endpoint, data=None):
+            calls.append((method, endpoint))
+            if endpoint == "/batch/v1":
+                raise WordPressRequestError("WordPress server error 500: /batch/v1")
+            return {"id": int(endpoint.rsplit("/", 1)[1])}
+
+        client = WordPressBatchClient(enabled=True)
+        with patch("api_client.wp_request", side_effect=fake_wp_request):
+            results = await client.write_many(
+                [("PUT", f"/wp/v2/eve_contract/{post_id}", {"title": "Contract"}) for post_id in range(3)]
+            )
+
+        assert results == [{"id": 0}, {"id": 1}, {"id": 2}]
+        assert calls[0] == ("POST", "/batch/v1") and len(calls) == 4
+        assert client.get_stats()["failed_batches"] == 1
+        assert client.supported is not False
+
 
 class TestCacheLRUOptimization:
     """Test LRU cache optimizations."""
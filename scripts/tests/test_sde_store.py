@@ -0,0 +1,88 @@
+"""Tests for sde_store.py."""
+import csv
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_fetching import RegionResolver
+from sde_store import SDEStore, import_sde
+
+SDE_FILES = {
+    "invCategories": [{"categoryID": 9, "categoryName": "Blueprint"}, {"categoryID": 6, "categoryName": "Ship"}],
+    "invGroups": [
+        {"groupID": 105, "categoryID": 9, "groupName": "Frigate Blueprint"},
+        {"groupID": 25, "categoryID": 6, "groupName": "Frigate"},
+    ],
+    "invTypes": [
+        {"typeID": 587, "groupID": 25, "typeName": "Rifter"},
+        {"typeID": 691, "groupID": 105, "typeName": "Rifter Blueprint"},
+    ],
+    "mapRegions": [{"regionID": 10000002, "regionName": "The Forge"}],
+    "mapConstellations": [{"regionID": 10000002, "constellationID": 20000020, "constellationName": "Kimotoro"}],
+    "mapSolarSystems": [
+        {"regionID": 10000002, "constellationID": 20000020, "solarSystemID": 30000142, "solarSystemName": "Jita"}
+    ],
+    "staStations": [
+        {"stationID": 60003760, "solarSystemID": 30000142, "regionID": 10000002, "stationName": "Jita IV - Moon 4"}
+    ],
+}
+
+
+@pytest.fixture
+def sde_db(tmp_path):
+    """Import a miniature SDE CSV dump and return the database path."""
+    source_dir = tmp_path / "sde"
+    source_dir.mkdir()
+    for name, rows in SDE_FILES.items():
+        with open(source_dir / f"{name}.csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) + ["published"])
+            writer.writeheader()
+            writer.writerows({**row, "published": "None"} for row in rows)
+
+    db_file = str(tmp_path / "sde.sqlite")
+    counts = import_sde(str(source_dir), db_file)
+    assert counts["types"] == 2
+    assert counts["stations"] == 1
+    return db_file
+
+
+class TestSDEStore:
+    """Test SDE import and lookups."""
+
+    def test_type_lookups(self, sde_db):
+        store = SDEStore(sde_db)
+
+        assert store.type_name(587) == "Rifter"
+        assert store.is_blueprint(691) is True
+        assert store.is_blueprint(587) is False
+        assert store.is_blueprint(999999) is None
+        assert store.get_type(691) == {"type_id": 691, "name": "Rifter Blueprint", "group_id": 105, "category_id": 9}
+
+    def test_region_lookups(self, sde_db):
+        store = SDEStore(sde_db)
+
+        assert store.region_of_location(60003760) == 10000002
+        assert store.region_of_location(30000142) == 10000002
+        assert store.region_of_location(1035466617946) is None
+
+    def test_missing_database_falls_back(self, tmp_path):
+        store = SDEStore(str(tmp_path / "missing.sqlite"))
+
+        assert not store.available
+        assert store.is_blueprint(691) is None
+        assert store.region_of_location(60003760) is None
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching._fetch_universe_data", new_callable=AsyncMock)
+    async def test_region_resolver_uses_sde_without_esi(self, mock_fetch, sde_db, tmp_path):
+        resolver = RegionResolver(str(tmp_path / "region_cache.json"))
+
+        with patch("contract_fetching.sde_store", SDEStore(sde_db)):
+            assert await resolver.resolve_many([60003760, 30000142]) == {60003760: 10000002, 30000142: 10000002}
+
+        mock_fetch.assert_not_called()
@@ -0,0 +1,87 @@
+"""Tests for universe_topology.py."""
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_fetching import RegionResolver
+from universe_topology import UniverseTopology
+
+ESI_UNIVERSE = {
+    "/universe/regions/": [10000002, 10000043],
+    "/universe/regions/10000002/": {"region_id": 10000002, "constellations": [20000020]},
+    "/universe/regions/10000043/": {"region_id": 10000043, "constellations": [20000322]},
+    "/universe/constellations/20000020/": {"region_id": 10000002, "systems": [30000142, 30000144]},
+    "/universe/constellations/20000322/": {"region_id": 10000043, "systems": [30002187]},
+}
+
+
+class TestUniverseTopology:
+    """Test the preloaded solar system -> region map."""
+
+    @pytest.mark.asyncio
+    @patch("universe_topology.fetch_public_esi", new_callable=AsyncMock)
+    async def test_refresh_builds_and_persists_map(self, mock_fetch, tmp_path):
+        mock_fetch.side_effect = lambda endpoint: ESI_UNIVERSE[endpoint]
+        topology = UniverseTopology(str(tmp_path / "universe_topology.json"))
+
+        await topology.ensure_loaded()
+        await topology.ensure_loaded()
+
+        assert mock_fetch.call_count == 5  # Second call is served from memory
+        assert topology.get_system_region(30002187) == 10000043
+        assert not topology.stale
+
+        reloaded = UniverseTopology(topology.cache_file)
+        assert reloaded.get_system_region(30000144) == 10000002
+        assert not reloaded.stale
+
+    @pytest.mark.asyncio
+    @patch("universe_topology.fetch_public_esi", new_callable=AsyncMock)
+    async def test_failed_constellation_leaves_map_stale(self, mock_fetch, tmp_path):
+        def fetch(endpoint):
+            if endpoint == "/universe/constellations/20000322/":
+                raise Exception("Gateway timeout")
+            return ESI_UNIVERSE[endpoint]
+
+        mock_fetch.side_effect = fetch
+        topology = UniverseTopology(str(tmp_path / "universe_topology.json"))
+
+        assert await topology.refresh() == 2
+        assert topology.stale
+
+        await topology.ensure_loaded()
+        assert mock_fetch.call_count == 5  # Backing off instead of downloading again on the next miss
+
+    @pytest.mark.asyncio
+    @patch("universe_topology.fetch_public_esi", new_callable=AsyncMock)
+    async def test_failed_region_list_does_not_raise(self, mock_fetch, tmp_path):
+        mock_fetch.side_effect = Exception("Service unavailable")
+        topology = UniverseTopology(str(tmp_path / "universe_topology.json"))
+
+        await topology.ensure_loaded()
+
+        assert topology.get_system_region(30000142) is None
+        assert topology.stale
+
+    @pytest.mark.asyncio
+    @patch("contract_fetching.get_session", new_callable=AsyncMock)
+    @patch("contract_fetching._get_region_from_system_id", new_callable=AsyncMock)
+    @patch("contract_fetching._fetch_universe_data", new_callable=AsyncMock)
+    @patch("universe_topology.fetch_public_esi", new_callable=AsyncMock)
+    async def test_region_resolver_uses_topology(
+        self, mock_topology_fetch, mock_fetch, mock_system_region, mock_session, tmp_path
+    ):
+        mock_topology_fetch.side_effect = lambda endpoint: ESI_UNIVERSE[endpoint]
+        mock_fetch.return_value = {"solar_system_id": 30000142}
+        resolver = RegionResolver(str(tmp_path / "region_cache.json"))
+
+        with patch("contract_fetching.universe_topology", UniverseTopology(str(tmp_path / "universe_topology.json"))):
+            assert await resolver.resolve(1035466617946) == 10000002
+
+        assert mock_fetch.call_count == 1  # Structure lookup only
+        mock_system_region.assert_not_called()
@@ -0,0 +1,120 @@
+"""Tests for wp_post_index.py."""
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add the scripts directory to the path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import WordPressRequestError
+from wp_post_index import CONTENT_HASH_META, WPPostIndex
+
+
+class TestWPPostIndex:
+    """Test the sync-start WordPress post index."""
+
+    @pytest.mark.asyncio
+    async def test_load_pages_until_short_page(self):
+        pages = {
+            1: [{"id": 1, "slug": "character-1"}, {"id": 2, "slug": "character-2"}],
+            2: [{"id": 3, "slug": "character-3"}],
+        }
+
+        async def fake_wp_request(method, endpoint, data=None):
+            if endpoint.startswith("/eve-observer/v1/manifest"):
+                return None  # Plugin without the manifest route
+            page = int(endpoint.split("page=")[2].split("&")[0])
+            return pages[page]
+
+        index = WPPostIndex(page_size=2)
+        with patch("wp_post_index.wp_request", side_effect=fake_wp_request) as mock_request:
+            assert await index.load(["eve_character"]) == 3
+
+        assert mock_request.call_count == 3
+        assert "_fields=id,slug,title,meta" in mock_request.call_args_list[1].args[1]
+        assert index.get("eve_character", "character-3")["id"] == 3
+        assert index.get("eve_character", "character-4") is None
+
+    @pytest.mark.asyncio
+    async def test_manifest_indexes_covered_types_in_one_call(self):
+        manifest = {
+            "fields": ["post_id", "slug", "entity_id", "content_hash", "modified", "title", "meta"],
+            "post_types": {
+                "eve_blueprint": [
+                    [7, "blueprint-1001", 1001, "abc", "2024-01-01 00:00:00", "Rifter Blueprint", {"_eve_bp_me": "10"}]
+                ]
+            },
+        }
+        index = WPPostIndex()
+        with patch("wp_post_index.wp_request", AsyncMock(side_effect=[manifest, []])) as mock_request:
+            assert await index.load(["eve_blueprint", "eve_planet"]) == 1
+
+        assert mock_request.call_args_list[0].args[1] == "/eve-observer/v1/manifest?post_type=eve_blueprint,eve_planet"
+        assert "/wp/v2/eve_planet?" in mock_request.call_args_list[1].args[1]  # Not in the manifest: paged
+        post = index.get("eve_blueprint", "blueprint-1001")
+        assert post["id"] == 7 and post["entity_id"] == 1001
+        assert post["title"] == {"rendered": "Rifter Blueprint"}
+        assert post["meta"] == {"_eve_bp_me": "10", "_eve_content_hash": "abc"}
+        assert not index.unchanged("eve_blueprint", post, {"slug": "blueprint-1001", "meta": {}})
+
+    @pytest.mark.asyncio
+    async def test_manifest_without_titles_and_meta_is_paged_instead(self):
+        manifest = {
+            "fields": ["post_id", "slug", "entity_id", "content_hash", "modified"],
+            "post_types": {"eve_contract": [[7, "contract-1", 1, "abc", "2024-01-01 00:00:00"]]},
+        }
+        stored = {
+            "id": 7,
+            "slug": "contract-1",
+            "title": {"rendered": "Contract 1"},
+            "meta": {"_eve_contract_outbid": "1"},
+        }
+        index = WPPostIndex()
+        with patch("wp_post_index.wp_request", AsyncMock(side_effect=[manifest, [stored]])) as mock_request:
+            assert await index.load(["eve_contract"]) == 1
+
+        assert "/wp/v2/eve_contract?" in mock_request.call_args_list[1].args[1]
+        assert index.get("eve_contract", "contract-1")["meta"]["_eve_contract_outbid"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_failed_type_stays_unloaded_and_record_keeps_index_current(self):
+        index = WPPostIndex()
+        with patch(
+            "wp_post_index.wp_request", AsyncMock(side_effect=[None, [], WordPressRequestError("no such post type")])
+        ):
+            await index.load(["eve_character", "eve_planet"])
+
+        assert index.is_loaded("eve_character")
+        assert not index.is_loaded("eve_planet")  # Updaters fall back to GET-by-slug
+
+        index.record("eve_character", {"id": 5, "slug": "character-1", "title": {"rendered": "Pilot"}, "content": {}})
+        assert index.get("eve_character", "character-1") == {
+            "id": 5,
+            "slug": "character-1",
+            "title": {"rendered": "Pilot"},
+            "meta": None,
+        }
+        index.forget("eve_character", "character-1")
+        assert index.get("eve_character", "character-1") is None
+
+    def test_unchanged_payload_skips_write_regardless_of_timestamp(self):
+        index = WPPostIndex()
+
+        def payload(last_updated, quantity=1):
+            return {
+                "title": "Rifter Blueprint",
+                "slug": "blueprint-1",
+                "meta": {"_eve_bp_quantity": quantity, "_eve_last_updated": last_updated},
+            }
+
+        created = payload("2024-01-01T00:00:00")
+        assert not index.unchanged("eve_blueprint", None, created)
+        stored = {"id": 1, "slug": "blueprint-1", "meta": dict(created["meta"])}
+
+        assert index.unchanged("eve_blueprint", stored, payload("2024-01-02T00:00:00"))
+        changed = payload("2024-01-02T00:00:00", quantity=2)
+        assert not index.unchanged("eve_blueprint", stored, changed)
+        assert changed["meta"][CONTENT_HASH_META] != created["meta"][CONTENT_HASH_META]
+        assert index.get_stats()["skipped_writes"] == {"eve_blueprint": 1}
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+EVE Observer Universe Topology
+Preloads the whole solar system -> region map from ESI so that region lookups
+for stations and structures never walk system -> constellation -> region per
+location.
+
+The map is fetched once (every constellation concurrently, bounded by the ESI
+governor), persisted to cache/universe_topology.json and reused until it is
+older than UNIVERSE_TOPOLOGY_TTL_DAYS. A failed or incomplete download is not
+retried by lookups for REFRESH_RETRY_DELAY seconds. Refresh it by hand when new
+systems appear:
+
+    python universe_topology.py refresh
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from api_client import cleanup_session, fetch_public_esi
+from config import UNIVERSE_TOPOLOGY_FILE, UNIVERSE_TOPOLOGY_PRELOAD, UNIVERSE_TOPOLOGY_TTL_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+class UniverseTopology:
+    """Process-wide solar system -> region map with a long on-disk TTL."""
+
+    # Seconds before ensure_loaded() retries after a failed or incomplete download
+    REFRESH_RETRY_DELAY = 900.0
+
+    def __init__(
+        self,
+        cache_file: str = UNIVERSE_TOPOLOGY_FILE,
+        ttl_seconds: float = UNIVERSE_TOPOLOGY_TTL_DAYS * 86400,
+        preload: bool = UNIVERSE_TOPOLOGY_PRELOAD,
+    ):
+        self.cache_file = cache_file
+        self.ttl_seconds = ttl_seconds
+        self.preload = preload
+        self._system_regions: Dict[int, int] = {}
+        self._fetched_at = 0.0
+        self._retry_after = 0.0
+        self._loaded = False
+        self._refresh_task: Optional["asyncio.Task[int]"] = None
+        self.stats = {"refreshes": 0, "failed_requests": 0}
+
+    def _ensure_loaded_from_disk(self) -> None:
+        """Read the persisted map on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            self._system_regions = {int(system_id): int(region_id) for system_id, region_id in data["systems"].items()}
+            self._fetched_at = float(data.get("fetched_at", 0))
+            logger.info(f"Loaded {len(self._system_regions)} solar system regions from {self.cache_file}")
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError):
+            self._system_regions = {}
+
+    @property
+    def stale(self) -> bool:
+        """Whether the map is missing or older than its TTL."""
+        self._ensure_loaded_from_disk()
+        return time.time() - self._fetched_at > self.ttl_seconds
+
+    def get_system_region(self, system_id: Optional[int]) -> Optional[int]:
+        """Return the region of a solar system from the in-memory map, without any calls."""
+        if not system_id:
+            return None
+        self._ensure_loaded_from_disk()
+        return self._system_regions.get(system_id)
+
+    async def ensure_loaded(self) -> None:
+        """Make sure the map is loaded, downloading it first if it is missing or expired.
+
+        Does nothing beyond reading the disk copy when preloading is disabled, or while
+        backing off after a failed download.
+        """
+        if self.preload and self.stale and time.time() >= self._retry_after:
+            await self.refresh()
+
+    async def refresh(self) -> int:
+        """Download the full topology, sharing one download between concurrent callers.
+
+        Returns:
+            Number of solar systems in the map
+        """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._download())
+            self._refresh_task.add_done_callback(lambda _: setattr(self, "_refresh_task", None))
+        return await asyncio.shield(self._refresh_task)
+
+    async def _download(self) -> int:
+        """Fetch every region's constellations and their systems from ESI and persist the map."""
+        self._ensure_loaded_from_disk()
+        start_time = time.time()
+
+        try:
+            region_ids = await fetch_public_esi("/universe/regions/") or []
+        except Exception as e:
+            logger.warning(f"Could not fetch the universe region list: {e}")
+            region_ids = []
+        regions = await asyncio.gather(
+            *(fetch_public_esi(f"/universe/regions/{region_id}/") for region_id in region_ids), return_exceptions=True
+        )
+        constellation_ids = [
+            constellation_id
+            for region in regions
+            if isinstance(region, dict)
+            for constellation_id in region.get("constellations", [])
+        ]
+        constellations = await asyncio.gather(
+            *(
+                fetch_public_esi(f"/universe/constellations/{constellation_id}/")
+                for constellation_id in constellation_ids
+            ),
+            return_exceptions=True,
+        )
+
+        failed = sum(1 for result in regions + constellations if not isinstance(result, dict))
+        system_regions = dict(self._system_regions)
+        for constellation in constellations:
+            if isinstance(constellation, dict) and constellation.get("region_id"):
+                for system_id in constellation.get("systems", []):
+                    system_regions[system_id] = constellation["region_id"]
+
+        self._system_regions = system_regions
+        self.stats["refreshes"] += 1
+        self.stats["failed_requests"] += failed
+        if failed or not region_ids:
+            # Keep the old timestamp so the next run retries the missing parts, but not every lookup of this one
+            self._retry_after = time.time() + self.REFRESH_RETRY_DELAY
+            logger.warning(
+                f"Universe topology refresh incomplete: {failed} failed requests, "
+                f"retrying in {self.REFRESH_RETRY_DELAY / 60:.0f} minutes"
+            )
+        else:
+            self._fetched_at = time.time()
+            self._retry_after = 0.0
+        self._save()
+
+        logger.info(
+            f"Universe topology: {len(system_regions)} systems in {len(constellation_ids)} constellations "
+            f"loaded in {time.time() - start_time:.1f}s"
+        )
+        return len(system_regions)
+
+    def _save(self) -> None:
+        """Write the map to disk atomically."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(
+                    {
+                        "fetched_at": self._fetched_at,
+                        "systems": {str(system_id): region_id for system_id, region_id in self._system_regions.items()},
+                    },
+                    f,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.error(f"Failed to save universe topology {self.cache_file}: {e}")
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return map size, age and refresh statistics."""
+        return {
+            **self.stats,
+            "systems": len(self._system_regions),
+            "age_days": round((time.time() - self._fetched_at) / 86400, 1) if self._fetched_at else None,
+        }
+
+
+# Process-wide topology shared by region resolution
+universe_topology = UniverseTopology()
+
+
+async def _refresh_command() -> None:
+    try:
+        count = await universe_topology.refresh()
+        print(f"Universe topology refreshed: {count} solar systems")
+    finally:
+        await cleanup_session()
+
+
+def main() -> None:
+    """Command line entry point for refreshing the topology map."""
+    parser = argparse.ArgumentParser(description="Manage the cached EVE universe topology")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("refresh", help="Download the solar system -> region map from ESI")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.command == "refresh":
+        asyncio.run(_refresh_command())
+
+
+if __name__ == "__main__":
+    main()
@@ -5,25 +5,11 @@ Shared utility functions for the EVE Observer application.
 """
 
 import argparse
-import json
 import logging
-import os
 import smtplib
 from email.mime.text import MIMEText
-from typing import Any, Dict, Optional
 
-import requests
-
-from config import (
-    CACHE_DIR,
-    EMAIL_FROM,
-    EMAIL_PASSWORD,
-    EMAIL_SMTP_PORT,
-    EMAIL_SMTP_SERVER,
-    EMAIL_TO,
-    EMAIL_USERNAME,
-    ESI_BASE_URL,
-)
+from config import EMAIL_FROM, EMAIL_PASSWORD, EMAIL_SMTP_PORT, EMAIL_SMTP_SERVER, EMAIL_TO, EMAIL_USERNAME
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +32,7 @@ def parse_arguments() -> argparse.Namespace:
         --corporations: Fetch corporation data
         --characters: Fetch character data
         --all: Fetch all data types (default)
+        --respect-expiry: Serve unexpired ESI responses from cache without requests
     """
     parser = argparse.ArgumentParser(description="Fetch EVE Online data from ESI API")
     parser.add_argument("--contracts", action="store_true", help="Fetch contracts data")
@@ -55,6 +42,11 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument("--corporations", action="store_true", help="Fetch corporation data")
     parser.add_argument("--characters", action="store_true", help="Fetch character data")
     parser.add_argument("--all", action="store_true", help="Fetch all data (default)")
+    parser.add_argument(
+        "--respect-expiry",
+        action="store_true",
+        help="Skip ESI requests whose cached response has not yet expired (for frequent cron runs)",
+    )
 
     args = parser.parse_args()
 
@@ -98,128 +90,3 @@ def send_email(subject: str, body: str) -> None:
         logger.info(f"Email sent successfully: {subject}")
     except Exception as e:
         logger.error(f"Failed to send email: {e}")
-
-
-def get_region_from_location(location_id: int) -> Optional[int]:
-    """
-    Get region_id from a location_id (station or structure) with caching.
-
-    Resolves location IDs to region IDs by traversing the EVE universe hierarchy:
-    location -> solar system -> constellation -> region.
-
-    Args:
-        location_id: Station or structure location ID.
-
-    Returns:
-        Optional[int]: Region ID if found, None otherwise.
-
-    Note:
-        Uses caching to avoid repeated API calls. Handles both station
-        and structure location types differently.
-    """
-    if not location_id:
-        return None
-
-    # Load cache
-    cache_file = os.path.join(CACHE_DIR, "region_cache.json")
-    try:
-        with open(cache_file, "r") as f:
-            region_cache = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        region_cache = {}
-
-    location_id_str = str(location_id)
-    if location_id_str in region_cache:
-        return region_cache[location_id_str]
-
-    region_id = None
-    if location_id >= 1000000000000:  # Structure
-        # For structures, we need to fetch structure info to get solar_system_id, then region
-        try:
-            response = requests.get(
-                f"{ESI_BASE_URL}/universe/structures/{location_id}", headers={"Accept": "application/json"}, timeout=30
-            )
-            response.raise_for_status()
-            struct_data = response.json()
-        except requests.exceptions.RequestException:
-            struct_data = None
-
-        if struct_data:
-            solar_system_id = struct_data.get("solar_system_id")
-            if solar_system_id:
-                try:
-                    response = requests.get(
-                        f"{ESI_BASE_URL}/universe/systems/{solar_system_id}",
-                        headers={"Accept": "application/json"},
-                        timeout=30,
-                    )
-                    response.raise_for_status()
-                    system_data = response.json()
-                except requests.exceptions.RequestException:
-                    system_data = None
-
-                if system_data:
-                    constellation_id = system_data.get("constellation_id")
-                    if constellation_id:
-                        try:
-                            response = requests.get(
-                                f"{ESI_BASE_URL}/universe/constellations/{constellation_id}",
-                                headers={"Accept": "application/json"},
-                                timeout=30,
-                            )
-                            response.raise_for_status()
-                            constellation_data = response.json()
-                        except requests.exceptions.RequestException:
-                            constellation_data = None
-
-                        if constellation_data:
-                            region_id = constellation_data.get("region_id")
-    else:  # Station
-        try:
-            response = requests.get(
-                f"{ESI_BASE_URL}/universe/stations/{location_id}", headers={"Accept": "application/json"}, timeout=30
-            )
-            response.raise_for_status()
-            station_data = response.json()
-        except requests.exceptions.RequestException:
-            station_data = None
-
-        if station_data:
-            system_id = station_data.get("system_id")
-            if system_id:
-                try:
-                    response = requests.get(
-                        f"{ESI_BASE_URL}/universe/systems/{system_id}",
-                        headers={"Accept": "application/json"},
-                        timeout=30,
-                    )
-                    response.raise_for_status()
-                    system_data = response.json()
-                except requests.exceptions.RequestException:
-                    system_data = None
-
-                if system_data:
-                    constellation_id = system_data.get("constellation_id")
-                    if constellation_id:
-                        try:
-                            response = requests.get(
-                                f"{ESI_BASE_URL}/universe/constellations/{constellation_id}",
-                                headers={"Accept": "application/json"},
-                                timeout=30,
-                            )
-                            response.raise_for_status()
-                            constellation_data = response.json()
-                        except requests.exceptions.RequestException:
-                            constellation_data = None
-
-                        if constellation_data:
-                            region_id = constellation_data.get("region_id")
-
-    # Cache the result
-    if region_id:
-        region_cache[location_id_str] = region_id
-        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-        with open(cache_file, "w") as f:
-            json.dump(region_cache, f, indent=2)
-
-    return region_id
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+EVE Observer WordPress Post Index
+In-memory slug -> post index of the eve_* post types, built once at sync start.
+
+The index comes from the plugin's eve-observer/v1/manifest route in one call:
+post id, slug, entity id, content hash, modification time, title and the meta
+the updaters compare for every post. Post types the manifest doesn't cover
+(older plugin versions) are paged through once with a _fields projection
+instead. Either way the updaters can
+decide between PUT and POST without a GET-by-slug per post.
+Updaters keep their per-slug lookup for post types that haven't been
+indexed (or failed to index), checked with is_loaded().
+
+Every write is stamped with a hash of its payload in the _eve_content_hash
+meta field; an update whose payload hashes the same as the stored post is
+skipped instead of sent.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from api_client import WordPressApiError, WordPressRequestError, wp_request
+
+logger = logging.getLogger(__name__)
+
+EVE_POST_TYPES = ("eve_character", "eve_corporation", "eve_blueprint", "eve_planet", "eve_contract")
+
+# title is kept alongside id, slug and meta because the updaters compare it to skip no-op writes
+INDEX_FIELDS = "id,slug,title,meta"
+INDEX_PAGE_SIZE = 100
+MANIFEST_ENDPOINT = "/eve-observer/v1/manifest"
+
+CONTENT_HASH_META = "_eve_content_hash"
+
+# Manifest columns the updaters need; manifests without them are treated as missing
+MANIFEST_REQUIRED_FIELDS = frozenset({"post_id", "slug", "content_hash", "title", "meta"})
+
+# Meta left out of the content hash because it is bumped on every write
+VOLATILE_META = frozenset({"_eve_last_updated"})
+
+
+def content_hash(post_data: Dict[str, Any]) -> str:
+    """Stable hash of a post payload, ignoring volatile meta and any stored content hashes."""
+    meta = {
+        key: value
+        for key, value in (post_data.get("meta") or {}).items()
+        if key not in VOLATILE_META and not key.endswith("_hash")
+    }
+    payload = {**post_data, "meta": meta}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class WPPostIndex:
+    """Slug -> post maps per post type.
+
+    Paged posts hold {"id", "slug", "title", "meta"}; manifest posts additionally hold "entity_id" and
+    "modified", and their meta is limited to the content hash and the fields the updaters compare.
+    """
+
+    def __init__(self, page_size: int = INDEX_PAGE_SIZE):
+        self.page_size = page_size
+        self._posts: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.stats = {"indexed_posts": 0, "index_requests": 0, "hits": 0, "misses": 0}
+        self.skipped_writes: Dict[str, int] = {}
+
+    def is_loaded(self, post_type: str) -> bool:
+        return post_type in self._posts
+
+    async def load(self, post_types: Iterable[str] = EVE_POST_TYPES) -> int:
+        """Index the post types from the sync manifest, paging through any it doesn't cover.
+
+        Returns:
+            Number of indexed posts
+        """
+        start_time = time.time()
+        post_types = tuple(post_types)
+        from_manifest = await self._load_manifest(post_types)
+        paged_types = tuple(post_type for post_type in post_types if post_type not in from_manifest)
+        results = await asyncio.gather(
+            *(self._load_type(post_type) for post_type in paged_types), return_exceptions=True
+        )
+        for post_type, result in zip(paged_types, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not index {post_type} posts, falling back to slug lookups: {result}")
+        total = sum(len(posts) for posts in self._posts.values())
+        logger.info(
+            f"Indexed {total} WordPress posts of {len(self._posts)} post types "
+            f"in {self.stats['index_requests']} requests ({time.time() - start_time:.1f}s)"
+        )
+        return total
+
+    async def _load_manifest(self, post_types: Iterable[str]) -> Set[str]:
+        """Index post types from the plugin's manifest route.
+
+        Returns:
+            Post types indexed; empty if the route is missing or failed
+        """
+        try:
+            self.stats["index_requests"] += 1
+            manifest = await wp_request("GET", f"{MANIFEST_ENDPOINT}?post_type={','.join(post_types)}")
+        except WordPressApiError as e:
+            logger.warning(f"Could not fetch the sync manifest, paging through post types instead: {e}")
+            return set()
+        if not isinstance(manifest, dict):
+            return set()  # Plugin version without the manifest route
+
+        fields = manifest.get("fields") or []
+        if not MANIFEST_REQUIRED_FIELDS.issubset(fields):
+            # Older manifests carry no titles or compared meta, which would make every post look changed
+            logger.info("Sync manifest lacks titles and meta, paging through post types instead")
+            return set()
+
+        loaded = set()
+        for post_type, rows in (manifest.get("post_types") or {}).items():
+            if post_type not in post_types:
+                continue
+            posts = {}
+            for row in rows:
+                entry = dict(zip(fields, row))
+                if entry.get("slug"):
+                    posts[entry["slug"]] = {
+                        "id": entry["post_id"],
+                        "slug": entry["slug"],
+                        "entity_id": entry.get("entity_id"),
+                        "modified": entry.get("modified"),
+                        "title": {"rendered": entry.get("title") or ""},
+                        "meta": {**(entry.get("meta") or {}), CONTENT_HASH_META: entry.get("content_hash")},
+                    }
+            self._posts[post_type] = posts
+            self.stats["indexed_posts"] += len(posts)
+            loaded.add(post_type)
+        return loaded
+
+    async def _load_type(self, post_type: str) -> None:
+        posts: Dict[str, Dict[str, Any]] = {}
+        page = 1
+        while True:
+            try:
+                self.stats["index_requests"] += 1
+                batch = await wp_request(
+                    "GET", f"/wp/v2/{post_type}?per_page={self.page_size}&page={page}&_fields={INDEX_FIELDS}"
+                )
+            except WordPressRequestError:
+                if page == 1:
+                    raise
+                break  # Page past the end when the post count is a multiple of the page size
+            if batch is None:
+                if page == 1:
+                    raise WordPressRequestError(f"Post type {post_type} not found")
+                break
+            for post in batch:
+                if post.get("slug"):
+                    posts[post["slug"]] = post
+            if len(batch) < self.page_size:
+                break
+            page += 1
+        self._posts[post_type] = posts
+        self.stats["indexed_posts"] += len(posts)
+
+    def get(self, post_type: str, slug: str) -> Optional[Dict[str, Any]]:
+        """Return the indexed post for a slug, or None if there is none."""
+        post = self._posts.get(post_type, {}).get(slug)
+        self.stats["hits" if post else "misses"] += 1
+        return post
+
+    def record(self, post_type: str, post: Optional[Dict[str, Any]]) -> None:
+        """Keep the index current with a post returned by a PUT or POST."""
+        if post and post.get("slug") and self.is_loaded(post_type):
+            self._posts[post_type][post["slug"]] = {field: post.get(field) for field in INDEX_FIELDS.split(",")}
+
+    def unchanged(
+        self,
+        post_type: str,
+        existing_post: Optional[Dict[str, Any]],
+        post_data: Dict[str, Any],
+        hash_field: str = CONTENT_HASH_META,
+    ) -> bool:
+        """Stamp a payload with its content hash and tell whether writing it would be a no-op.
+
+        Args:
+            post_type: WordPress post type of the write
+            existing_post: The stored post (from the index or a GET), or None for a create
+            post_data: Payload about to be sent; its meta gets the hash
+            hash_field: Meta field holding the hash, separate for partial updates such as skills
+
+        Returns:
+            True if the stored post carries the same hash, so the PUT can be skipped
+        """
+        digest = content_hash(post_data)
+        post_data.setdefault("meta", {})[hash_field] = digest
+        if not existing_post or (existing_post.get("meta") or {}).get(hash_field) != digest:
+            return False
+        self.skipped_writes[post_type] = self.skipped_writes.get(post_type, 0) + 1
+        return True
+
+    def forget(self, post_type: str, slug: str) -> None:
+        """Drop a deleted post from the index."""
+        self._posts.get(post_type, {}).pop(slug, None)
+
+    def clear(self) -> None:
+        self._posts.clear()
+        self.skipped_writes.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "skipped_writes": dict(self.skipped_writes)}
+
+
+# Process-wide index shared by all WordPress updaters
+wp_post_index = WPPostIndex()